@@ -0,0 +1,60 @@
+from typing import Any, Dict, List, Optional, TypedDict
+from langgraph.graph import END, StateGraph
+from agents.planner import QueryPlan, plan_query
+from agents.tools import step_from_call, tool_specs
+from config import settings
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+class PlanningState(TypedDict, total=False):
+    question: str
+    plan: QueryPlan
+    calls: List[Dict[str, Any]]  # Tool calls proposed by the model, as returned
+
+def needs_model(plan: QueryPlan, model) -> bool:
+    """Whether a rule plan is uncertain enough to ask a tool-calling model"""
+    return getattr(model, "tool_calling", False) and plan.confidence < settings.QUERY_PLANNER_MIN_CONFIDENCE
+
+def plan_from_calls(question: str, calls: List[Dict[str, Any]], planner: str) -> Optional[QueryPlan]:
+    """Plan running the model's valid tool calls in order; None when none of them can run"""
+    steps = [step for step in (step_from_call(call["name"], call.get("args") or {}) for call in calls) if step]
+    if not steps:
+        return None
+    first = steps[0]
+    intent = {"map_points": "map", "list_records": "list"}.get(first["tool"], first["tool"])
+    return QueryPlan(question, first["entity"], intent, first["filters"], steps, planner=planner, confidence=1.0)
+
+def build_planning_graph(model):
+    """rules -> [model]: the rule planner answers first; a tool-calling model re-plans low-confidence questions.
+    
+    Streaming the compiled graph (stream_mode="updates") yields each node's
+    plan as it is made, so the rule plan reaches the client before the model
+    is asked.
+    """
+    
+    async def rules(state: PlanningState) -> PlanningState:
+        return {"plan": plan_query(state["question"])}
+    
+    async def plan_with_model(state: PlanningState) -> PlanningState:
+        try:
+            calls = await model.call_tools(state["question"], tool_specs())
+        except Exception as e:
+            logger.warning(f"Model planning failed, keeping the rule plan: {e}")
+            return {"calls": []}
+        plan = plan_from_calls(state["question"], calls, model.name)
+        if plan is None:
+            logger.warning(f"Model proposed no usable tool calls ({len(calls)} calls), keeping the rule plan")
+            return {"calls": calls}
+        return {"plan": plan, "calls": calls}
+    
+    def route(state: PlanningState) -> str:
+        return "model" if needs_model(state["plan"], model) else END
+    
+    graph = StateGraph(PlanningState)
+    graph.add_node("rules", rules)
+    graph.add_node("model", plan_with_model)
+    graph.set_entry_point("rules")
+    graph.add_conditional_edges("rules", route, {"model": "model", END: END})
+    graph.add_edge("model", END)
+    return graph.compile()
@@ -0,0 +1,104 @@
+import asyncio
+import re
+from datetime import date
+from typing import Any, AsyncIterator, Callable, Dict, List
+from config import settings
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+SYSTEM_PROMPT = (
+    "You are the TINSIG mining data analyst for Bangka Belitung. Answer the user's question "
+    "using only the query results provided. Be concise, keep the numbers exact, and answer "
+    "in the language of the question."
+)
+
+PLANNER_PROMPT = (
+    "You plan database queries for the TINSIG mining data of Bangka Belitung. Call the tools whose "
+    "results answer the user's question, with the entity and filters it implies; call several tools "
+    "when one is not enough. Do not answer the question yourself."
+)
+
+class LocalModel:
+    """Deterministic stand-in model: streams the pipeline's draft answer token by token.
+
+    Needs no network or API key, so the query endpoint can be developed and
+    tested offline with reproducible output.
+    """
+    
+    name = "local"
+    tool_calling = False  # Plans come from the rule planner only
+    
+    def __init__(self, token_delay_ms: float = 0.0):
+        self.token_delay_ms = token_delay_ms
+    
+    async def call_tools(self, question: str, tools: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return []
+    
+    async def stream(self, question: str, draft: str, context: str) -> AsyncIterator[str]:
+        for token in re.findall(r"\S+\s*", draft):
+            if self.token_delay_ms:
+                await asyncio.sleep(self.token_delay_ms / 1000)
+            yield token
+
+class GeminiModel:
+    """Google Gemini via langchain-google-genai, streamed chunk by chunk"""
+    
+    name = "gemini"
+    tool_calling = True
+    
+    def __init__(self, api_key: str, model: str):
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        
+        self.llm = ChatGoogleGenerativeAI(model=model, google_api_key=api_key, temperature=0)
+    
+    async def call_tools(self, question: str, tools: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Tool calls ({"name", "args"}) the model chooses for the question (function calling)"""
+        message = await self.llm.bind_tools(tools).ainvoke([
+            ("system", PLANNER_PROMPT),
+            ("human", f"Today is {date.today().isoformat()}.\n\nQuestion: {question}")
+        ])
+        return [{"name": call["name"], "args": call["args"]} for call in message.tool_calls]
+    
+    async def stream(self, question: str, draft: str, context: str) -> AsyncIterator[str]:
+        prompt = (
+            f"Question: {question}\n\n"
+            f"Query results:\n{context}\n\n"
+            f"Draft answer (verified against the results):\n{draft}\n\n"
+            "Write the final answer."
+        )
+        async for chunk in self.llm.astream([("system", SYSTEM_PROMPT), ("human", prompt)]):
+            if chunk.content:
+                yield chunk.content
+
+# Model factories by provider name; register_model() adds more (e.g. test doubles)
+MODEL_FACTORIES: Dict[str, Callable[[], object]] = {
+    "local": lambda: LocalModel(settings.LOCAL_MODEL_TOKEN_DELAY_MS),
+    "gemini": lambda: GeminiModel(settings.GEMINI_API_KEY, settings.GEMINI_MODEL)
+}
+
+_models: Dict[str, object] = {}
+
+def register_model(name: str, factory: Callable[[], object]) -> None:
+    MODEL_FACTORIES[name] = factory
+    _models.pop(name, None)
+
+def resolve_provider(provider: str = None) -> str:
+    provider = provider or settings.LLM_PROVIDER
+    if provider == "auto":
+        return "gemini" if settings.GEMINI_API_KEY else "local"
+    return provider
+
+def get_model(provider: str = None):
+    """Model instance for the provider, falling back to the local model if it cannot be created"""
+    provider = resolve_provider(provider)
+    if provider not in _models:
+        factory = MODEL_FACTORIES.get(provider)
+        if factory is None:
+            raise ValueError(f"Unknown LLM provider '{provider}'. Available: {', '.join(MODEL_FACTORIES)}")
+        try:
+            _models[provider] = factory()
+        except Exception as e:
+            logger.warning(f"LLM provider '{provider}' unavailable ({e}); using the local model")
+            _models[provider] = MODEL_FACTORIES["local"]()
+    return _models[provider]
@@ -0,0 +1,202 @@
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+# Regencies (kabupaten/kota) of Bangka Belitung, longest names first so
+# "Bangka Selatan" wins over "Bangka"
+KABUPATEN = sorted(
+    ["Bangka", "Bangka Barat", "Bangka Selatan", "Bangka Tengah", "Belitung", "Belitung Timur", "Pangkal Pinang"],
+    key=len,
+    reverse=True
+)
+
+ENTITY_KEYWORDS = {
+    "production": ["production", "produksi", "produced", "tonnage", "tons", "ton", "kadar", "smelter"],
+    "iup": ["iup", "permit", "license", "licence", "izin", "concession", "wiup"],
+    "illegal": ["illegal", "ilegal", "unlicensed", "pti", "violation", "tambang"]
+}
+
+INTENT_KEYWORDS = {
+    "trend": ["trend", "over time", "monthly", "per month", "each month", "by month", "tren", "bulanan", "history"],
+    "map": ["map", "where", "location", "locations", "coordinates", "peta", "lokasi", "dimana", "di mana"],
+    "total": ["total", "sum", "how much", "jumlah produksi", "volume"],
+    "breakdown": ["breakdown", "by kabupaten", "per kabupaten", "by region", "per region", "most", "top", "terbanyak",
+                  "distribution", "compare", "which kabupaten", "which region", "by type", "by status"],
+    "count": ["how many", "count", "number of", "berapa", "jumlah", "banyak"],
+    "list": ["list", "show", "display", "tampilkan", "daftar", "details", "latest", "recent"]
+}
+
+# Checked in this order; the first intent with a matching keyword wins
+INTENT_ORDER = ["trend", "map", "breakdown", "total", "count", "list"]
+
+STATUS_KEYWORDS = {
+    "Active": ["active", "aktif", "valid", "berlaku"],
+    "Expired": ["expired", "kadaluarsa", "habis"],
+    "Suspended": ["suspended", "dibekukan"],
+    "Inactive": ["inactive", "tidak aktif", "nonaktif"]
+}
+
+JENIS_TAMBANG_KEYWORDS = {
+    "TAMBANG BESAR ILEGAL": ["besar", "large"],
+    "TAMBANG KECIL ILEGAL": ["kecil", "small"],
+    "TAMBANG MANUAL ILEGAL": ["manual"],
+    "TAMBANG SEMPROT ILEGAL": ["semprot", "spray"]
+}
+
+# Relative periods as (unit, offset from the current one); kept identical to
+# PERIOD_WORDS in frontend/utils/command_parser.py
+RELATIVE_PERIODS = {
+    ("month", 0): ["this month", "bulan ini"],
+    ("month", -1): ["last month", "previous month", "bulan lalu"],
+    ("year", 0): ["this year", "tahun ini"],
+    ("year", -1): ["last year", "previous year", "tahun lalu"]
+}
+
+DEFAULT_LIST_LIMIT = 20
+
+class QueryPlan:
+    """What to answer and the tool steps that gather the data.
+    
+    A step may carry its own "entity" and "filters" (model-planned steps
+    can query several tables); otherwise the plan's apply.
+    """
+    
+    def __init__(
+        self,
+        question: str,
+        entity: str,
+        intent: str,
+        filters: Dict[str, Any],
+        steps: List[Dict[str, Any]],
+        planner: str = "rules",
+        confidence: float = 1.0
+    ):
+        self.question = question
+        self.entity = entity
+        self.intent = intent
+        self.filters = filters
+        self.steps = steps
+        self.planner = planner  # "rules" or the name of the model that chose the tools
+        self.confidence = confidence
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "question": self.question,
+            "entity": self.entity,
+            "intent": self.intent,
+            "filters": self.filters,
+            "steps": self.steps,
+            "planner": self.planner,
+            "confidence": self.confidence
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "QueryPlan":
+        return cls(
+            data["question"], data["entity"], data["intent"], data.get("filters", {}), data.get("steps", []),
+            data.get("planner", "rules"), data.get("confidence", 1.0)
+        )
+
+def _contains(text: str, keyword: str) -> bool:
+    return re.search(rf"(?<!\w){re.escape(keyword.strip())}(?!\w)", text) is not None
+
+def _match(text: str, keywords: Dict[str, List[str]], order: Optional[List[str]] = None) -> Optional[str]:
+    for key in order or list(keywords):
+        if any(_contains(text, keyword) for keyword in keywords[key]):
+            return key
+    return None
+
+def relative_period(text: str, now: Optional[datetime] = None) -> Optional[Tuple[datetime, datetime]]:
+    """[start, end) of a relative period such as "this month" or "tahun lalu" """
+    period = _match(text, RELATIVE_PERIODS)
+    if period is None:
+        return None
+    now = now or datetime.now()
+    unit, offset = period
+    if unit == "year":
+        return datetime(now.year + offset, 1, 1), datetime(now.year + offset + 1, 1, 1)
+    month = now.year * 12 + now.month - 1 + offset
+    return datetime(month // 12, month % 12 + 1, 1), datetime((month + 1) // 12, (month + 1) % 12 + 1, 1)
+
+def extract_filters(text: str, entity: str, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Kabupaten, date range, IUP status and mining type mentioned in the question"""
+    filters: Dict[str, Any] = {}
+    
+    for name in KABUPATEN:
+        if _contains(text, name.lower()):
+            filters["kabupaten"] = name
+            break
+    
+    years = sorted({int(year) for year in re.findall(r"\b(20\d{2})\b", text)})
+    if years:
+        filters["date_from"] = datetime(years[0], 1, 1).isoformat()
+        filters["date_to"] = datetime(years[-1] + 1, 1, 1).isoformat()
+    else:
+        period = relative_period(text, now)
+        if period:
+            filters["date_from"], filters["date_to"] = period[0].isoformat(), period[1].isoformat()
+    
+    if entity == "iup":
+        # "tidak aktif"/"inactive" must be checked before "aktif"/"active"
+        status = _match(text, STATUS_KEYWORDS, ["Inactive", "Expired", "Suspended", "Active"])
+        if status:
+            filters["status"] = status
+    
+    if entity == "illegal":
+        jenis = _match(text, JENIS_TAMBANG_KEYWORDS)
+        if jenis:
+            filters["jenis_tambang"] = jenis
+    
+    return filters
+
+def breakdown_dimension(text: str, entity: str) -> str:
+    if entity == "iup" and _contains(text, "status"):
+        return "status"
+    if entity == "illegal" and any(_contains(text, word) for word in ["type", "types", "jenis"]):
+        return "jenis_tambang"
+    if entity == "production" and any(_contains(text, word) for word in ["operator", "operators", "company"]):
+        return "operator"
+    if entity == "production" and any(_contains(text, word) for word in ["method", "metode"]):
+        return "metode_tambang"
+    return "kabupaten"
+
+def match_keywords(question: str) -> Tuple[Optional[str], Optional[str]]:
+    """Entity and intent named by a keyword in the question; None where the planner falls back to a default"""
+    text = " ".join(question.lower().split())
+    return _match(text, ENTITY_KEYWORDS, ["production", "iup", "illegal"]), _match(text, INTENT_KEYWORDS, INTENT_ORDER)
+
+def plan_query(question: str) -> QueryPlan:
+    """Rule-based planner: deterministic and fast enough to stream the plan immediately.
+    
+    Confidence is the share of entity and intent that matched a keyword
+    instead of falling back to a default; low-confidence questions are
+    re-planned by the model (see agents.graph).
+    """
+    text = " ".join(question.lower().split())
+    
+    matched_entity, matched_intent = match_keywords(text)
+    confidence = ((matched_entity is not None) + (matched_intent is not None)) / 2
+    entity = matched_entity or "illegal"
+    intent = matched_intent or "count"
+    if intent == "total" and entity != "production":
+        intent = "count"
+    filters = extract_filters(text, entity)
+    
+    if intent == "count":
+        steps = [{"tool": "count", "args": {}}]
+        if "kabupaten" not in filters:
+            steps.append({"tool": "breakdown", "args": {"by": "kabupaten"}})
+    elif intent == "total":
+        steps = [{"tool": "total", "args": {"column": "produksi_ton"}}]
+        if "kabupaten" not in filters:
+            steps.append({"tool": "breakdown", "args": {"by": "kabupaten"}})
+    elif intent == "breakdown":
+        steps = [{"tool": "breakdown", "args": {"by": breakdown_dimension(text, entity)}}]
+    elif intent == "trend":
+        steps = [{"tool": "trend", "args": {"bucket": "month"}}]
+    elif intent == "map":
+        steps = [{"tool": "map_points", "args": {}}]
+    else:
+        steps = [{"tool": "count", "args": {}}, {"tool": "list_records", "args": {"limit": DEFAULT_LIST_LIMIT}}]
+    
+    return QueryPlan(question, entity, intent, filters, steps, confidence=confidence)
@@ -0,0 +1,199 @@
+import json
+import time
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+from agents.graph import build_planning_graph, needs_model
+from agents.llm import get_model
+from agents.planner import QueryPlan
+from agents.tools import ENTITIES, build_statement, execute_statement, render_sql
+from database.db import database
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Rows per tool result sent to the client and to the model
+PREVIEW_ROWS = 20
+
+def event(kind: str, **data) -> Dict[str, Any]:
+    return {"event": kind, "data": data}
+
+def _number(value: float) -> str:
+    return f"{value:,.0f}" if float(value).is_integer() else f"{value:,.1f}"
+
+def describe_scope(filters: Dict[str, Any]) -> str:
+    parts = []
+    if filters.get("jenis_tambang"):
+        parts.append(f"of type {filters['jenis_tambang'].title()}")
+    if filters.get("status"):
+        parts.append(f"with status {filters['status']}")
+    if filters.get("kabupaten"):
+        parts.append(f"in {filters['kabupaten']}")
+    if filters.get("date_from") and filters.get("date_to"):
+        date_from = datetime.fromisoformat(filters["date_from"])
+        date_to = datetime.fromisoformat(filters["date_to"])
+        if date_from.month != 1 or date_to.month != 1:
+            parts.append(f"in {date_from:%Y-%m}")
+        elif date_to.year - date_from.year == 1:
+            parts.append(f"in {date_from.year}")
+        else:
+            parts.append(f"from {date_from.year} to {date_to.year - 1}")
+    return (" " + " ".join(parts)) if parts else ""
+
+def compose_draft(plan: QueryPlan, results: List[Dict[str, Any]]) -> str:
+    """Deterministic answer built from the tool results; the model refines or streams it"""
+    sentences = []
+    
+    for result in results:
+        tool, rows = result["tool"], result["rows"]
+        label = ENTITIES[result.get("entity", plan.entity)]["label"]
+        scope = describe_scope(result.get("filters", plan.filters))
+        if tool == "count":
+            sentences.append(f"There are {_number(rows[0]['count'])} {label}{scope}.")
+        elif tool == "total":
+            sentences.append(
+                f"Total production{scope} is {_number(rows[0]['total'])} tons across {_number(rows[0]['count'])} records."
+            )
+        elif tool == "breakdown":
+            by = result["args"].get("by", "kabupaten")
+            metric = "total" if "total" in (rows[0] if rows else {}) else "count"
+            unit = " tons" if metric == "total" else ""
+            top = [f"{row[by] or 'Unknown'} ({_number(row[metric])}{unit})" for row in rows[:3]]
+            if not top:
+                sentences.append(f"No {label}{scope} were found.")
+            elif len(top) == 1:
+                sentences.append(f"All of them are in {top[0]}.")
+            else:
+                sentences.append(f"By {by.replace('_', ' ')}, {top[0]} leads, followed by {', '.join(top[1:])}.")
+        elif tool == "trend":
+            if not rows:
+                sentences.append(f"No dated {label}{scope} were found.")
+                continue
+            metric = "total" if "total" in rows[0] else "count"
+            unit = " tons" if metric == "total" else ""
+            peak = max(rows, key=lambda row: row[metric])
+            sentences.append(
+                f"Monthly {label}{scope} from {rows[0]['period']} to {rows[-1]['period']}: "
+                f"peak in {peak['period']} with {_number(peak[metric])}{unit}, "
+                f"latest month {rows[-1]['period']} with {_number(rows[-1][metric])}{unit}."
+            )
+        elif tool == "map_points":
+            regions = sorted({row["kabupaten"] for row in rows if row["kabupaten"]})
+            sentences.append(
+                f"Found {_number(len(rows))} {label}{scope} with coordinates"
+                + (f" across {', '.join(regions[:5])}." if regions else ".")
+            )
+        elif tool == "list_records":
+            sentences.append(f"The {min(len(rows), PREVIEW_ROWS)} most recent are listed below.")
+    
+    return " ".join(sentences) or "I could not find data to answer that question."
+
+def format_context(results: List[Dict[str, Any]]) -> str:
+    return "\n".join(
+        f"{result['tool']} {json.dumps(result['args'])}: {json.dumps(result['rows'][:PREVIEW_ROWS], default=str)}"
+        for result in results
+    )
+
+class QueryAgent:
+    """Answers a natural-language question as a stream of events.
+
+    [cache] -> plan [-> status -> plan] -> (tool_call, sql, tool_result) per step -> token... -> answer -> done.
+    The rule planner answers first. When it is unsure (low confidence) and the
+    model supports function calling, the model re-plans the question by
+    calling the query tools and its plan is streamed as a second plan event.
+    The SQL runs before the answer is written, so the plan and first results
+    reach the client long before the model finishes.
+    With a cache, a previously answered or similar question reuses its plan
+    and skips planning; the model still answers from fresh results.
+    """
+    
+    def __init__(self, model=None, session_factory=None, cache=None):
+        self.model = model or get_model()
+        self.session_factory = session_factory
+        self.cache = cache
+        self.planner = build_planning_graph(self.model)
+    
+    async def run(self, question: str, plan: Optional[QueryPlan] = None) -> AsyncIterator[Dict[str, Any]]:
+        start = time.perf_counter()
+        model, hit = self.model, None
+        try:
+            session_factory = self.session_factory or await database.read_session_factory()
+            if plan is None and self.cache is not None:
+                if self.cache.schema_check_due():
+                    async with session_factory() as session:
+                        await self.cache.check_schema(session)
+                hit = self.cache.lookup(question)
+                yield event(
+                    "cache",
+                    hit=hit is not None,
+                    match=hit.match if hit else None,
+                    score=hit.score if hit else None
+                )
+                if hit is not None:
+                    plan = hit.plan
+            
+            if plan is None:
+                async for update in self.planner.astream({"question": question}, stream_mode="updates"):
+                    for node, state in update.items():
+                        if state and state.get("plan") is not None:
+                            plan = state["plan"]
+                            yield event("plan", **plan.to_dict())
+                    if "rules" in update and needs_model(plan, self.model):
+                        yield event("status", stage="planning", model=self.model.name)
+            else:
+                yield event("plan", **plan.to_dict())
+            
+            results = []
+            async with session_factory() as session:
+                dialect = session.bind.dialect
+                for index, step in enumerate(plan.steps):
+                    entity, filters = step.get("entity", plan.entity), step.get("filters", plan.filters)
+                    yield event("tool_call", step=index, tool=step["tool"], args=step.get("args", {}), entity=entity)
+                    statement = build_statement(entity, filters, step, dialect.name)
+                    yield event("sql", step=index, sql=render_sql(statement, dialect))
+                    
+                    result = await execute_statement(session, statement)
+                    result.update(tool=step["tool"], args=step.get("args", {}), entity=entity, filters=filters)
+                    results.append(result)
+                    yield event(
+                        "tool_result",
+                        step=index,
+                        tool=step["tool"],
+                        row_count=result["row_count"],
+                        duration_ms=result["duration_ms"],
+                        rows=result["rows"][:PREVIEW_ROWS]
+                    )
+            
+            draft = compose_draft(plan, results)
+            yield event("status", stage="answering", model=model.name)
+            
+            answer = []
+            async for token in model.stream(question, draft, format_context(results)):
+                answer.append(token)
+                yield event("token", text=token)
+            
+            yield event(
+                "answer",
+                text="".join(answer),
+                model=model.name,
+                cached=hit is not None,
+                plan=plan.to_dict(),
+                results=[
+                    {
+                        "tool": r["tool"],
+                        "args": r["args"],
+                        "entity": r["entity"],
+                        "row_count": r["row_count"],
+                        "rows": r["rows"][:PREVIEW_ROWS]
+                    }
+                    for r in results
+                ]
+            )
+            if self.cache is not None and hit is None:
+                self.cache.store_plan(question, plan)
+        except Exception as e:
+            logger.error(f"Query failed: {e}")
+            if hit is not None:
+                # A cached plan that no longer runs (e.g. after a schema change) is dropped
+                self.cache.evict(hit.entry)
+            yield event("error", message=str(e))
+        yield event("done", elapsed_ms=round((time.perf_counter() - start) * 1000, 2))
@@ -0,0 +1,229 @@
+import copy
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+import numpy as np
+from sqlalchemy import inspect
+from agents.planner import QueryPlan, match_keywords, plan_query
+from agents.tools import ENTITIES
+from config import settings
+from utils.logger import setup_logger
+from utils.metrics import record_cache_lookup
+from vectors.embeddings import TOKEN_PATTERN, get_embedder
+from vectors.store import create_vector_store
+
+logger = setup_logger(__name__)
+
+# Nearest cached questions checked against the slot guard on a similarity lookup
+SIMILAR_CANDIDATES = 3
+
+# Filters naming a region, status or mining type; a similar question must name the same ones
+NAMED_FILTERS = ("kabupaten", "status", "jenis_tambang")
+
+def normalize_question(question: str) -> str:
+    return " ".join(TOKEN_PATTERN.findall(question.lower()))
+
+async def schema_fingerprint(session) -> str:
+    """Hash of the column names and types of the tables the query tools read"""
+    tables = sorted({spec["model"].__tablename__ for spec in ENTITIES.values()})
+    
+    def describe(sync_session):
+        inspector = inspect(sync_session.connection())
+        return [
+            (table, sorted((column["name"], str(column["type"])) for column in inspector.get_columns(table)))
+            for table in tables
+        ]
+    
+    columns = await session.run_sync(describe)
+    return hashlib.sha1(repr(columns).encode()).hexdigest()[:16]
+
+class CacheEntry:
+    __slots__ = ("id", "key", "plan", "slots", "created_at", "hits")
+    
+    def __init__(self, entry_id: int, key: str, plan: Dict[str, Any], slots: Dict[str, Any]):
+        self.id = entry_id
+        self.key = key
+        self.plan = plan
+        self.slots = slots
+        self.created_at = time.monotonic()
+        self.hits = 0
+
+class CacheHit:
+    def __init__(self, entry: CacheEntry, plan: QueryPlan, match: str, score: float):
+        self.entry = entry
+        self.plan = plan
+        self.match = match
+        self.score = score
+
+class QueryCache:
+    """Cache of query plans keyed by question, with exact and embedding-similarity lookup.
+
+    A similar question reuses a plan only if it names the same kabupaten,
+    status and mining type (see _reuse); similar embeddings do not imply that.
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        threshold: float = 0.8,
+        ttl_seconds: float = 86400,
+        schema_check_seconds: float = 60,
+        embedder=None,
+        store_kind: Optional[str] = None
+    ):
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.schema_check_seconds = schema_check_seconds
+        self.store_kind = store_kind
+        self._embedder = embedder
+        self._store = None
+        self.entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self.by_id: Dict[int, str] = {}
+        self._next_id = 0
+        self.schema: Optional[str] = None
+        self._schema_checked_at = -float("inf")
+        self.hits = {"exact": 0, "similar": 0}
+        self.misses = 0
+    
+    @property
+    def embedder(self):
+        if self._embedder is None:
+            self._embedder = get_embedder()
+        return self._embedder
+    
+    @property
+    def store(self):
+        if self._store is None:
+            self._store = create_vector_store(self.embedder.dim, self.store_kind)
+        return self._store
+    
+    def schema_check_due(self) -> bool:
+        return time.monotonic() - self._schema_checked_at >= self.schema_check_seconds
+    
+    async def check_schema(self, session) -> None:
+        """Clear the cache if the queried tables changed since the last check"""
+        fingerprint = await schema_fingerprint(session)
+        if self.schema is not None and fingerprint != self.schema:
+            logger.info(f"Schema changed ({self.schema} -> {fingerprint}); clearing {len(self.entries)} cached query plans")
+            self.clear()
+        self.schema = fingerprint
+        self._schema_checked_at = time.monotonic()
+    
+    @staticmethod
+    def _slots(key: str) -> Dict[str, Any]:
+        """What the rule planner reads from the question: keyword entity and intent, named filters, period (as of now)"""
+        entity, intent = match_keywords(key)
+        filters = plan_query(key).filters
+        return {
+            "entity": entity,
+            "intent": intent,
+            "filters": {name: filters[name] for name in NAMED_FILTERS if name in filters},
+            "period": (filters["date_from"], filters["date_to"]) if "date_from" in filters else None
+        }
+    
+    def _reuse(self, entry: CacheEntry, slots: Dict[str, Any], question: str) -> Optional[QueryPlan]:
+        """The entry's plan for a question with these slots, or None when it does not fit"""
+        if time.monotonic() - entry.created_at > self.ttl_seconds:
+            self._remove(entry)
+            return None
+        
+        cached = entry.slots
+        if slots["filters"] != cached["filters"] or (slots["period"] is None) != (cached["period"] is None):
+            return None
+        if any(slots[name] is not None and slots[name] != cached[name] for name in ("entity", "intent")):
+            return None
+        
+        plan = QueryPlan.from_dict(copy.deepcopy(entry.plan))
+        plan.question = question
+        if slots["period"] != cached["period"]:
+            # Move every filter set on the cached question's period to the new one
+            for filters in [plan.filters] + [step["filters"] for step in plan.steps if "filters" in step]:
+                dates = (filters.get("date_from"), filters.get("date_to"))
+                if dates == cached["period"]:
+                    filters["date_from"], filters["date_to"] = slots["period"]
+                elif dates != (None, None):
+                    return None  # A period the planner chose itself cannot be carried over
+        return plan
+    
+    def lookup(self, question: str) -> Optional[CacheHit]:
+        key = normalize_question(question)
+        slots = self._slots(key)
+        hit = None
+        
+        entry = self.entries.get(key)
+        plan = self._reuse(entry, slots, question) if entry is not None else None
+        if plan is not None:
+            hit = (entry, plan, "exact", 1.0)
+        elif self.entries:
+            scores, ids = self.store.search(self.embedder.embed([key]), SIMILAR_CANDIDATES)
+            for score, entry_id in zip(scores[0], ids[0]):
+                if entry_id < 0 or score < self.threshold:
+                    break
+                candidate = self.entries.get(self.by_id.get(int(entry_id)))
+                plan = self._reuse(candidate, slots, question) if candidate is not None else None
+                if plan is not None:
+                    hit = (candidate, plan, "similar", float(score))
+                    break
+        
+        record_cache_lookup("query", hit is not None)
+        if hit is None:
+            self.misses += 1
+            return None
+        
+        entry, plan, match, score = hit
+        entry.hits += 1
+        self.hits[match] += 1
+        self.entries.move_to_end(entry.key)
+        return CacheHit(entry, plan, match, round(score, 4))
+    
+    def store_plan(self, question: str, plan: QueryPlan) -> None:
+        key = normalize_question(question)
+        if not key:
+            return
+        existing = self.entries.get(key)
+        if existing is not None:
+            self._remove(existing)
+        
+        plan_data = plan.to_dict()
+        entry = CacheEntry(self._next_id, key, plan_data, self._slots(key))
+        self._next_id += 1
+        self.store.add(np.array([entry.id], dtype=np.int64), self.embedder.embed([key]))
+        self.entries[key] = entry
+        self.by_id[entry.id] = key
+        
+        while len(self.entries) > self.max_entries:
+            self._remove(next(iter(self.entries.values())))
+    
+    def evict(self, entry: CacheEntry) -> None:
+        if self.entries.get(entry.key) is entry:
+            self._remove(entry)
+    
+    def _remove(self, entry: CacheEntry) -> None:
+        self.entries.pop(entry.key, None)
+        self.by_id.pop(entry.id, None)
+        self.store.remove(np.array([entry.id], dtype=np.int64))
+    
+    def clear(self) -> None:
+        self.entries.clear()
+        self.by_id.clear()
+        if self._store is not None:
+            self._store.reset()
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self.entries),
+            "hits": dict(self.hits),
+            "misses": self.misses,
+            "schema": self.schema,
+            "threshold": self.threshold
+        }
+
+# Global query cache instance
+query_cache = QueryCache(
+    max_entries=settings.QUERY_CACHE_MAX_ENTRIES,
+    threshold=settings.QUERY_CACHE_SIMILARITY_THRESHOLD,
+    ttl_seconds=settings.QUERY_CACHE_TTL_SECONDS,
+    schema_check_seconds=settings.QUERY_CACHE_SCHEMA_CHECK_SECONDS
+)
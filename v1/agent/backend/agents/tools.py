@@ -0,0 +1,213 @@
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+from sqlalchemy import func, select, desc
+from sqlalchemy.ext.asyncio import AsyncSession
+from api.data import ILLEGAL_MINING_COLUMNS, PRODUCTION_COLUMNS, IUP_COLUMNS, month_bucket
+from database.models import IllegalMining, Production, IUP
+
+# Per-entity model, columns and the fields the tools filter and group on
+ENTITIES = {
+    "illegal": {
+        "model": IllegalMining,
+        "columns": ILLEGAL_MINING_COLUMNS,
+        "date": IllegalMining.tanggal_survey,
+        "region": IllegalMining.kabupaten,
+        "label": "illegal mining sites",
+        "key": "mobile_id"
+    },
+    "production": {
+        "model": Production,
+        "columns": PRODUCTION_COLUMNS,
+        "date": Production.tanggal_produksi,
+        "region": Production.kabupaten,
+        "value": Production.produksi_ton,
+        "label": "production records",
+        "key": "id"
+    },
+    "iup": {
+        "model": IUP,
+        "columns": IUP_COLUMNS,
+        "date": IUP.tgl_sk,
+        "region": IUP.daerah,
+        "label": "IUP permits",
+        "key": "du"
+    }
+}
+
+MAX_BREAKDOWN_GROUPS = 20
+MAX_MAP_POINTS = 5000
+
+def apply_filters(query, entity: str, filters: Dict[str, Any]):
+    spec = ENTITIES[entity]
+    model = spec["model"]
+    
+    if filters.get("kabupaten"):
+        if entity == "iup":
+            query = query.where(spec["region"].ilike(f"%{filters['kabupaten']}%"))
+        else:
+            query = query.where(spec["region"] == filters["kabupaten"])
+    if filters.get("date_from"):
+        query = query.where(spec["date"] >= datetime.fromisoformat(filters["date_from"]))
+    if filters.get("date_to"):
+        query = query.where(spec["date"] < datetime.fromisoformat(filters["date_to"]))
+    if filters.get("status") and entity == "iup":
+        query = query.where(model.status.ilike(filters["status"]))
+    if filters.get("jenis_tambang") and entity == "illegal":
+        query = query.where(model.jenis_tambang == filters["jenis_tambang"])
+    return query
+
+def build_count(entity: str, filters: Dict[str, Any], dialect: str):
+    model = ENTITIES[entity]["model"]
+    return apply_filters(select(func.count(model.id).label("count")), entity, filters)
+
+def build_total(entity: str, filters: Dict[str, Any], dialect: str, column: str = "produksi_ton"):
+    model = ENTITIES[entity]["model"]
+    value = getattr(model, column)
+    query = select(func.coalesce(func.sum(value), 0).label("total"), func.count(model.id).label("count"))
+    return apply_filters(query, entity, filters)
+
+def build_breakdown(entity: str, filters: Dict[str, Any], dialect: str, by: str = "kabupaten"):
+    spec = ENTITIES[entity]
+    group = spec["region"] if by == "kabupaten" else getattr(spec["model"], by)
+    metrics = [func.count(spec["model"].id).label("count")]
+    if "value" in spec:
+        metrics.append(func.coalesce(func.sum(spec["value"]), 0).label("total"))
+    order = metrics[-1]
+    query = select(group.label(by), *metrics).group_by(group).order_by(desc(order)).limit(MAX_BREAKDOWN_GROUPS)
+    return apply_filters(query, entity, filters)
+
+def build_trend(entity: str, filters: Dict[str, Any], dialect: str, bucket: str = "month"):
+    spec = ENTITIES[entity]
+    period = month_bucket(spec["date"], dialect)
+    metrics = [func.count(spec["model"].id).label("count")]
+    if "value" in spec:
+        metrics.append(func.coalesce(func.sum(spec["value"]), 0).label("total"))
+    query = select(period.label("period"), *metrics).where(spec["date"].isnot(None)).group_by(period).order_by(period)
+    return apply_filters(query, entity, filters)
+
+def build_map_points(entity: str, filters: Dict[str, Any], dialect: str):
+    spec = ENTITIES[entity]
+    model = spec["model"]
+    query = select(
+        getattr(model, spec["key"]).label("key"),
+        spec["region"].label("kabupaten"),
+        model.location_lat.label("lat"),
+        model.location_lng.label("lng")
+    ).where(model.location_lat.isnot(None), model.location_lng.isnot(None)).limit(MAX_MAP_POINTS)
+    return apply_filters(query, entity, filters)
+
+def build_list_records(entity: str, filters: Dict[str, Any], dialect: str, limit: int = 20):
+    spec = ENTITIES[entity]
+    columns = spec["columns"]
+    query = select(*(column.label(name) for name, column in columns.items()))
+    query = query.order_by(desc(spec["date"])).limit(limit)
+    return apply_filters(query, entity, filters)
+
+TOOLS: Dict[str, Callable] = {
+    "count": build_count,
+    "total": build_total,
+    "breakdown": build_breakdown,
+    "trend": build_trend,
+    "map_points": build_map_points,
+    "list_records": build_list_records
+}
+
+# Function-calling descriptions of the tools for model-driven planning: (description, tool arguments)
+TOOL_DESCRIPTIONS = {
+    "count": ("Number of records matching the filters", {}),
+    "total": ("Total produksi_ton and record count of production records matching the filters", {}),
+    "breakdown": (
+        "Record counts (and production tonnage) grouped by one column, largest groups first",
+        {"by": {"type": "string", "description": "kabupaten, kecamatan, status (iup), jenis_tambang (illegal), operator or metode_tambang (production)"}}
+    ),
+    "trend": ("Monthly record counts (and production tonnage) over time", {}),
+    "map_points": ("Coordinates and kabupaten of matching records, for questions about locations", {}),
+    "list_records": (
+        "The most recent matching records with all their columns",
+        {"limit": {"type": "integer", "description": "Records to return, 1-100"}}
+    )
+}
+
+FILTER_PARAMETERS = {
+    "kabupaten": {"type": "string", "description": "Kabupaten/kota, e.g. Bangka Selatan or Pangkal Pinang"},
+    "date_from": {"type": "string", "description": "Inclusive start date, YYYY-MM-DD"},
+    "date_to": {"type": "string", "description": "Exclusive end date, YYYY-MM-DD"},
+    "status": {"type": "string", "description": "IUP status: Active, Expired, Suspended or Inactive (iup only)"},
+    "jenis_tambang": {"type": "string", "description": "Illegal mining type, e.g. TAMBANG KECIL ILEGAL (illegal only)"}
+}
+
+def tool_specs() -> List[Dict[str, Any]]:
+    """Function declarations of the tools (OpenAI format, accepted by langchain bind_tools)"""
+    specs = []
+    for name, (description, arguments) in TOOL_DESCRIPTIONS.items():
+        properties = {
+            "entity": {
+                "type": "string",
+                "enum": list(ENTITIES),
+                "description": "illegal: illegal mining sites, production: production records, iup: mining permits"
+            },
+            **FILTER_PARAMETERS,
+            **arguments
+        }
+        specs.append({
+            "type": "function",
+            "function": {
+                "name": name,
+                "description": description,
+                "parameters": {"type": "object", "properties": properties, "required": ["entity"]}
+            }
+        })
+    return specs
+
+def step_from_call(name: str, args: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Plan step for a model's tool call, or None when the call cannot run"""
+    entity = args.get("entity")
+    if name not in TOOLS or entity not in ENTITIES:
+        return None
+    if name == "total" and "value" not in ENTITIES[entity]:
+        return None
+    
+    filters = {key: args[key] for key in FILTER_PARAMETERS if args.get(key)}
+    for key in ("date_from", "date_to"):
+        if key in filters:
+            try:
+                filters[key] = datetime.fromisoformat(str(filters[key])).isoformat()
+            except ValueError:
+                return None
+    
+    tool_args: Dict[str, Any] = {}
+    if name == "total":
+        tool_args["column"] = "produksi_ton"
+    elif name == "breakdown":
+        by = args.get("by") or "kabupaten"
+        if by != "kabupaten" and by not in ENTITIES[entity]["columns"]:
+            return None
+        tool_args["by"] = by
+    elif name == "list_records":
+        try:
+            tool_args["limit"] = min(max(int(args.get("limit") or 20), 1), 100)
+        except (TypeError, ValueError):
+            return None
+    elif name == "trend":
+        tool_args["bucket"] = "month"
+    return {"tool": name, "args": tool_args, "entity": entity, "filters": filters}
+
+def build_statement(entity: str, filters: Dict[str, Any], step: Dict[str, Any], dialect: str):
+    builder = TOOLS.get(step["tool"])
+    if builder is None:
+        raise ValueError(f"Unknown tool '{step['tool']}'. Available: {', '.join(TOOLS)}")
+    return builder(entity, filters, dialect, **step.get("args", {}))
+
+def render_sql(statement, dialect) -> str:
+    """SQL text with parameters inlined where the dialect can render them"""
+    try:
+        return str(statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+    except Exception:
+        return str(statement.compile(dialect=dialect))
+
+async def execute_statement(session: AsyncSession, statement) -> Dict[str, Any]:
+    start = time.perf_counter()
+    result = await session.execute(statement)
+    rows: List[Dict[str, Any]] = [dict(row) for row in result.mappings()]
+    return {"rows": rows, "row_count": len(rows), "duration_ms": round((time.perf_counter() - start) * 1000, 2)}
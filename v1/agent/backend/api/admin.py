@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import FileResponse
+from typing import Optional
+from utils.profiler import is_valid_profiling_token, profile_store
+from utils.responses import ORJSONResponse
+
+router = APIRouter()
+
+async def require_admin_token(x_profile_token: Optional[str] = Header(None)):
+    """Admin routes require the SECRET_KEY-derived profiling token"""
+    if not is_valid_profiling_token(x_profile_token):
+        raise HTTPException(status_code=403, detail="Invalid or missing X-Profile-Token")
+
+@router.get("/profiles", dependencies=[Depends(require_admin_token)])
+async def list_profiles():
+    """List captured request profiles, newest first"""
+    return ORJSONResponse({"profiles": profile_store.list()})
+
+@router.get("/profiles/{name}", dependencies=[Depends(require_admin_token)])
+async def get_profile(name: str):
+    """Download a profile in collapsed-stack format (flamegraph.pl / speedscope)"""
+    path = profile_store.path_for(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"Profile not found: {name}")
+    return FileResponse(path, media_type="text/plain", filename=f"{name}.folded")
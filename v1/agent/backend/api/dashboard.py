@@ -0,0 +1,147 @@
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+import asyncio
+import time
+from api import data
+from config import settings
+from database.db import database, snapshot_sessions
+from utils.logger import setup_logger
+from utils.responses import ORJSONResponse
+
+logger = setup_logger(__name__)
+
+router = APIRouter()
+
+# Parameters of each sub-query type, mirroring the query parameters of the GET routes
+class BatchParams(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+class IllegalMiningParams(BatchParams):
+    kabupaten: Optional[str] = None
+    limit: int = Field(100, le=1000)
+    fields: Optional[str] = None
+
+class ProductionParams(BatchParams):
+    kabupaten: Optional[str] = None
+    date_from: Optional[datetime] = None
+    date_to: Optional[datetime] = None
+    limit: int = Field(100, le=1000)
+    fields: Optional[str] = None
+
+class IUPParams(BatchParams):
+    status: Optional[str] = None
+    kabupaten: Optional[str] = None
+    limit: int = Field(100, le=1000)
+    fields: Optional[str] = None
+
+class MapDataParams(BatchParams):
+    layer: str = "all"
+    kabupaten: Optional[List[str]] = None
+
+class SummaryParams(BatchParams):
+    kabupaten: Optional[List[str]] = None
+
+class DistributionParams(BatchParams):
+    entity: str = "illegal"
+    field: str = "jenis_tambang"
+    kabupaten: Optional[List[str]] = None
+    limit: int = Field(20, ge=1, le=100)
+
+class ProductionTrendParams(BatchParams):
+    kabupaten: Optional[List[str]] = None
+    date_from: Optional[datetime] = None
+    date_to: Optional[datetime] = None
+
+class RecentActivityParams(BatchParams):
+    limit: int = Field(10, ge=1, le=200)
+    kabupaten: Optional[List[str]] = None
+
+# Sub-query type -> (params model, query function from api.data)
+BATCH_QUERIES = {
+    "summary": (SummaryParams, data.summary_stats),
+    "distribution": (DistributionParams, data.distribution_data),
+    "production-trend": (ProductionTrendParams, data.production_trend_data),
+    "recent-activity": (RecentActivityParams, data.recent_activity_data),
+    "illegal-mining": (IllegalMiningParams, data.illegal_mining_data),
+    "production": (ProductionParams, data.production_data),
+    "iup": (IUPParams, data.iup_data),
+    "map-data": (MapDataParams, data.map_data),
+    "regions": (BatchParams, data.regions_data)
+}
+
+class SubQuery(BaseModel):
+    id: Optional[str] = None  # Defaults to the type
+    type: str
+    params: Dict[str, Any] = Field(default_factory=dict)
+
+class BatchRequest(BaseModel):
+    queries: List[SubQuery] = Field(..., min_length=1)
+
+async def run_sub_query(session, query: SubQuery, params: BatchParams, savepoint: bool) -> Dict[str, Any]:
+    """Run one sub-query; failures are reported in its result instead of failing the batch"""
+    start = time.perf_counter()
+    handler = BATCH_QUERIES[query.type][1]
+    result = {"id": query.id or query.type, "type": query.type}
+    try:
+        if savepoint:
+            # A failed statement only rolls back to the savepoint, keeping the shared snapshot usable
+            async with session.begin_nested():
+                result["data"] = await handler(session, **params.model_dump())
+        else:
+            result["data"] = await handler(session, **params.model_dump())
+        result["status"] = 200
+    except HTTPException as e:
+        result.update(status=e.status_code, error=e.detail)
+    result["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return result
+
+@router.post("/batch")
+async def dashboard_batch(body: BatchRequest):
+    """Run several data queries in one round-trip, concurrently and against one snapshot"""
+    if len(body.queries) > settings.DASHBOARD_BATCH_MAX_QUERIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many sub-queries: {len(body.queries)} (max {settings.DASHBOARD_BATCH_MAX_QUERIES})"
+        )
+    
+    # Validate everything up front so a bad sub-query never opens connections
+    validated = []
+    for query in body.queries:
+        if query.type not in BATCH_QUERIES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown sub-query type: {query.type}. Available: {', '.join(BATCH_QUERIES)}"
+            )
+        try:
+            validated.append(BATCH_QUERIES[query.type][0](**query.params))
+        except ValidationError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid params for {query.id or query.type}: {str(e)}")
+    
+    start = time.perf_counter()
+    concurrency = max(1, min(settings.DASHBOARD_BATCH_CONCURRENCY, len(body.queries)))
+    results: List[Optional[Dict[str, Any]]] = [None] * len(body.queries)
+    
+    try:
+        session_factory = await database.read_session_factory()
+        async with snapshot_sessions(session_factory, concurrency) as (sessions, snapshot):
+            savepoint = sessions[0].bind.dialect.name == "postgresql"
+            pending = iter(enumerate(zip(body.queries, validated)))
+            
+            async def worker(session):
+                # Each connection takes the next sub-query until none are left
+                for index, (query, params) in pending:
+                    results[index] = await run_sub_query(session, query, params, savepoint)
+            
+            await asyncio.gather(*(worker(session) for session in sessions))
+    except Exception as e:
+        logger.error(f"Dashboard batch failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to run dashboard batch: {str(e)}")
+    
+    return ORJSONResponse({
+        "results": results,
+        "snapshot": snapshot,
+        "concurrency": len(sessions),
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 2)
+    })
@@ -1,68 +1,122 @@
 from fastapi import APIRouter, HTTPException, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, or_
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
-from database.db import get_db
+import heapq
+import itertools
+from database.db import get_read_db
 from database.models import IllegalMining, Production, IUP
+from utils.responses import ORJSONResponse
 
 router = APIRouter()
 
-@router.get("/illegal-mining")
-async def get_illegal_mining(
-    kabupaten: Optional[str] = Query(None),
-    limit: int = Query(100, le=1000),
-    db: AsyncSession = Depends(get_db)
-):
-    """Get illegal mining data"""
+# Columns returned by the list endpoints, keyed by response field name.
+# Selected with Core so rows come back as plain mappings, not ORM instances.
+ILLEGAL_MINING_COLUMNS = {
+    "id": IllegalMining.id,
+    "mobile_id": IllegalMining.mobile_id,
+    "kabupaten": IllegalMining.kabupaten,
+    "location_lat": IllegalMining.location_lat,
+    "location_lng": IllegalMining.location_lng,
+    "nama_pemilik": IllegalMining.nama_pemilik,
+    "jenis_tambang": IllegalMining.jenis_tambang,
+    "kecamatan": IllegalMining.kecamatan,
+    "jumlah_pekerja": IllegalMining.jumlah_pekerja,
+    "estimasi_produksi_hari": IllegalMining.estimasi_produksi_hari,
+    "tanggal_survey": IllegalMining.tanggal_survey,
+    "created_at": IllegalMining.created_at
+}
+
+PRODUCTION_COLUMNS = {
+    "id": Production.id,
+    "source_id": Production.source_id,
+    "tanggal_produksi": Production.tanggal_produksi,
+    "lokasi": Production.lokasi,
+    "kabupaten": Production.kabupaten,
+    "kecamatan": Production.kecamatan,
+    "location_lat": Production.location_lat,
+    "location_lng": Production.location_lng,
+    "produksi_ton": Production.produksi_ton,
+    "kadar_sn": Production.kadar_sn,
+    "metode_tambang": Production.metode_tambang,
+    "operator": Production.operator,
+    "created_at": Production.created_at
+}
+
+IUP_COLUMNS = {
+    "id": IUP.id,
+    "name": IUP.name,
+    "du": IUP.du,
+    "location_lat": IUP.location_lat,
+    "location_lng": IUP.location_lng,
+    "daerah": IUP.daerah,
+    "kabupaten": IUP.daerah,  # Map daerah to kabupaten for consistency
+    "luas": IUP.luas,
+    "no_sk": IUP.no_sk,
+    "tgl_sk": IUP.tgl_sk,
+    "cnc": IUP.cnc,
+    "status": IUP.status,
+    "created_at": IUP.created_at
+}
+
+def select_fields(columns: Dict[str, Any], fields: Optional[str]):
+    """Build a Core select over the requested comma-separated fields (all when empty)"""
+    if fields:
+        names = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+        unknown = [name for name in names if name not in columns]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(columns)}"
+            )
+    else:
+        names = list(columns)
+    
+    return select(*(columns[name].label(name) for name in names))
+
+FIELDS_QUERY = Query(None, description="Comma-separated list of fields to return")
+
+# Query functions shared by the GET routes and the dashboard batch endpoint.
+# Each returns the response payload and raises HTTPException on failure.
+
+async def illegal_mining_data(
+    db: AsyncSession,
+    kabupaten: Optional[str] = None,
+    limit: int = 100,
+    fields: Optional[str] = None
+) -> Dict[str, Any]:
+    """Illegal mining rows"""
+    query = select_fields(ILLEGAL_MINING_COLUMNS, fields)
+    
     try:
-        query = select(IllegalMining)
-        
         if kabupaten:
             query = query.where(IllegalMining.kabupaten.ilike(f"%{kabupaten}%"))
         
         query = query.limit(limit)
         result = await db.execute(query)
-        records = result.scalars().all()
-        
-        # Convert to dict format
-        data = []
-        for record in records:
-            data.append({
-                "id": record.id,
-                "mobile_id": record.mobile_id,
-                "kabupaten": record.kabupaten,
-                "location_lat": record.location_lat,
-                "location_lng": record.location_lng,
-                "nama_pemilik": record.nama_pemilik,
-                "jenis_tambang": record.jenis_tambang,
-                "kecamatan": record.kecamatan,
-                "jumlah_pekerja": record.jumlah_pekerja,
-                "estimasi_produksi_hari": record.estimasi_produksi_hari,
-                "tanggal_survey": record.tanggal_survey.isoformat() if record.tanggal_survey else None,
-                "created_at": record.created_at.isoformat() if record.created_at else None
-            })
+        data = [dict(row) for row in result.mappings()]
         
         return {
             "data": data,
             "total": len(data),
-            "filters": {"kabupaten": kabupaten, "limit": limit}
+            "filters": {"kabupaten": kabupaten, "limit": limit, "fields": fields}
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch illegal mining data: {str(e)}")
 
-@router.get("/production")
-async def get_production(
-    kabupaten: Optional[str] = Query(None),
-    date_from: Optional[datetime] = Query(None),
-    date_to: Optional[datetime] = Query(None),
-    limit: int = Query(100, le=1000),
-    db: AsyncSession = Depends(get_db)
-):
-    """Get production data"""
+async def production_data(
+    db: AsyncSession,
+    kabupaten: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    limit: int = 100,
+    fields: Optional[str] = None
+) -> Dict[str, Any]:
+    """Production rows"""
+    query = select_fields(PRODUCTION_COLUMNS, fields)
+    
     try:
-        query = select(Production)
-        
         if kabupaten:
             query = query.where(Production.kabupaten.ilike(f"%{kabupaten}%"))
         
@@ -74,25 +128,7 @@ async def get_production(
         
         query = query.limit(limit)
         result = await db.execute(query)
-        records = result.scalars().all()
-        
-        # Convert to dict format
-        data = []
-        for record in records:
-            data.append({
-                "id": record.id,
-                "tanggal_produksi": record.tanggal_produksi.isoformat() if record.tanggal_produksi else None,
-                "lokasi": record.lokasi,
-                "kabupaten": record.kabupaten,
-                "kecamatan": record.kecamatan,
-                "location_lat": record.location_lat,
-                "location_lng": record.location_lng,
-                "produksi_ton": record.produksi_ton,
-                "kadar_sn": record.kadar_sn,
-                "metode_tambang": record.metode_tambang,
-                "operator": record.operator,
-                "created_at": record.created_at.isoformat() if record.created_at else None
-            })
+        data = [dict(row) for row in result.mappings()]
         
         return {
             "data": data,
@@ -101,23 +137,24 @@ async def get_production(
                 "kabupaten": kabupaten,
                 "date_from": date_from,
                 "date_to": date_to,
-                "limit": limit
+                "limit": limit,
+                "fields": fields
             }
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch production data: {str(e)}")
 
-@router.get("/iup")
-async def get_iup(
-    status: Optional[str] = Query(None),
-    kabupaten: Optional[str] = Query(None),
-    limit: int = Query(100, le=1000),
-    db: AsyncSession = Depends(get_db)
-):
-    """Get IUP data"""
+async def iup_data(
+    db: AsyncSession,
+    status: Optional[str] = None,
+    kabupaten: Optional[str] = None,
+    limit: int = 100,
+    fields: Optional[str] = None
+) -> Dict[str, Any]:
+    """IUP rows"""
+    query = select_fields(IUP_COLUMNS, fields)
+    
     try:
-        query = select(IUP)
-        
         if status:
             query = query.where(IUP.status.ilike(f"%{status}%"))
         
@@ -126,94 +163,260 @@ async def get_iup(
         
         query = query.limit(limit)
         result = await db.execute(query)
-        records = result.scalars().all()
-        
-        # Convert to dict format
-        data = []
-        for record in records:
-            data.append({
-                "id": record.id,
-                "name": record.name,
-                "du": record.du,
-                "location_lat": record.location_lat,
-                "location_lng": record.location_lng,
-                "daerah": record.daerah,
-                "kabupaten": record.daerah,  # Map daerah to kabupaten for consistency
-                "luas": record.luas,
-                "no_sk": record.no_sk,
-                "tgl_sk": record.tgl_sk.isoformat() if record.tgl_sk else None,
-                "cnc": record.cnc,
-                "status": record.status,
-                "created_at": record.created_at.isoformat() if record.created_at else None
-            })
+        data = [dict(row) for row in result.mappings()]
         
         return {
             "data": data,
             "total": len(data),
-            "filters": {"status": status, "kabupaten": kabupaten, "limit": limit}
+            "filters": {"status": status, "kabupaten": kabupaten, "limit": limit, "fields": fields}
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch IUP data: {str(e)}")
 
-@router.get("/stats/summary")
-async def get_summary_stats(db: AsyncSession = Depends(get_db)):
-    """Get summary statistics"""
+def kabupaten_condition(model, kabupaten: Optional[List[str]]):
+    """WHERE clause for a kabupaten list; IUP records only carry a free-text daerah"""
+    if model is IUP:
+        return or_(*(IUP.daerah.ilike(f"%{name}%") for name in kabupaten))
+    return model.kabupaten.in_(kabupaten)
+
+def month_bucket(column, dialect: str):
+    """Truncate a timestamp to its month as 'YYYY-MM' text"""
+    if dialect == "postgresql":
+        return func.to_char(func.date_trunc("month", column), "YYYY-MM")
+    return func.strftime("%Y-%m", column)
+
+async def summary_stats(db: AsyncSession, kabupaten: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Headline counts and production total"""
     try:
+        illegal_query = select(func.count(IllegalMining.id))
+        iup_query = select(func.count(IUP.id), func.count(IUP.id).filter(IUP.status.ilike("%active%")))
+        production_query = select(func.count(Production.id), func.sum(Production.produksi_ton))
+        if kabupaten:
+            illegal_query = illegal_query.where(kabupaten_condition(IllegalMining, kabupaten))
+            iup_query = iup_query.where(kabupaten_condition(IUP, kabupaten))
+            production_query = production_query.where(kabupaten_condition(Production, kabupaten))
+        
         # Count illegal mining sites
-        illegal_count_result = await db.execute(select(func.count(IllegalMining.id)))
-        illegal_count = illegal_count_result.scalar_one()
+        illegal_count = (await db.execute(illegal_query)).scalar_one()
         
-        # Count active IUPs
-        active_iup_result = await db.execute(
-            select(func.count(IUP.id)).where(IUP.status.ilike("%active%"))
-        )
-        active_iup_count = active_iup_result.scalar_one()
+        # Count all and active IUPs
+        iup_count, active_iup_count = (await db.execute(iup_query)).one()
         
-        # Total production
-        production_sum_result = await db.execute(select(func.sum(Production.produksi_ton)))
-        total_production = production_sum_result.scalar_one() or 0.0
+        # Production records and total production
+        production_count, total_production = (await db.execute(production_query)).one()
         
         return {
             "illegal_mining_count": illegal_count,
             "active_iup_count": active_iup_count,
-            "total_production_tons": float(total_production),
-            "last_updated": datetime.utcnow().isoformat()
+            "iup_count": iup_count,
+            "production_record_count": production_count,
+            "total_production_tons": float(total_production or 0.0),
+            "filters": {"kabupaten": kabupaten},
+            "last_updated": datetime.utcnow()
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch summary stats: {str(e)}")
 
-@router.get("/map-data")
-async def get_map_data(
-    layer: str = Query("all"),
-    kabupaten: Optional[List[str]] = Query(None),
-    db: AsyncSession = Depends(get_db)
-):
-    """Get geospatial data for maps"""
+# Columns a distribution can be grouped by, per record type
+DISTRIBUTION_FIELDS = {
+    "illegal": (IllegalMining, ["jenis_tambang", "kabupaten", "kecamatan"]),
+    "production": (Production, ["metode_tambang", "kabupaten", "kecamatan", "operator"]),
+    "iup": (IUP, ["status", "cnc", "daerah"])
+}
+
+async def distribution_data(
+    db: AsyncSession,
+    entity: str = "illegal",
+    field: str = "jenis_tambang",
+    kabupaten: Optional[List[str]] = None,
+    limit: int = 20
+) -> Dict[str, Any]:
+    """Record counts per value of one column, largest first"""
+    if entity not in DISTRIBUTION_FIELDS:
+        raise HTTPException(status_code=400, detail=f"Unknown entity: {entity}. Available: {', '.join(DISTRIBUTION_FIELDS)}")
+    model, fields = DISTRIBUTION_FIELDS[entity]
+    if field not in fields:
+        raise HTTPException(status_code=400, detail=f"Cannot group {entity} by {field}. Available: {', '.join(fields)}")
+    
+    try:
+        column = getattr(model, field)
+        count = func.count(model.id)
+        query = select(column, count).group_by(column).order_by(count.desc(), column).limit(limit)
+        if kabupaten:
+            query = query.where(kabupaten_condition(model, kabupaten))
+        
+        distribution = {value or "Unknown": total for value, total in await db.execute(query)}
+        return {
+            "entity": entity,
+            "field": field,
+            "distribution": distribution,
+            "filters": {"kabupaten": kabupaten, "limit": limit}
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch {entity} distribution: {str(e)}")
+
+async def production_trend_data(
+    db: AsyncSession,
+    kabupaten: Optional[List[str]] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """Monthly production tons and record counts"""
+    try:
+        period = month_bucket(Production.tanggal_produksi, db.bind.dialect.name).label("period")
+        query = select(
+            period,
+            func.sum(Production.produksi_ton).label("production"),
+            func.count(Production.id).label("records")
+        ).group_by(period).order_by(period)
+        
+        if kabupaten:
+            query = query.where(kabupaten_condition(Production, kabupaten))
+        
+        if date_from:
+            query = query.where(Production.tanggal_produksi >= date_from)
+        
+        if date_to:
+            query = query.where(Production.tanggal_produksi <= date_to)
+        
+        trend = [
+            {"date": date, "production": round(float(production or 0.0), 3), "records": records}
+            for date, production, records in await db.execute(query)
+        ]
+        return {
+            "trend": trend,
+            "filters": {"kabupaten": kabupaten, "date_from": date_from, "date_to": date_to}
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch production trend: {str(e)}")
+
+# Activity feed sources: event date column, activity type, extra columns and how
+# each row is described. The date columns are indexed, so every source query
+# is a backward index scan stopped by its LIMIT.
+ACTIVITY_SOURCES = {
+    "illegal": (
+        IllegalMining.tanggal_survey,
+        "Illegal Mining Detected",
+        [IllegalMining.kabupaten.label("location"), IllegalMining.kecamatan, IllegalMining.jenis_tambang, IllegalMining.nama_pemilik],
+        lambda row: f"{row['jenis_tambang'] or 'Unknown'} site of {row['nama_pemilik'] or 'unknown owner'} surveyed in {row['kecamatan'] or row['location']}"
+    ),
+    "production": (
+        Production.tanggal_produksi,
+        "Production Report",
+        [Production.kabupaten.label("location"), Production.lokasi, Production.operator, Production.produksi_ton],
+        lambda row: f"{row['produksi_ton'] or 0:,.1f} tons by {row['operator'] or 'unknown operator'} at {row['lokasi']}"
+    ),
+    "iup": (
+        IUP.tgl_sk,
+        "IUP Issued",
+        [IUP.daerah.label("location"), IUP.name, IUP.status],
+        lambda row: f"{row['name']} ({row['status'] or 'no status'})"
+    )
+}
+
+async def recent_activity_data(
+    db: AsyncSession,
+    limit: int = 10,
+    kabupaten: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """Newest events across all record types.
+
+    Each source returns at most `limit` rows already ordered newest first,
+    and the sorted streams are k-way merged, so the cost is bounded by
+    `limit` per table regardless of table size.
+    """
+    try:
+        streams = []
+        for entity, (date_column, activity_type, columns, describe) in ACTIVITY_SOURCES.items():
+            model = date_column.class_
+            query = (
+                select(model.id, date_column.label("timestamp"), *columns)
+                .where(date_column.isnot(None))
+                .order_by(date_column.desc())
+                .limit(limit)
+            )
+            if kabupaten:
+                query = query.where(kabupaten_condition(model, kabupaten))
+            
+            streams.append([
+                {
+                    "timestamp": row["timestamp"],
+                    "type": activity_type,
+                    "entity": entity,
+                    "id": row["id"],
+                    "location": row["location"],
+                    "details": describe(row)
+                }
+                for row in (await db.execute(query)).mappings()
+            ])
+        
+        merged = heapq.merge(*streams, key=lambda activity: activity["timestamp"], reverse=True)
+        activities = list(itertools.islice(merged, limit))
+        return {
+            "activities": activities,
+            "total": len(activities),
+            "filters": {"kabupaten": kabupaten, "limit": limit}
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch recent activity: {str(e)}")
+
+async def regions_data(db: AsyncSession) -> Dict[str, Any]:
+    """Kabupaten -> kecamatan gazetteer from the illegal mining and production records"""
+    try:
+        regions: Dict[str, set] = {}
+        for model in (IllegalMining, Production):
+            result = await db.execute(select(model.kabupaten, model.kecamatan).distinct())
+            for kabupaten, kecamatan in result:
+                if kabupaten:
+                    names = regions.setdefault(kabupaten, set())
+                    if kecamatan:
+                        names.add(kecamatan)
+        
+        return {
+            "regions": {kabupaten: sorted(names) for kabupaten, names in sorted(regions.items())},
+            "kabupaten_count": len(regions),
+            "kecamatan_count": sum(len(names) for names in regions.values())
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch regions: {str(e)}")
+
+async def map_data(
+    db: AsyncSession,
+    layer: str = "all",
+    kabupaten: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """GeoJSON FeatureCollection of the requested layer"""
     try:
         features = []
         
         if layer in ["all", "illegal"]:
             # Get illegal mining data
-            query = select(IllegalMining)
+            query = select(
+                IllegalMining.id,
+                IllegalMining.kabupaten,
+                IllegalMining.jenis_tambang,
+                IllegalMining.nama_pemilik,
+                IllegalMining.location_lat,
+                IllegalMining.location_lng
+            )
             if kabupaten:
                 query = query.where(IllegalMining.kabupaten.in_(kabupaten))
             result = await db.execute(query)
-            records = result.scalars().all()
             
-            for record in records:
-                if record.location_lat and record.location_lng:
+            for id_, kab, jenis_tambang, nama_pemilik, lat, lng in result:
+                if lat and lng:
                     features.append({
                         "type": "Feature",
                         "geometry": {
                             "type": "Point",
-                            "coordinates": [record.location_lng, record.location_lat]
+                            "coordinates": [lng, lat]
                         },
                         "properties": {
                             "type": "illegal",
-                            "id": record.id,
-                            "kabupaten": record.kabupaten,
-                            "jenis_tambang": record.jenis_tambang,
-                            "nama_pemilik": record.nama_pemilik
+                            "id": id_,
+                            "kabupaten": kab,
+                            "jenis_tambang": jenis_tambang,
+                            "nama_pemilik": nama_pemilik
                         }
                     })
         
@@ -223,3 +426,128 @@ async def get_map_data(
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch map data: {str(e)}")
+
+@router.get("/illegal-mining")
+async def get_illegal_mining(
+    kabupaten: Optional[str] = Query(None),
+    limit: int = Query(100, le=1000),
+    fields: Optional[str] = FIELDS_QUERY,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get illegal mining data"""
+    return ORJSONResponse(await illegal_mining_data(db, kabupaten, limit, fields))
+
+@router.get("/production")
+async def get_production(
+    kabupaten: Optional[str] = Query(None),
+    date_from: Optional[datetime] = Query(None),
+    date_to: Optional[datetime] = Query(None),
+    limit: int = Query(100, le=1000),
+    fields: Optional[str] = FIELDS_QUERY,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get production data"""
+    return ORJSONResponse(await production_data(db, kabupaten, date_from, date_to, limit, fields))
+
+@router.get("/iup")
+async def get_iup(
+    status: Optional[str] = Query(None),
+    kabupaten: Optional[str] = Query(None),
+    limit: int = Query(100, le=1000),
+    fields: Optional[str] = FIELDS_QUERY,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get IUP data"""
+    return ORJSONResponse(await iup_data(db, status, kabupaten, limit, fields))
+
+@router.get("/stats/summary")
+async def get_summary_stats(
+    kabupaten: Optional[List[str]] = Query(None),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get summary statistics"""
+    return ORJSONResponse(await summary_stats(db, kabupaten))
+
+@router.get("/stats/distribution")
+async def get_distribution(
+    entity: str = Query("illegal"),
+    field: str = Query("jenis_tambang"),
+    kabupaten: Optional[List[str]] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get record counts grouped by one column"""
+    return ORJSONResponse(await distribution_data(db, entity, field, kabupaten, limit))
+
+@router.get("/stats/production-trend")
+async def get_production_trend(
+    kabupaten: Optional[List[str]] = Query(None),
+    date_from: Optional[datetime] = Query(None),
+    date_to: Optional[datetime] = Query(None),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get monthly production totals"""
+    return ORJSONResponse(await production_trend_data(db, kabupaten, date_from, date_to))
+
+@router.get("/activity/recent")
+async def get_recent_activity(
+    limit: int = Query(10, ge=1, le=200),
+    kabupaten: Optional[List[str]] = Query(None),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get the newest events across illegal mining, production and IUP records"""
+    return ORJSONResponse(await recent_activity_data(db, limit, kabupaten))
+
+@router.get("/regions")
+async def get_regions(db: AsyncSession = Depends(get_read_db)):
+    """Kabupaten -> kecamatan gazetteer"""
+    return ORJSONResponse(await regions_data(db))
+
+@router.get("/map-data")
+async def get_map_data(
+    layer: str = Query("all"),
+    kabupaten: Optional[List[str]] = Query(None),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get geospatial data for maps"""
+    return ORJSONResponse(await map_data(db, layer, kabupaten))
+
+# Models and natural keys for single-record lookups (map popups)
+DETAIL_MODELS = {"illegal": IllegalMining, "production": Production, "iup": IUP}
+DETAIL_NATURAL_KEYS = {"illegal": IllegalMining.mobile_id, "production": Production.source_id, "iup": IUP.du}
+
+@router.get("/{layer}/{record_id:path}")
+async def get_record_detail(
+    layer: str,
+    record_id: str,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get a single record by id (or natural key) for map popups"""
+    model = DETAIL_MODELS.get(layer)
+    if model is None:
+        raise HTTPException(status_code=404, detail=f"Unknown layer: {layer}")
+    
+    try:
+        condition = model.id == record_id
+        natural_key = DETAIL_NATURAL_KEYS.get(layer)
+        if natural_key is not None:
+            condition = condition | (natural_key == record_id)
+        
+        result = await db.execute(select(model).where(condition).limit(1))
+        record = result.scalars().first()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch {layer} record: {str(e)}")
+    
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"{layer} record not found: {record_id}")
+    
+    data = {
+        column.key: getattr(record, column.key)
+        for column in model.__table__.columns
+        if column.key not in ("metadata_json", "polygon_data", "content_hash")
+    }
+    
+    if layer == "iup":
+        data["kabupaten"] = record.daerah  # Map daerah to kabupaten for consistency
+    
+    return ORJSONResponse(data)
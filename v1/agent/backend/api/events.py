@@ -0,0 +1,122 @@
+from fastapi import APIRouter, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+import orjson
+from config import settings
+from services.change_feed import Subscription, change_feed
+from utils.responses import ORJSONResponse
+
+router = APIRouter()
+
+TABLES = {"illegal", "production", "iup"}
+
+def parse_tables(tables: Optional[str]) -> Optional[Set[str]]:
+    """Comma-separated table filter (all tables when empty)"""
+    if not tables:
+        return None
+    names = {name.strip() for name in tables.split(",") if name.strip()}
+    unknown = names - TABLES
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown tables: {', '.join(sorted(unknown))}. Available: {', '.join(sorted(TABLES))}")
+    return names
+
+async def open_subscription(tables: Optional[Set[str]], since: Optional[int]) -> Tuple[Subscription, bool]:
+    """Subscribe, replaying logged changes after `since`; the flag is False when a full reload is needed"""
+    try:
+        subscription = change_feed.subscribe(tables, since)
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=f"Failed to subscribe to changes: {str(e)}")
+    
+    complete = True
+    if since is not None:
+        try:
+            complete = await change_feed.replay(subscription)
+        except Exception as e:
+            change_feed.unsubscribe(subscription)
+            raise HTTPException(status_code=500, detail=f"Failed to replay changes: {str(e)}")
+        if not complete:
+            subscription.after = change_feed.generation
+    return subscription, complete
+
+async def next_changes(subscription: Subscription) -> Optional[List[Dict[str, Any]]]:
+    """Wait for coalesced changes; None after a heartbeat interval without any"""
+    return await subscription.next(settings.CHANGE_EVENTS_HEARTBEAT_SECONDS, settings.CHANGE_EVENTS_COALESCE_MS / 1000)
+
+def sse_message(event: str, data: Any, event_id: Optional[int] = None) -> bytes:
+    message = b"event: " + event.encode() + b"\n"
+    if event_id is not None:
+        message += b"id: " + str(event_id).encode() + b"\n"
+    return message + b"data: " + orjson.dumps(data) + b"\n\n"
+
+async def sse_changes(request: Request, subscription: Subscription, complete: bool) -> AsyncIterator[bytes]:
+    """Coalesced change events; the next batch is only taken once the previous one was sent"""
+    try:
+        yield sse_message("ready", {"generation": subscription.after, "complete": complete})
+        if not complete:
+            yield sse_message("reset", {"generation": subscription.after}, subscription.after)
+        while not await request.is_disconnected():
+            events = await next_changes(subscription)
+            if events is None:
+                yield b": keepalive\n\n"
+                continue
+            for event in events:
+                yield sse_message("change", event, event["generation"])
+    finally:
+        change_feed.unsubscribe(subscription)
+
+@router.get("")
+async def stream_changes(
+    request: Request,
+    tables: Optional[str] = Query(None, description="Comma-separated tables to follow (default all)"),
+    since: Optional[int] = Query(None, description="Replay changes after this generation")
+):
+    """Server-sent change events (table, count, kabupaten, generation) for newly ingested data"""
+    # Reconnecting EventSource clients send the last generation they saw
+    last_event_id = request.headers.get("last-event-id")
+    if since is None and last_event_id and last_event_id.isdigit():
+        since = int(last_event_id)
+    
+    subscription, complete = await open_subscription(parse_tables(tables), since)
+    return StreamingResponse(
+        sse_changes(request, subscription, complete),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache, no-transform", "X-Accel-Buffering": "no"}
+    )
+
+def json_text(data: Dict[str, Any]) -> str:
+    return orjson.dumps(data).decode()
+
+@router.websocket("/ws")
+async def websocket_changes(
+    websocket: WebSocket,
+    tables: Optional[str] = Query(None),
+    since: Optional[int] = Query(None)
+):
+    """The same change events over a WebSocket, one JSON message per event"""
+    try:
+        subscription, complete = await open_subscription(parse_tables(tables), since)
+    except HTTPException as e:
+        await websocket.close(code=1008 if e.status_code == 400 else 1013, reason=e.detail)
+        return
+    
+    await websocket.accept()
+    try:
+        await websocket.send_text(json_text({"event": "ready", "generation": subscription.after, "complete": complete}))
+        if not complete:
+            await websocket.send_text(json_text({"event": "reset", "generation": subscription.after}))
+        while True:
+            events = await next_changes(subscription)
+            if events is None:
+                await websocket.send_text(json_text({"event": "keepalive", "generation": change_feed.generation}))
+                continue
+            for event in events:
+                await websocket.send_text(json_text({"event": "change", **event}))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        change_feed.unsubscribe(subscription)
+
+@router.get("/generation")
+async def change_generation():
+    """Latest generation and subscriber counts of the change feed"""
+    return ORJSONResponse(change_feed.stats())
@@ -23,6 +23,7 @@ async def health_check():
 async def detailed_health():
     """Detailed health check including services"""
     from datetime import datetime
+    from database.db import database
     
     # TODO: Add checks for database, external APIs, etc.
     return {
@@ -34,5 +35,6 @@ async def detailed_health():
             "source2_api": "unknown", 
             "source3_api": "unknown",
             "gemini_api": "unknown"
-        }
+        },
+        "database_pool": database.pool_status()
     }
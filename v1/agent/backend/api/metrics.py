@@ -0,0 +1,9 @@
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+router = APIRouter()
+
+@router.get("", include_in_schema=False)
+async def metrics():
+    """Prometheus exposition of request, database, cache and ingestion metrics"""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,56 @@
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Any, AsyncIterator, Dict, Optional
+import orjson
+from agents.query_agent import QueryAgent
+from agents.query_cache import query_cache
+from config import settings
+from utils.responses import ORJSONResponse
+
+router = APIRouter()
+
+class QueryRequest(BaseModel):
+    query: str = Field(..., min_length=1, max_length=2000)
+    stream: Optional[bool] = None  # Default: stream when the client accepts text/event-stream
+    cache: bool = True  # False forces a fresh plan and model answer
+
+def format_sse(item: Dict[str, Any]) -> bytes:
+    return b"event: " + item["event"].encode() + b"\ndata: " + orjson.dumps(item["data"], option=orjson.OPT_NON_STR_KEYS) + b"\n\n"
+
+async def sse_stream(events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    async for item in events:
+        yield format_sse(item)
+
+@router.post("")
+async def query_agent(body: QueryRequest, request: Request):
+    """Answer a natural-language question; streams plan, SQL, results and answer tokens over SSE"""
+    agent = QueryAgent(cache=query_cache if body.cache and settings.QUERY_CACHE_ENABLED else None)
+    
+    stream = body.stream if body.stream is not None else "text/event-stream" in request.headers.get("accept", "")
+    if stream:
+        return StreamingResponse(
+            sse_stream(agent.run(body.query)),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+    
+    response: Dict[str, Any] = {"query": body.query}
+    async for item in agent.run(body.query):
+        if item["event"] == "error":
+            raise HTTPException(status_code=500, detail=f"Failed to process query: {item['data']['message']}")
+        if item["event"] == "answer":
+            response.update(item["data"])
+        elif item["event"] == "cache":
+            response["cache"] = item["data"]
+        elif item["event"] == "sql":
+            response.setdefault("sql", []).append(item["data"]["sql"])
+        elif item["event"] == "done":
+            response["elapsed_ms"] = item["data"]["elapsed_ms"]
+    
+    return ORJSONResponse(response)
+
+@router.get("/cache")
+async def query_cache_stats():
+    """Entries and hit/miss counts of the query plan cache"""
+    return ORJSONResponse(query_cache.stats())
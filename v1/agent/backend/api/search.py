@@ -0,0 +1,55 @@
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from typing import Optional
+import time
+from api.data import ILLEGAL_MINING_COLUMNS, PRODUCTION_COLUMNS, IUP_COLUMNS
+from database.db import get_read_db
+from utils.responses import ORJSONResponse
+from vectors.record_index import record_index
+
+router = APIRouter()
+
+SEARCH_COLUMNS = {"illegal": ILLEGAL_MINING_COLUMNS, "production": PRODUCTION_COLUMNS, "iup": IUP_COLUMNS}
+
+@router.get("")
+async def search_records(
+    q: str = Query(..., min_length=1, max_length=500),
+    entity: Optional[str] = Query(None, description="illegal, production or iup; all when empty"),
+    k: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Similarity search over owner, operator, location and permit fields of all records"""
+    if entity is not None and entity not in SEARCH_COLUMNS:
+        raise HTTPException(status_code=400, detail=f"Unknown entity: {entity}. Available: {', '.join(SEARCH_COLUMNS)}")
+    
+    start = time.perf_counter()
+    try:
+        # Embedding and the vector scan are CPU-bound; keep them off the event loop
+        hits = await run_in_threadpool(record_index.search, q, k, entity)
+        
+        records = {}
+        for name in {name for name, _, _ in hits}:
+            columns = SEARCH_COLUMNS[name]
+            ids = [record_id for hit_entity, record_id, _ in hits if hit_entity == name]
+            query = select(*(column.label(field) for field, column in columns.items())).where(columns["id"].in_(ids))
+            for row in (await db.execute(query)).mappings():
+                records[(name, row["id"])] = dict(row)
+        
+        # Records deleted since the index was written are skipped
+        results = [
+            {"entity": name, "id": record_id, "score": score, "record": records[(name, record_id)]}
+            for name, record_id, score in hits
+            if (name, record_id) in records
+        ]
+        
+        return ORJSONResponse({
+            "query": q,
+            "results": results,
+            "total": len(results),
+            "indexed": len(record_index),
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 2)
+        })
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to search records: {str(e)}")
@@ -13,34 +13,119 @@ class Settings(BaseSettings):
     DB_NAME: str = os.getenv("DB_NAME", "tinsig_db")
     DB_USER: str = os.getenv("DB_USER", "tinsig_user")
     DB_PASSWORD: str = os.getenv("DB_PASSWORD", "tinsig_password")
+    DB_ECHO: bool = os.getenv("DB_ECHO", "false").lower() == "true"
+    
+    # Read replicas (comma-separated URLs); reads fall back to the primary when empty or lagging
+    DATABASE_REPLICA_URLS: str = os.getenv("DATABASE_REPLICA_URLS", "")
+    REPLICA_MAX_LAG_SECONDS: float = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+    REPLICA_LAG_CHECK_INTERVAL: float = float(os.getenv("REPLICA_LAG_CHECK_INTERVAL", "5"))
+    
+    # Database connection pool
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    DB_POOL_WAIT_WARN_MS: float = float(os.getenv("DB_POOL_WAIT_WARN_MS", "100"))
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+    DB_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+    
+    # Schema at startup: verify (revision check only), upgrade (apply migrations) or off
+    DB_SCHEMA_MODE: str = os.getenv("DB_SCHEMA_MODE", "verify")
+    
+    # Monthly range partitions of production and illegal_mining (PostgreSQL only)
+    PARTITIONING_ENABLED: bool = os.getenv("PARTITIONING_ENABLED", "true").lower() == "true"
+    PARTITION_PREMAKE_MONTHS: int = int(os.getenv("PARTITION_PREMAKE_MONTHS", "3"))
+    PARTITION_RETENTION_MONTHS: int = int(os.getenv("PARTITION_RETENTION_MONTHS", "0"))  # 0 keeps every month; older ones are detached
+    PARTITION_BRIN_PAGES_PER_RANGE: int = int(os.getenv("PARTITION_BRIN_PAGES_PER_RANGE", "32"))
     
     # API Keys
     GEMINI_API_KEY: str = os.getenv("GEMINI_API_KEY", "")
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
     
+    # Query agent model: auto (Gemini when GEMINI_API_KEY is set, else local), gemini, local
+    LLM_PROVIDER: str = os.getenv("LLM_PROVIDER", "auto")
+    GEMINI_MODEL: str = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
+    LOCAL_MODEL_TOKEN_DELAY_MS: float = float(os.getenv("LOCAL_MODEL_TOKEN_DELAY_MS", "0"))
+    # Rule plans below this confidence (share of entity/intent matched by keyword) are re-planned by a tool-calling model
+    QUERY_PLANNER_MIN_CONFIDENCE: float = float(os.getenv("QUERY_PLANNER_MIN_CONFIDENCE", "0.75"))
+    
+    # Query plan cache: exact and similar questions reuse a plan and skip planning
+    QUERY_CACHE_ENABLED: bool = os.getenv("QUERY_CACHE_ENABLED", "true").lower() == "true"
+    QUERY_CACHE_MAX_ENTRIES: int = int(os.getenv("QUERY_CACHE_MAX_ENTRIES", "1000"))
+    QUERY_CACHE_SIMILARITY_THRESHOLD: float = float(os.getenv("QUERY_CACHE_SIMILARITY_THRESHOLD", "0.8"))
+    QUERY_CACHE_TTL_SECONDS: float = float(os.getenv("QUERY_CACHE_TTL_SECONDS", "86400"))
+    QUERY_CACHE_SCHEMA_CHECK_SECONDS: float = float(os.getenv("QUERY_CACHE_SCHEMA_CHECK_SECONDS", "60"))
+    
+    # Dashboard batch endpoint: sub-queries per request and connections used per batch
+    DASHBOARD_BATCH_MAX_QUERIES: int = int(os.getenv("DASHBOARD_BATCH_MAX_QUERIES", "20"))
+    DASHBOARD_BATCH_CONCURRENCY: int = int(os.getenv("DASHBOARD_BATCH_CONCURRENCY", "4"))
+    
+    # Change feed: ingestion batches pushed to dashboards over SSE / WebSocket
+    CHANGE_EVENTS_ENABLED: bool = os.getenv("CHANGE_EVENTS_ENABLED", "true").lower() == "true"
+    CHANGE_EVENTS_POLL_SECONDS: float = float(os.getenv("CHANGE_EVENTS_POLL_SECONDS", "2"))  # Without PostgreSQL LISTEN
+    CHANGE_EVENTS_COALESCE_MS: float = float(os.getenv("CHANGE_EVENTS_COALESCE_MS", "250"))
+    CHANGE_EVENTS_HEARTBEAT_SECONDS: float = float(os.getenv("CHANGE_EVENTS_HEARTBEAT_SECONDS", "15"))
+    CHANGE_EVENTS_MAX_SUBSCRIBERS: int = int(os.getenv("CHANGE_EVENTS_MAX_SUBSCRIBERS", "500"))
+    CHANGE_EVENTS_RETENTION: int = int(os.getenv("CHANGE_EVENTS_RETENTION", "10000"))
+    
     # Source APIs
     SOURCE1_URL: str = os.getenv("SOURCE1_URL", "http://localhost:8001")
     SOURCE2_URL: str = os.getenv("SOURCE2_URL", "http://localhost:8002")
     SOURCE3_URL: str = os.getenv("SOURCE3_URL", "http://localhost:8003")
+    INGESTION_BATCH_SIZE: int = int(os.getenv("INGESTION_BATCH_SIZE", "1000"))
     
     # Application
     ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development")
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-super-secret-key-here")
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
-    ALLOWED_ORIGINS: List[str] = ["http://localhost:8501", "http://localhost:3000", "http://127.0.0.1:8501"]
+    ALLOWED_ORIGINS: List[str] = ["http://localhost:8501", "http://localhost:3000", "http://127.0.0.1:8501", "http://localhost:8502", "http://127.0.0.1:8502"]
+    
+    # Response compression
+    COMPRESSION_ENABLED: bool = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    COMPRESSION_ALGORITHMS: str = os.getenv("COMPRESSION_ALGORITHMS", "br,zstd,gzip")  # Server preference order
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    COMPRESSION_MIN_SIZES: str = os.getenv("COMPRESSION_MIN_SIZES", "application/json=512,application/geo+json=512,text/=1024")
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+    COMPRESSION_ZSTD_LEVEL: int = int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3"))
+    COMPRESSION_EXCLUDED_TYPES: str = os.getenv(
+        "COMPRESSION_EXCLUDED_TYPES",
+        "image/,video/,audio/,font/woff,application/zip,application/gzip,application/zstd,"
+        "application/x-protobuf,application/vnd.mapbox-vector-tile,application/vnd.apache.parquet,"
+        "application/octet-stream"
+    )
+    
+    # Profiling (opt-in): slow requests, or requests with a valid X-Profile-Token, are captured
+    PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    PROFILING_THRESHOLD_MS: float = float(os.getenv("PROFILING_THRESHOLD_MS", "1000"))
+    PROFILING_SAMPLE_INTERVAL_MS: float = float(os.getenv("PROFILING_SAMPLE_INTERVAL_MS", "5"))
+    PROFILING_DIR: str = os.getenv("PROFILING_DIR", "profiles")
+    PROFILING_MAX_FILES: int = int(os.getenv("PROFILING_MAX_FILES", "200"))
     
     # Vector Store
     VECTOR_STORE_TYPE: str = os.getenv("VECTOR_STORE_TYPE", "faiss")
     QDRANT_URL: str = os.getenv("QDRANT_URL", "http://localhost:6333")
     QDRANT_API_KEY: str = os.getenv("QDRANT_API_KEY", "")
     
+    # Embeddings: hashing (offline, deterministic) or sentence-transformers
+    EMBEDDING_MODEL: str = os.getenv("EMBEDDING_MODEL", "hashing")
+    EMBEDDING_MODEL_NAME: str = os.getenv("EMBEDDING_MODEL_NAME", "sentence-transformers/all-MiniLM-L6-v2")
+    EMBEDDING_DIM: int = int(os.getenv("EMBEDDING_DIM", "384"))
+    EMBEDDING_BATCH_SIZE: int = int(os.getenv("EMBEDDING_BATCH_SIZE", "256"))
+    
+    # Record search index (illegal mining, IUP, production), updated after each ingestion batch
+    SEARCH_INDEX_ENABLED: bool = os.getenv("SEARCH_INDEX_ENABLED", "true").lower() == "true"
+    SEARCH_INDEX_DIR: str = os.getenv("SEARCH_INDEX_DIR", "vector_store")
+    SEARCH_INDEX_RELOAD_SECONDS: float = float(os.getenv("SEARCH_INDEX_RELOAD_SECONDS", "5"))
+    
     # Redis
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379")
     
     # Monitoring
     SENTRY_DSN: str = os.getenv("SENTRY_DSN", "")
     ANALYTICS_ENABLED: bool = os.getenv("ANALYTICS_ENABLED", "true").lower() == "true"
-
+    
     class Config:
         env_file = ".env"
 
@@ -1,30 +1,233 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.orm import DeclarativeBase
-from database.models import Base
-import asyncpg
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy import exc, text
+from database.partitioning import maintain_partitions
+from database.schema import prepare_schema
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
+from contextlib import AsyncExitStack, asynccontextmanager
+import asyncio
+import itertools
+import math
+import re
+import threading
+import time
 from config import settings
+from utils.logger import setup_logger
+from utils.metrics import instrument_engine
+
+logger = setup_logger(__name__)
+
+class PoolMetrics:
+    """Connection pool usage counters shared by a pool and its recreations"""
+    
+    # Minimum seconds between repeated pool-exhaustion warnings
+    WARN_INTERVAL = 10.0
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.checkouts = 0
+        self.waits_over_threshold = 0
+        self.exhausted = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._last_warning = 0.0
+        self._lock = threading.Lock()
+    
+    def record_checkout(self, wait: float, exhausted: bool, timed_out: bool = False):
+        with self._lock:
+            if not timed_out:
+                self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            if exhausted:
+                self.exhausted += 1
+            if timed_out:
+                self.timeouts += 1
+            if wait * 1000 >= settings.DB_POOL_WAIT_WARN_MS:
+                self.waits_over_threshold += 1
+    
+    def should_warn(self) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_warning < self.WARN_INTERVAL:
+                return False
+            self._last_warning = now
+            return True
+    
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "avg_wait_ms": round(self.total_wait / attempts * 1000, 3) if attempts else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+                "slow_waits": self.waits_over_threshold,
+                "exhausted": self.exhausted,
+                "timeouts": self.timeouts
+            }
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that measures checkout wait time and warns on exhaustion"""
+    
+    metrics: PoolMetrics = None
+    
+    def _do_get(self):
+        start = time.perf_counter()
+        # A negative max_overflow means unlimited overflow, so the pool never runs out
+        exhausted = self._max_overflow >= 0 and self.checkedout() >= self.size() + self._max_overflow
+        if exhausted and self.metrics and self.metrics.should_warn():
+            logger.warning(
+                f"Database pool '{self.metrics.name}' exhausted: {self.checkedout()} connections checked out "
+                f"(pool_size={self.size()}, max_overflow={self._max_overflow}); requests are queueing"
+            )
+        
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            if self.metrics:
+                self.metrics.record_checkout(time.perf_counter() - start, exhausted, timed_out=True)
+            raise
+        
+        if self.metrics:
+            self.metrics.record_checkout(time.perf_counter() - start, exhausted)
+        return connection
+    
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+def create_engine_for(url: str, name: str):
+    """Create an async engine with the configured pool sizing and timeouts"""
+    connect_args = {}
+    if url.startswith("postgresql+asyncpg"):
+        connect_args = {
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "server_settings": {
+                "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS),
+                "application_name": f"tinsig-dashboard-{name}"
+            }
+        }
+    
+    engine = create_async_engine(
+        url,
+        echo=settings.DB_ECHO,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=connect_args
+    )
+    engine.sync_engine.pool.metrics = PoolMetrics(name)
+    instrument_engine(engine)
+    return engine
+
+def pool_status(engine) -> Dict[str, Any]:
+    """Current occupancy and usage metrics of an engine's pool"""
+    pool = engine.sync_engine.pool
+    status = {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "max_overflow": settings.DB_MAX_OVERFLOW
+    }
+    metrics = getattr(pool, "metrics", None)
+    if metrics:
+        status.update(metrics.snapshot())
+    return status
+
+# Replication lag in seconds; 0 when the replica has replayed everything it received
+REPLICA_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+class Replica:
+    """A read replica engine with a cached replication-lag reading"""
+    
+    def __init__(self, url: str, name: str):
+        self.name = name
+        self.engine = create_engine_for(url, name)
+        self.async_session = async_sessionmaker(
+            self.engine,
+            class_=AsyncSession,
+            expire_on_commit=False
+        )
+        self.lag = 0.0
+        self.checked_at = 0.0
+        self._lock = asyncio.Lock()
+    
+    async def current_lag(self) -> float:
+        """Replication lag in seconds, refreshed at most every REPLICA_LAG_CHECK_INTERVAL"""
+        if time.monotonic() - self.checked_at < settings.REPLICA_LAG_CHECK_INTERVAL:
+            return self.lag
+        
+        async with self._lock:
+            if time.monotonic() - self.checked_at < settings.REPLICA_LAG_CHECK_INTERVAL:
+                return self.lag
+            try:
+                if self.engine.dialect.name == "postgresql":
+                    async with self.engine.connect() as conn:
+                        self.lag = float((await conn.execute(REPLICA_LAG_SQL)).scalar_one())
+                else:
+                    self.lag = 0.0
+                if self.lag > settings.REPLICA_MAX_LAG_SECONDS:
+                    logger.warning(f"Replica '{self.name}' lagging {self.lag:.1f}s; routing reads elsewhere")
+            except Exception as e:
+                logger.warning(f"Replica '{self.name}' lag check failed: {e}")
+                self.lag = math.inf
+            self.checked_at = time.monotonic()
+        
+        return self.lag
 
 class Database:
     def __init__(self):
-        self.engine = create_async_engine(
-            settings.DATABASE_URL,
-            echo=settings.ENVIRONMENT == "development"
-        )
+        self.engine = create_engine_for(settings.DATABASE_URL, "primary")
         self.async_session = async_sessionmaker(
             self.engine, 
             class_=AsyncSession,
             expire_on_commit=False
         )
+        
+        replica_urls = [url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+        self.replicas: List[Replica] = [
+            Replica(url, f"replica-{i}") for i, url in enumerate(replica_urls)
+        ]
+        self._replica_cycle = itertools.cycle(self.replicas) if self.replicas else None
+    
+    async def read_session_factory(self) -> async_sessionmaker:
+        """Pick a replica round-robin, falling back to the primary when all lag"""
+        for _ in range(len(self.replicas)):
+            replica = next(self._replica_cycle)
+            if await replica.current_lag() <= settings.REPLICA_MAX_LAG_SECONDS:
+                return replica.async_session
+        return self.async_session
     
     async def init_db(self):
-        """Initialize database tables"""
+        """Check the schema revision (DB_SCHEMA_MODE) and create upcoming partitions"""
+        await prepare_schema(self.engine, settings.DB_SCHEMA_MODE)
         async with self.engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(maintain_partitions)
     
     async def get_session(self):
         """Get async database session"""
         async with self.async_session() as session:
             yield session
+    
+    def pool_status(self) -> Dict[str, Any]:
+        """Pool occupancy and wait-time metrics"""
+        status = {"primary": pool_status(self.engine)}
+        for replica in self.replicas:
+            status[replica.name] = pool_status(replica.engine)
+            status[replica.name]["lag_seconds"] = replica.lag if math.isfinite(replica.lag) else None
+        return status
 
 # Global database instance
 database = Database()
@@ -34,6 +237,53 @@ async def get_db():
     async with database.async_session() as session:
         yield session
 
+async def get_read_db():
+    """Dependency for read-only routes; uses a fresh replica when one is configured"""
+    session_factory = await database.read_session_factory()
+    async with session_factory() as session:
+        yield session
+
+# Transaction options of sessions that share an exported snapshot
+SNAPSHOT_OPTIONS = {"isolation_level": "REPEATABLE READ", "postgresql_readonly": True}
+SNAPSHOT_ID = re.compile(r"^[0-9A-F-]+$")
+
+@asynccontextmanager
+async def snapshot_sessions(session_factory, count: int) -> AsyncIterator[Tuple[List[AsyncSession], Optional[str]]]:
+    """Up to `count` read-only sessions that all see the same database snapshot.
+
+    On PostgreSQL the first session opens a REPEATABLE READ transaction and
+    exports its snapshot (pg_export_snapshot); the others import it with SET
+    TRANSACTION SNAPSHOT, so queries spread over several connections still
+    read one consistent state. Other databases, or a failed export (e.g. on an
+    older standby), get a single session for the caller to use sequentially.
+    Yields (sessions, snapshot id or None).
+    """
+    async with AsyncExitStack() as stack:
+        leader = await stack.enter_async_context(session_factory())
+        sessions, snapshot = [leader], None
+        
+        if leader.bind.dialect.name == "postgresql":
+            await leader.connection(execution_options=SNAPSHOT_OPTIONS)
+            if count > 1:
+                try:
+                    snapshot = (await leader.execute(text("SELECT pg_export_snapshot()"))).scalar_one()
+                    if not SNAPSHOT_ID.match(snapshot):
+                        raise ValueError(f"unexpected snapshot id {snapshot!r}")
+                except Exception as e:
+                    logger.warning(f"Snapshot export failed, running sequentially: {e}")
+                    snapshot = None
+                    await leader.rollback()
+                    await leader.connection(execution_options=SNAPSHOT_OPTIONS)
+            
+            if snapshot:
+                for _ in range(count - 1):
+                    session = await stack.enter_async_context(session_factory())
+                    await session.connection(execution_options=SNAPSHOT_OPTIONS)
+                    await session.execute(text(f"SET TRANSACTION SNAPSHOT '{snapshot}'"))
+                    sessions.append(session)
+        
+        yield sessions, snapshot
+
 async def init_db():
     """Initialize database - called at startup"""
     await database.init_db()
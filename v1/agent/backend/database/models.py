@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, JSON
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, JSON, Index
 from sqlalchemy.ext.declarative import declarative_base
 import uuid
 from datetime import datetime
@@ -11,7 +11,7 @@ class IllegalMining(Base):
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     mobile_id = Column(String, unique=True, nullable=False)
     kabupaten = Column(String, nullable=False, index=True)
-    tanggal_survey = Column(DateTime, nullable=False)
+    tanggal_survey = Column(DateTime, nullable=False, index=True)
     location_lat = Column(Float)  # Simplified location storage
     location_lng = Column(Float)
     nama_pemilik = Column(String)
@@ -20,13 +20,18 @@ class IllegalMining(Base):
     jumlah_pekerja = Column(Integer)
     estimasi_produksi_hari = Column(Float)
     metadata_json = Column(JSON)
+    content_hash = Column(String(32))  # Digest of the normalized source record
     created_at = Column(DateTime, default=datetime.utcnow)
+    
+    # Includes the partition key, as PostgreSQL requires for partitioned tables
+    __table_args__ = (Index("uq_illegal_mining_content_hash", "content_hash", "tanggal_survey", unique=True),)
 
 class Production(Base):
     __tablename__ = "production"
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    tanggal_produksi = Column(DateTime, nullable=False)
+    source_id = Column(String)  # Record id in the source API (e.g. PBT001): the natural key, also used by map popups
+    tanggal_produksi = Column(DateTime, nullable=False, index=True)
     lokasi = Column(String, nullable=False)
     kabupaten = Column(String, nullable=False, index=True)
     kecamatan = Column(String, index=True)
@@ -36,7 +41,13 @@ class Production(Base):
     operator = Column(String)
     location_lat = Column(Float)  # Simplified location storage
     location_lng = Column(Float)
+    content_hash = Column(String(32))  # Digest of the normalized source record
     created_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        Index("uq_production_source_id", "source_id", "tanggal_produksi", unique=True),
+        Index("ix_production_content_hash", "content_hash")
+    )
 
 class IUP(Base):
     __tablename__ = "iup"
@@ -49,8 +60,21 @@ class IUP(Base):
     daerah = Column(String, nullable=False)
     luas = Column(Float)
     no_sk = Column(String)
-    tgl_sk = Column(DateTime)
+    tgl_sk = Column(DateTime, index=True)
     cnc = Column(String)
     status = Column(String, index=True)
     polygon_data = Column(Text)  # Store polygon as text/JSON
+    content_hash = Column(String(32))  # Digest of the normalized source record
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (Index("uq_iup_content_hash", "content_hash", unique=True),)
+
+class ChangeEvent(Base):
+    """One committed ingestion batch; the id is the generation number pushed to clients"""
+    __tablename__ = "change_events"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    table_name = Column(String, nullable=False)
+    count = Column(Integer, nullable=False)
+    kabupaten = Column(JSON)  # Affected kabupaten (daerah for IUP)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,208 @@
+from sqlalchemy import Column, MetaData, PrimaryKeyConstraint, Table, UniqueConstraint, text
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Set
+import re
+from config import settings
+from database.models import Base, IllegalMining, Production
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Tables range-partitioned by month on PostgreSQL -> partition key column
+PARTITIONED_TABLES: Dict[str, str] = {
+    Production.__tablename__: Production.tanggal_produksi.key,
+    IllegalMining.__tablename__: IllegalMining.tanggal_survey.key
+}
+
+PARTITION_SUFFIX = re.compile(r"_p(\d{4})(\d{2})$")
+
+# Months with an existing partition per table (None: the table is not partitioned).
+# Filled on first use so ingestion only issues DDL for months it has not seen.
+_known: Dict[str, Optional[Set[date]]] = {}
+
+def forget_partitions() -> None:
+    """Drop the cached partition lists, e.g. after tables were dropped and re-created"""
+    _known.clear()
+
+def month_start(value) -> date:
+    return date(value.year, value.month, 1)
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+def months_between(first, last) -> List[date]:
+    """Month starts from the month of `first` through the month of `last`"""
+    months, month, end = [], month_start(first), month_start(last)
+    while month <= end:
+        months.append(month)
+        month = add_months(month, 1)
+    return months
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+def is_enabled(dialect) -> bool:
+    return dialect.name == "postgresql" and settings.PARTITIONING_ENABLED
+
+def table_kind(connection, table: str) -> Optional[str]:
+    """'partitioned', 'table' or None when the table does not exist"""
+    relkind = connection.execute(text(
+        "SELECT CAST(c.relkind AS text) FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace "
+        "WHERE c.relname = :table AND n.nspname = current_schema()"
+    ), {"table": table}).scalar()
+    if relkind is None:
+        return None
+    return "partitioned" if relkind == "p" else "table"
+
+def partitioned_copy(table: Table, column: str) -> Table:
+    """The model table with the partition key added to its primary key and unique constraints.
+
+    PostgreSQL requires every unique constraint of a partitioned table to
+    contain the partition key. The ORM keeps using `id` alone as identity and
+    ingestion still matches rows on their natural key, so uniqueness of `id`
+    and `mobile_id` is kept by the application as before.
+    """
+    metadata = MetaData()
+    columns = [Column(c.name, c.type, nullable=c.nullable and not c.primary_key and c.name != column) for c in table.columns]
+    constraints = [PrimaryKeyConstraint(*[c.name for c in table.primary_key.columns], column)]
+    for constraint in table.constraints:
+        if isinstance(constraint, UniqueConstraint):
+            constraints.append(UniqueConstraint(*[c.name for c in constraint.columns], column))
+    return Table(table.name, metadata, *columns, *constraints, postgresql_partition_by=f"RANGE ({column})")
+
+def create_partitioned_table(connection, table: str) -> None:
+    partitioned_copy(Base.metadata.tables[table], PARTITIONED_TABLES[table]).create(connection)
+    _known[table] = set()
+    logger.info(f"Created partitioned table {table}")
+
+def create_brin_index(connection, table: str) -> None:
+    """BRIN index on the partition key: a few pages per partition, suits append-mostly dates"""
+    column = PARTITIONED_TABLES[table]
+    connection.execute(text(
+        f"CREATE INDEX IF NOT EXISTS ix_{table}_{column}_brin ON {table} USING brin ({column}) "
+        f"WITH (pages_per_range = {settings.PARTITION_BRIN_PAGES_PER_RANGE})"
+    ))
+
+def list_partitions(connection, table: str) -> Dict[date, str]:
+    """Attached monthly partitions of a table -> partition name"""
+    names = connection.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = CAST(:table AS regclass)"
+    ), {"table": table}).scalars().all()
+    partitions = {}
+    for name in names:
+        match = PARTITION_SUFFIX.search(name)
+        if match and name == partition_name(table, date(int(match.group(1)), int(match.group(2)), 1)):
+            partitions[date(int(match.group(1)), int(match.group(2)), 1)] = name
+    return partitions
+
+def known_months(connection, table: str) -> Optional[Set[date]]:
+    if table not in _known:
+        kind = table_kind(connection, table)
+        if kind == "table":
+            logger.warning(f"Table {table} is not partitioned; convert it with scripts/setup_db.py --partition-existing")
+        _known[table] = set(list_partitions(connection, table)) if kind == "partitioned" else None
+    return _known[table]
+
+def ensure_partitions(connection, table: str, months: Iterable[date]) -> List[str]:
+    """Create the partitions for these months that do not exist yet; returns their names"""
+    known = known_months(connection, table)
+    if known is None:
+        return []
+    created = []
+    for month in sorted(set(months) - known):
+        name = partition_name(table, month)
+        connection.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{add_months(month, 1):%Y-%m-%d}')"
+        ))
+        known.add(month)
+        created.append(name)
+    if created:
+        logger.info(f"Created partitions {', '.join(created)}")
+    return created
+
+def detach_partitions_before(connection, table: str, cutoff: date, drop: bool = False) -> List[str]:
+    """Detach (optionally drop) partitions holding only rows before `cutoff`.
+
+    Detaching only updates the catalog, so old months leave the table
+    instantly instead of through a large DELETE; a detached partition stays
+    a regular table that can be archived or dropped later.
+    """
+    if known_months(connection, table) is None:
+        return []
+    detached = []
+    for month, name in sorted(list_partitions(connection, table).items()):
+        if add_months(month, 1) > cutoff:
+            break
+        connection.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+        if drop:
+            connection.execute(text(f"DROP TABLE {name}"))
+        _known[table].discard(month)
+        detached.append(name)
+    if detached:
+        logger.info(f"{'Dropped' if drop else 'Detached'} partitions {', '.join(detached)}")
+    return detached
+
+def maintain_partitions(connection, today: Optional[date] = None) -> None:
+    """Partitions for the coming months and retention; safe to repeat"""
+    if not is_enabled(connection.dialect):
+        return
+    current = month_start(today or datetime.utcnow())
+    for table in PARTITIONED_TABLES:
+        if known_months(connection, table) is None:
+            continue
+        ensure_partitions(connection, table, months_between(current, add_months(current, settings.PARTITION_PREMAKE_MONTHS)))
+        if settings.PARTITION_RETENTION_MONTHS > 0:
+            detach_partitions_before(connection, table, add_months(current, -settings.PARTITION_RETENTION_MONTHS))
+
+def convert_to_partitioned(connection, table: str) -> int:
+    """Rebuild an existing plain table as a partitioned one, copying its rows; returns the row count.
+
+    Runs in the caller's transaction and locks the table until it commits.
+    """
+    column = PARTITIONED_TABLES[table]
+    legacy = f"{table}_unpartitioned"
+    _known.pop(table, None)
+    
+    # Free the index and constraint names for the new table
+    indexes = connection.execute(text(
+        "SELECT indexname FROM pg_indexes WHERE tablename = :table AND schemaname = current_schema()"
+    ), {"table": table}).scalars().all()
+    for index in indexes:
+        connection.execute(text(f'ALTER INDEX "{index}" RENAME TO "{index[:48]}_unpartitioned"'))
+    connection.execute(text(f"ALTER TABLE {table} RENAME TO {legacy}"))
+    
+    create_partitioned_table(connection, table)
+    first, last = connection.execute(text(f"SELECT min({column}), max({column}) FROM {legacy}")).one()
+    if first is not None:
+        ensure_partitions(connection, table, months_between(first, last))
+    
+    model = Base.metadata.tables[table]
+    for index in model.indexes:
+        index.create(connection, checkfirst=True)
+    create_brin_index(connection, table)
+    
+    names = ", ".join(c.name for c in model.columns)
+    count = connection.execute(text(f"INSERT INTO {table} ({names}) SELECT {names} FROM {legacy}")).rowcount
+    connection.execute(text(f"DROP TABLE {legacy}"))
+    logger.info(f"Converted {table} to monthly partitions ({count} rows)")
+    return count
+
+async def ensure_partitions_for(engine, table: str, values: Iterable) -> None:
+    """Create the partitions that rows with these partition key values need.
+
+    Runs in its own short transaction. CREATE TABLE ... PARTITION OF takes an
+    ACCESS EXCLUSIVE lock on the parent, so call this before opening a
+    session that reads or writes the table: waiting on a lock held by the
+    caller's own open transaction would hang, unseen by deadlock detection.
+    """
+    if table not in PARTITIONED_TABLES or not is_enabled(engine.dialect):
+        return
+    months = {month_start(value) for value in values if value is not None}
+    known = _known.get(table)
+    if table in _known and (known is None or months <= known):
+        return
+    async with engine.begin() as connection:
+        await connection.run_sync(ensure_partitions, table, months)
@@ -0,0 +1,61 @@
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+from typing import Set
+import asyncio
+import os
+from database.models import Base
+from database.partitioning import forget_partitions
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+
+def alembic_config() -> Config:
+    config = Config(ALEMBIC_INI)
+    config.attributes["embedded"] = True  # Keep the app's logging configuration
+    return config
+
+def head_revisions() -> Set[str]:
+    """Latest revisions of the migration scripts (read from disk, no database access)"""
+    return set(ScriptDirectory.from_config(alembic_config()).get_heads())
+
+def current_revisions(connection) -> Set[str]:
+    return set(MigrationContext.configure(connection).get_current_heads())
+
+async def verify_schema(engine) -> None:
+    """Fail fast when the database is not at the latest migration; one small query, no reflection"""
+    async with engine.connect() as connection:
+        current = await connection.run_sync(current_revisions)
+    expected = head_revisions()
+    if current != expected:
+        found = ", ".join(sorted(current)) or "none"
+        raise RuntimeError(
+            f"Database schema is at revision {found}, expected {', '.join(sorted(expected))}. "
+            f"Run `alembic upgrade head` in the backend directory (or python scripts/setup_db.py)"
+        )
+    logger.info(f"Database schema at revision {', '.join(sorted(current))}")
+
+async def upgrade_schema(revision: str = "head") -> None:
+    """Apply pending migrations; alembic runs its own event loop, so this uses a worker thread"""
+    await asyncio.to_thread(command.upgrade, alembic_config(), revision)
+
+async def reset_schema(engine) -> None:
+    """Drop every table and migrate from scratch (benchmarks and throwaway databases)"""
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.execute(text("DROP TABLE IF EXISTS alembic_version"))
+    forget_partitions()
+    await upgrade_schema()
+
+async def prepare_schema(engine, mode: str) -> None:
+    """Startup schema handling: verify (default), upgrade or off"""
+    if mode == "upgrade":
+        await upgrade_schema()
+    elif mode == "verify":
+        await verify_schema(engine)
+    elif mode != "off":
+        raise ValueError(f"Unknown DB_SCHEMA_MODE: {mode}. Available: verify, upgrade, off")
@@ -1,12 +1,21 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import uvicorn
 
-from api import data, health
-from database.db import init_db
+from api import admin, dashboard, data, events, health, metrics, query, search
+from database.db import init_db, database
 from config import settings
 from utils.logger import setup_logger
+from utils.responses import ORJSONResponse
+from middleware.compression import CompressionMiddleware
+from middleware.metrics import MetricsMiddleware
+from middleware.profiling import ProfilingMiddleware
+from utils.profiler import sampler
+from utils.metrics import register_pool_collector
+from services.change_feed import change_feed
+from vectors.record_index import record_index
 
 # Setup logging
 logger = setup_logger(__name__)
@@ -16,16 +25,29 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting TINSIG AI Dashboard...")
     await init_db()
+    if settings.SEARCH_INDEX_ENABLED and not record_index.load(mmap=True):
+        # Built by ingestion or scripts/build_search_index.py, not by every API worker; picked up once written
+        logger.warning(f"No search index in {record_index.directory}; run scripts/build_search_index.py")
+    if settings.CHANGE_EVENTS_ENABLED:
+        await change_feed.start()
+    if settings.PROFILING_ENABLED:
+        sampler.start(asyncio.get_running_loop())
+        logger.info(f"Request profiling enabled (threshold {settings.PROFILING_THRESHOLD_MS:.0f} ms)")
     yield
     # Shutdown
     logger.info("Shutting down TINSIG AI Dashboard...")
+    if settings.CHANGE_EVENTS_ENABLED:
+        await change_feed.stop()
+    if settings.PROFILING_ENABLED:
+        sampler.stop()
 
 # Create FastAPI app
 app = FastAPI(
     title="TINSIG AI Dashboard API",
     description="AI-powered mining data analysis platform",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -37,9 +59,32 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Response compression (br/zstd/gzip)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+# Stack-sampling profiler for slow or explicitly requested requests
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
+# Request metrics; added last so it wraps compression and sees bytes on the wire
+if settings.ANALYTICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    register_pool_collector(database)
+
 # Include routers
 app.include_router(health.router, prefix="/health", tags=["health"])
 app.include_router(data.router, prefix="/api/v1/data", tags=["data"])
+app.include_router(dashboard.router, prefix="/api/v1/dashboard", tags=["dashboard"])
+app.include_router(query.router, prefix="/api/v1/query", tags=["query"])
+if settings.CHANGE_EVENTS_ENABLED:
+    app.include_router(events.router, prefix="/api/v1/events", tags=["events"])
+if settings.SEARCH_INDEX_ENABLED:
+    app.include_router(search.router, prefix="/api/v1/search", tags=["search"])
+if settings.PROFILING_ENABLED:
+    app.include_router(admin.router, prefix="/admin", tags=["admin"])
+if settings.ANALYTICS_ENABLED:
+    app.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
 
 @app.get("/")
 async def root():
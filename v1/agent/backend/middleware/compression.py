@@ -0,0 +1,206 @@
+import zlib
+from typing import Dict, List, Optional, Tuple
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from config import settings
+
+try:
+    import brotli
+except ImportError:  # Optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency
+    zstandard = None
+
+class GzipCompressor:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+class BrotliCompressor:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+class ZstdCompressor:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+def available_encodings() -> Dict[str, object]:
+    """Encodings whose libraries are installed, mapped to a compressor factory"""
+    encodings = {"gzip": lambda: GzipCompressor(settings.COMPRESSION_GZIP_LEVEL)}
+    if brotli is not None:
+        encodings["br"] = lambda: BrotliCompressor(settings.COMPRESSION_BROTLI_QUALITY)
+    if zstandard is not None:
+        encodings["zstd"] = lambda: ZstdCompressor(settings.COMPRESSION_ZSTD_LEVEL)
+    return encodings
+
+def parse_size_overrides(value: str) -> List[Tuple[str, int]]:
+    """Parse 'application/geo+json=256,text/=2048' into (prefix, size) pairs, longest prefix first"""
+    overrides = []
+    for item in value.split(","):
+        if "=" in item:
+            prefix, size = item.split("=", 1)
+            overrides.append((prefix.strip().lower(), int(size)))
+    return sorted(overrides, key=lambda pair: len(pair[0]), reverse=True)
+
+class CompressionMiddleware:
+    """Compress responses with br/zstd/gzip, negotiated from Accept-Encoding.
+
+    Buffered responses are compressed only above a per-content-type minimum
+    size. Streaming responses (more_body=True) are compressed chunk by chunk
+    with a sync flush after each chunk, so NDJSON and SSE still reach the
+    client incrementally. Already-compressed formats are passed through.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.encodings = available_encodings()
+        self.preference = [
+            name.strip() for name in settings.COMPRESSION_ALGORITHMS.split(",")
+            if name.strip() in self.encodings
+        ]
+        self.min_size = settings.COMPRESSION_MIN_SIZE
+        self.size_overrides = parse_size_overrides(settings.COMPRESSION_MIN_SIZES)
+        self.excluded_types = [
+            prefix.strip().lower() for prefix in settings.COMPRESSION_EXCLUDED_TYPES.split(",") if prefix.strip()
+        ]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self.negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    def negotiate(self, accept_encoding: str) -> Optional[str]:
+        """Pick the first server-preferred encoding the client accepts"""
+        accepted = {}
+        for part in accept_encoding.lower().split(","):
+            name, _, params = part.strip().partition(";")
+            quality = 1.0
+            params = params.strip()
+            if params.startswith("q="):
+                try:
+                    quality = float(params[2:])
+                except ValueError:
+                    quality = 0.0
+            if name:
+                accepted[name.strip()] = quality
+
+        for name in self.preference:
+            if accepted.get(name, accepted.get("*", 0.0)) > 0:
+                return name
+        return None
+
+    def threshold_for(self, content_type: str) -> int:
+        for prefix, size in self.size_overrides:
+            if content_type.startswith(prefix):
+                return size
+        return self.min_size
+
+    def is_excluded(self, content_type: str) -> bool:
+        return any(content_type.startswith(prefix) for prefix in self.excluded_types)
+
+class CompressionResponder:
+    """Per-response state: holds the start message until the first body chunk"""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.downstream = send
+        self.start_message: Optional[Message] = None
+        self.compressor = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            return
+
+        if message["type"] != "http.response.body":
+            await self.downstream(message)
+            return
+
+        if self.passthrough:
+            await self.downstream(message)
+            return
+
+        if self.compressor is not None:
+            await self._send_compressed(message)
+            return
+
+        # First body chunk: decide whether to compress this response
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        content_type = headers.get("content-type", "").lower()
+
+        if (
+            "content-encoding" in headers
+            or "no-transform" in headers.get("cache-control", "").lower()
+            or self.middleware.is_excluded(content_type)
+            or (not more_body and len(body) < self.middleware.threshold_for(content_type))
+        ):
+            self.passthrough = True
+            await self.downstream(self.start_message)
+            await self.downstream(message)
+            return
+
+        self.compressor = self.middleware.encodings[self.encoding]()
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+
+        if more_body:
+            # Streaming: length is unknown, send the headers now
+            del headers["Content-Length"]
+            await self.downstream(self.start_message)
+            await self._send_compressed(message)
+        else:
+            compressed = self.compressor.compress(body) + self.compressor.finish()
+            headers["Content-Length"] = str(len(compressed))
+            await self.downstream(self.start_message)
+            await self.downstream({"type": "http.response.body", "body": compressed})
+
+    async def _send_compressed(self, message: Message) -> None:
+        body = message.get("body", b"")
+        if message.get("more_body", False):
+            chunk = self.compressor.compress(body) + self.compressor.flush()
+            if chunk:
+                await self.downstream({"type": "http.response.body", "body": chunk, "more_body": True})
+        else:
+            chunk = self.compressor.compress(body) + self.compressor.finish()
+            await self.downstream({"type": "http.response.body", "body": chunk})
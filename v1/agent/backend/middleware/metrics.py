@@ -0,0 +1,64 @@
+import time
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from utils.metrics import (
+    DB_QUERIES_PER_REQUEST,
+    DB_TIME_PER_REQUEST,
+    HTTP_REQUEST_DURATION,
+    HTTP_RESPONSE_BYTES,
+    RequestDBStats,
+    request_db_stats
+)
+
+def route_template(scope: Scope) -> str:
+    """Path template of the matched route, e.g. /api/v1/data/{layer}/{record_id}.
+
+    Keeps label cardinality bounded; requests that matched no route share one label.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path_format", None) or getattr(route, "path", None)
+    if template is None:
+        return "unmatched"
+    
+    # Newer FastAPI versions keep routes of an included router relative to its prefix;
+    # the prefix is whatever precedes the route's own part of the request path
+    params = {name: value for name, value in scope.get("path_params", {}).items() if name in getattr(route, "param_convertors", {})}
+    try:
+        own_path = route.url_path_for(route.name, **params)
+    except Exception:
+        return template
+    path = scope["path"]
+    return path[:len(path) - len(own_path)] + template if path.endswith(own_path) else template
+
+class MetricsMiddleware:
+    """Record latency, response size and per-request DB work for every HTTP request"""
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        stats = RequestDBStats()
+        token = request_db_stats.set(stats)
+        status = {"code": 500, "bytes": 0}
+        start = time.perf_counter()
+        
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            elif message["type"] == "http.response.body":
+                status["bytes"] += len(message.get("body", b""))
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            request_db_stats.reset(token)
+            route = route_template(scope)
+            HTTP_REQUEST_DURATION.labels(method=scope["method"], route=route, status=str(status["code"])).observe(elapsed)
+            HTTP_RESPONSE_BYTES.labels(route=route).observe(status["bytes"])
+            DB_QUERIES_PER_REQUEST.labels(route=route).observe(stats.queries)
+            DB_TIME_PER_REQUEST.labels(route=route).observe(stats.seconds)
@@ -0,0 +1,46 @@
+import asyncio
+import time
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from config import settings
+from utils.logger import setup_logger
+from utils.profiler import ProfileCapture, is_valid_profiling_token, profile_store, sampler
+
+logger = setup_logger(__name__)
+
+PROFILE_HEADER = "x-profile-token"
+
+class ProfilingMiddleware:
+    """Sample every request's stack and keep the profile when it was slow or explicitly requested"""
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.threshold_ms = settings.PROFILING_THRESHOLD_MS
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Never profile the profile listing itself; it carries the token header too
+        if scope["type"] != "http" or scope["path"].startswith("/admin/profiles"):
+            await self.app(scope, receive, send)
+            return
+        
+        forced = is_valid_profiling_token(Headers(scope=scope).get(PROFILE_HEADER))
+        task = asyncio.current_task()
+        status = {"code": 500}
+        
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+        
+        sampler.begin(task, ProfileCapture(scope["method"], scope["path"]))
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            capture = sampler.end(task)
+            if capture is not None and (forced or duration_ms >= self.threshold_ms):
+                reason = "requested" if forced else "slow"
+                name = profile_store.save(capture, duration_ms, status["code"], reason)
+                if name:
+                    logger.info(f"Captured {reason} request profile {name}")
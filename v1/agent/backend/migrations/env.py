@@ -0,0 +1,81 @@
+import asyncio
+import os
+import sys
+from logging.config import fileConfig
+from alembic import context
+from sqlalchemy import pool
+from sqlalchemy.ext.asyncio import create_async_engine
+
+# Migrations import the backend packages (config, database) like the app does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import settings
+from database.models import Base
+from database.partitioning import PARTITIONED_TABLES, PARTITION_SUFFIX
+
+config = context.config
+
+# The app configures its own logging when it runs migrations at startup
+if config.config_file_name is not None and not config.attributes.get("embedded"):
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+# Rows removed by migrations, kept so their downgrades can restore them
+ARCHIVE_TABLES = {"production_duplicates"}
+
+def include_object(obj, name, type_, reflected, compare_to):
+    """Keep partitioning objects out of autogenerate; they are managed by database.partitioning.
+
+    That covers the monthly partitions, the BRIN indexes on partition keys and
+    the unique constraints of partitioned tables, which include the partition
+    key in the database but not in the models. Migration archive tables are
+    skipped as well.
+    """
+    if type_ == "table" and reflected and name in ARCHIVE_TABLES:
+        return False
+    if type_ == "table" and reflected and PARTITION_SUFFIX.search(name):
+        return not any(name.startswith(f"{table}_p") for table in PARTITIONED_TABLES)
+    if type_ == "index" and reflected and name.endswith("_brin"):
+        return obj.table.name not in PARTITIONED_TABLES
+    if type_ == "unique_constraint" and obj.table.name in PARTITIONED_TABLES:
+        return False
+    return True
+
+def run_migrations_offline():
+    """Emit the migration SQL without connecting (alembic upgrade head --sql)"""
+    context.configure(
+        url=settings.DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        include_object=include_object
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+def do_run_migrations(connection):
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+        # Each migration commits on its own, so a long online index build never holds earlier DDL open
+        transaction_per_migration=True,
+        render_as_batch=connection.dialect.name == "sqlite"
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+async def run_migrations_online():
+    # A dedicated engine without the app's statement_timeout: concurrent index builds and backfills run long
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=pool.NullPool)
+    try:
+        async with engine.connect() as connection:
+            await connection.run_sync(do_run_migrations)
+    finally:
+        await engine.dispose()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    asyncio.run(run_migrations_online())
@@ -0,0 +1,192 @@
+import logging
+from alembic import op
+from sqlalchemy import MetaData, Table, bindparam, inspect, select, text
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from sqlalchemy.sql import ColumnElement
+
+# Rows updated (or checked for deletion) per committed batch
+BACKFILL_BATCH_SIZE = 5000
+
+# Reported alongside alembic's own "Running upgrade" lines
+logger = logging.getLogger("alembic.runtime.migration")
+
+def is_postgresql() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+def partitions_of(table: str) -> List[str]:
+    """Partition names of a partitioned table (empty for a plain table)"""
+    return op.get_bind().execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = CAST(:table AS regclass) ORDER BY c.relname"
+    ), {"table": table}).scalars().all()
+
+def is_partitioned(table: str) -> bool:
+    return op.get_bind().execute(text(
+        "SELECT c.relkind = 'p' FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace "
+        "WHERE c.relname = :table AND n.nspname = current_schema()"
+    ), {"table": table}).scalar() or False
+
+def drop_invalid_index(name: str) -> None:
+    """Remove the leftover of an interrupted concurrent build so the next attempt starts clean"""
+    invalid = op.get_bind().execute(text(
+        "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE c.relname = :name AND NOT i.indisvalid AND c.relkind = 'i'"
+    ), {"name": name}).scalar()
+    if invalid:
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+def create_index_concurrently(
+    name: str,
+    table: str,
+    columns: Sequence[str],
+    using: str = "btree",
+    storage: Optional[Dict[str, Any]] = None,
+    unique: bool = False
+) -> None:
+    """Build an index without blocking writes.
+
+    On PostgreSQL this runs outside the migration transaction with CREATE
+    INDEX CONCURRENTLY. Partitioned tables do not support that directly, so
+    the parent index is created ON ONLY the parent (no data is read), each
+    partition gets a concurrent build, and attaching the last one makes the
+    parent index valid. Partitions created later inherit the index.
+    Re-running after an interruption picks up where it stopped.
+    """
+    if not is_postgresql():
+        op.create_index(name, table, list(columns), unique=unique, if_not_exists=True)
+        return
+    
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+    definition = f"USING {using} ({', '.join(columns)})"
+    if storage:
+        definition += " WITH (" + ", ".join(f"{key} = {value}" for key, value in storage.items()) + ")"
+    
+    with op.get_context().autocommit_block():
+        if not is_partitioned(table):
+            drop_invalid_index(name)
+            op.execute(f"CREATE {kind} CONCURRENTLY IF NOT EXISTS {name} ON {table} {definition}")
+            return
+        
+        op.execute(f"CREATE {kind} IF NOT EXISTS {name} ON ONLY {table} {definition}")
+        for partition in partitions_of(table):
+            child = f"{name}_{partition[len(table) + 1:]}"[:63]
+            drop_invalid_index(child)
+            op.execute(f"CREATE {kind} CONCURRENTLY IF NOT EXISTS {child} ON {partition} {definition}")
+            op.execute(f"ALTER INDEX {name} ATTACH PARTITION {child}")
+
+def drop_index_concurrently(name: str, table: str) -> None:
+    """Drop an index without blocking reads and writes where PostgreSQL allows it"""
+    if not is_postgresql():
+        op.drop_index(name, table_name=table, if_exists=True)
+        return
+    
+    with op.get_context().autocommit_block():
+        if is_partitioned(table):
+            # Partitioned indexes cannot be dropped concurrently; this only takes a brief lock
+            op.execute(f"DROP INDEX IF EXISTS {name}")
+        else:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+def backfill_in_batches(
+    table: str,
+    columns: Sequence[str],
+    compute: Callable[[Dict[str, Any]], Dict[str, Any]],
+    where: str = "TRUE",
+    batch_size: int = BACKFILL_BATCH_SIZE
+) -> int:
+    """Set new column values row by row in id order, committing every batch.
+
+    Each batch reads `columns` of up to `batch_size` rows matching `where`,
+    passes them to `compute` for the new values and updates them by id in
+    its own transaction, so locks stay short and an interrupted backfill
+    resumes by re-running (make `where` exclude rows already done). The
+    migration's earlier DDL is committed first so its locks do not block
+    the batches.
+    Returns the number of rows updated.
+    """
+    bind = op.get_bind()
+    # Reflected so values come back typed (datetimes, JSON) as the application sees them
+    target = Table(table, MetaData(), autoload_with=bind)
+    query = select(target.c.id, *[target.c[column] for column in columns]).where(text(where)).order_by(target.c.id).limit(batch_size)
+    total, last_id = 0, None
+    
+    with op.get_context().autocommit_block():
+        while True:
+            batch_query = query if last_id is None else query.where(target.c.id > last_id)
+            rows = bind.execute(batch_query).mappings().all()
+            if not rows:
+                return total
+            
+            values = [compute(dict(row)) for row in rows]
+            statement = target.update().where(target.c.id == bindparam("row_id")).values(
+                {column: bindparam(f"new_{column}") for column in values[0]}
+            )
+            updates = [
+                {"row_id": row["id"], **{f"new_{column}": value for column, value in new.items()}}
+                for row, new in zip(rows, values)
+            ]
+            # A connection of its own per batch: the migration connection is in autocommit mode
+            with bind.engine.begin() as connection:
+                connection.execute(statement, updates)
+            total += len(updates)
+            last_id = rows[-1]["id"]
+
+def delete_in_batches(
+    table: str,
+    condition: Callable[[Table], ColumnElement],
+    archive: Optional[str] = None,
+    batch_size: int = BACKFILL_BATCH_SIZE
+) -> int:
+    """Delete the rows matching a condition, walking the table in id order and committing every batch.
+
+    `condition` receives the reflected table and returns the WHERE clause
+    (it may look at other rows, e.g. to find duplicates). Each batch takes
+    the next `batch_size` ids and deletes the matching ones among them in
+    its own transaction, so locks stay short and an interrupted run resumes
+    by re-running. With `archive`, deleted rows are first copied into that
+    table (created like `table` if missing) in the same transaction, so a
+    downgrade can restore them with restore_archived.
+    Returns the number of rows deleted.
+    """
+    bind = op.get_bind()
+    target = Table(table, MetaData(), autoload_with=bind)
+    if archive is not None and not inspect(bind).has_table(archive):
+        op.execute(f"CREATE TABLE {archive} AS SELECT * FROM {table} WHERE 1 = 0")
+    query = select(target.c.id).order_by(target.c.id).limit(batch_size)
+    total, last_id = 0, None
+    
+    with op.get_context().autocommit_block():
+        while True:
+            batch_query = query if last_id is None else query.where(target.c.id > last_id)
+            ids = bind.execute(batch_query).scalars().all()
+            if not ids:
+                logger.info(f"Deleted {total} rows from {table}" + (f" (kept in {archive})" if archive else ""))
+                return total
+            
+            matching = [target.c.id.in_(ids), condition(target)]
+            with bind.engine.begin() as connection:
+                if archive is not None:
+                    archived = Table(archive, MetaData(), autoload_with=connection)
+                    columns = [column.name for column in archived.columns]
+                    connection.execute(archived.insert().from_select(columns, select(*[target.c[name] for name in columns]).where(*matching)))
+                deleted = connection.execute(target.delete().where(*matching)).rowcount
+            if deleted:
+                logger.info(f"Deleted {deleted} rows from {table} up to id {ids[-1]}")
+            total += deleted
+            last_id = ids[-1]
+
+def restore_archived(table: str, archive: str) -> int:
+    """Move the rows delete_in_batches archived back into `table` and drop the archive.
+
+    Returns the number of rows restored.
+    """
+    bind = op.get_bind()
+    if not inspect(bind).has_table(archive):
+        return 0
+    archived = Table(archive, MetaData(), autoload_with=bind)
+    target = Table(table, MetaData(), autoload_with=bind)
+    columns = [column.name for column in archived.columns if column.name in target.columns]
+    restored = bind.execute(target.insert().from_select(columns, select(*[archived.c[name] for name in columns]))).rowcount
+    op.drop_table(archive)
+    logger.info(f"Restored {restored} rows into {table} from {archive}")
+    return restored
@@ -0,0 +1,112 @@
+"""Baseline schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 09:00:00
+
+Tables that already exist (databases created with create_all before
+migrations) are left as they are, so upgrading such a database only
+records the revision.
+"""
+from alembic import op
+import sqlalchemy as sa
+from database.partitioning import is_enabled
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+def keys(partitioned: bool, column: str, *unique: str) -> list:
+    """Primary key and unique constraints; partitioned tables must include the partition key"""
+    extra = (column,) if partitioned else ()
+    constraints = [sa.PrimaryKeyConstraint("id", *extra)]
+    constraints += [sa.UniqueConstraint(name, *extra) for name in unique]
+    return constraints
+
+def partition_options(partitioned: bool, column: str) -> dict:
+    return {"postgresql_partition_by": f"RANGE ({column})"} if partitioned else {}
+
+def upgrade():
+    bind = op.get_bind()
+    existing = set(sa.inspect(bind).get_table_names())
+    partitioned = is_enabled(bind.dialect)
+    
+    if "illegal_mining" not in existing:
+        op.create_table(
+            "illegal_mining",
+            sa.Column("id", sa.String(), nullable=False),
+            sa.Column("mobile_id", sa.String(), nullable=False),
+            sa.Column("kabupaten", sa.String(), nullable=False),
+            sa.Column("tanggal_survey", sa.DateTime(), nullable=False),
+            sa.Column("location_lat", sa.Float()),
+            sa.Column("location_lng", sa.Float()),
+            sa.Column("nama_pemilik", sa.String()),
+            sa.Column("jenis_tambang", sa.String()),
+            sa.Column("kecamatan", sa.String()),
+            sa.Column("jumlah_pekerja", sa.Integer()),
+            sa.Column("estimasi_produksi_hari", sa.Float()),
+            sa.Column("metadata_json", sa.JSON()),
+            sa.Column("created_at", sa.DateTime()),
+            *keys(partitioned, "tanggal_survey", "mobile_id"),
+            **partition_options(partitioned, "tanggal_survey")
+        )
+        op.create_index("ix_illegal_mining_kabupaten", "illegal_mining", ["kabupaten"])
+        op.create_index("ix_illegal_mining_jenis_tambang", "illegal_mining", ["jenis_tambang"])
+        op.create_index("ix_illegal_mining_kecamatan", "illegal_mining", ["kecamatan"])
+    
+    if "production" not in existing:
+        op.create_table(
+            "production",
+            sa.Column("id", sa.String(), nullable=False),
+            sa.Column("tanggal_produksi", sa.DateTime(), nullable=False),
+            sa.Column("lokasi", sa.String(), nullable=False),
+            sa.Column("kabupaten", sa.String(), nullable=False),
+            sa.Column("kecamatan", sa.String()),
+            sa.Column("produksi_ton", sa.Float()),
+            sa.Column("kadar_sn", sa.Float()),
+            sa.Column("metode_tambang", sa.String()),
+            sa.Column("operator", sa.String()),
+            sa.Column("location_lat", sa.Float()),
+            sa.Column("location_lng", sa.Float()),
+            sa.Column("created_at", sa.DateTime()),
+            *keys(partitioned, "tanggal_produksi"),
+            **partition_options(partitioned, "tanggal_produksi")
+        )
+        op.create_index("ix_production_kabupaten", "production", ["kabupaten"])
+        op.create_index("ix_production_kecamatan", "production", ["kecamatan"])
+    
+    if "iup" not in existing:
+        op.create_table(
+            "iup",
+            sa.Column("id", sa.String(), nullable=False),
+            sa.Column("name", sa.String(), nullable=False),
+            sa.Column("du", sa.String(), nullable=False),
+            sa.Column("location_lat", sa.Float()),
+            sa.Column("location_lng", sa.Float()),
+            sa.Column("daerah", sa.String(), nullable=False),
+            sa.Column("luas", sa.Float()),
+            sa.Column("no_sk", sa.String()),
+            sa.Column("tgl_sk", sa.DateTime()),
+            sa.Column("cnc", sa.String()),
+            sa.Column("status", sa.String()),
+            sa.Column("polygon_data", sa.Text()),
+            sa.Column("created_at", sa.DateTime()),
+            *keys(False, "tgl_sk", "du")
+        )
+        op.create_index("ix_iup_status", "iup", ["status"])
+    
+    if "change_events" not in existing:
+        op.create_table(
+            "change_events",
+            sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column("table_name", sa.String(), nullable=False),
+            sa.Column("count", sa.Integer(), nullable=False),
+            sa.Column("kabupaten", sa.JSON()),
+            sa.Column("created_at", sa.DateTime()),
+            sa.PrimaryKeyConstraint("id")
+        )
+
+def downgrade():
+    for table in ("change_events", "iup", "production", "illegal_mining"):
+        op.drop_table(table)
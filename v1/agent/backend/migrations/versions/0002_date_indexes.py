@@ -0,0 +1,45 @@
+"""Date indexes built online
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 09:10:00
+
+B-tree indexes for date filters and newest-first reads, plus BRIN indexes
+on the partition keys. All are built concurrently on PostgreSQL, so the
+tables stay writable while large ones are indexed.
+"""
+from migrations.online import create_index_concurrently, drop_index_concurrently, is_postgresql
+from config import settings
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+DATE_INDEXES = [
+    ("ix_illegal_mining_tanggal_survey", "illegal_mining", "tanggal_survey"),
+    ("ix_production_tanggal_produksi", "production", "tanggal_produksi"),
+    ("ix_iup_tgl_sk", "iup", "tgl_sk")
+]
+
+BRIN_INDEXES = [
+    ("ix_production_tanggal_produksi_brin", "production", "tanggal_produksi"),
+    ("ix_illegal_mining_tanggal_survey_brin", "illegal_mining", "tanggal_survey")
+]
+
+def upgrade():
+    for name, table, column in DATE_INDEXES:
+        create_index_concurrently(name, table, [column])
+    if is_postgresql():
+        for name, table, column in BRIN_INDEXES:
+            create_index_concurrently(
+                name, table, [column], using="brin",
+                storage={"pages_per_range": settings.PARTITION_BRIN_PAGES_PER_RANGE}
+            )
+
+def downgrade():
+    if is_postgresql():
+        for name, table, _ in BRIN_INDEXES:
+            drop_index_concurrently(name, table)
+    for name, table, _ in DATE_INDEXES:
+        drop_index_concurrently(name, table)
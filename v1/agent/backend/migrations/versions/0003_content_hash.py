@@ -0,0 +1,92 @@
+"""Content hashes for deduplication and change detection
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 10:00:00
+
+Adds content_hash to the source tables and backfills it in batches,
+removes production rows that were stored more than once by earlier
+re-syncs (in id-ordered batches, kept in production_duplicates so the
+downgrade restores them) and builds the indexes concurrently. Rebuild the
+search index afterwards (scripts/build_search_index.py) to drop removed
+duplicates.
+"""
+from alembic import op
+import sqlalchemy as sa
+from migrations.online import (
+    backfill_in_batches,
+    create_index_concurrently,
+    delete_in_batches,
+    drop_index_concurrently,
+    restore_archived
+)
+from utils.hashing import content_hash
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+# Content columns as of this revision, in the order services.data_ingestion hashes them
+HASHED_COLUMNS = {
+    "illegal_mining": [
+        "mobile_id", "kabupaten", "tanggal_survey", "location_lat", "location_lng", "nama_pemilik",
+        "jenis_tambang", "kecamatan", "jumlah_pekerja", "estimasi_produksi_hari", "metadata_json"
+    ],
+    "production": [
+        "tanggal_produksi", "lokasi", "kabupaten", "kecamatan", "produksi_ton", "kadar_sn",
+        "metode_tambang", "operator", "location_lat", "location_lng"
+    ],
+    "iup": [
+        "name", "du", "location_lat", "location_lng", "daerah", "luas", "no_sk", "tgl_sk", "cnc",
+        "status", "polygon_data"
+    ]
+}
+
+# Unique index -> (table, columns); partitioned tables need their partition key in it
+UNIQUE_INDEXES = {
+    "uq_illegal_mining_content_hash": ("illegal_mining", ["content_hash", "tanggal_survey"]),
+    "uq_iup_content_hash": ("iup", ["content_hash"])
+}
+
+# Production is keyed by its source id (revision 0004); its hash only detects changes
+PRODUCTION_HASH_INDEX = "ix_production_content_hash"
+
+# Removed duplicate production rows, restored by the downgrade
+PRODUCTION_DUPLICATES = "production_duplicates"
+
+def duplicate_copy(production: sa.Table):
+    """A row whose content an older row (by created_at, then id) already has"""
+    older = production.alias("older")
+    return sa.exists().where(
+        older.c.content_hash == production.c.content_hash,
+        sa.tuple_(older.c.created_at, older.c.id) < sa.tuple_(production.c.created_at, production.c.id)
+    )
+
+def upgrade():
+    for table in HASHED_COLUMNS:
+        op.add_column(table, sa.Column("content_hash", sa.String(32)))
+    
+    for table, columns in HASHED_COLUMNS.items():
+        backfill_in_batches(
+            table, columns,
+            lambda row, columns=columns: {"content_hash": content_hash(row, columns)},
+            where="content_hash IS NULL"
+        )
+    
+    # Earlier re-syncs stored every production row again; keep the oldest copy.
+    # The hash index comes first so each batch finds older copies through it.
+    create_index_concurrently(PRODUCTION_HASH_INDEX, "production", ["content_hash"])
+    delete_in_batches("production", duplicate_copy, archive=PRODUCTION_DUPLICATES)
+    
+    for name, (table, columns) in UNIQUE_INDEXES.items():
+        create_index_concurrently(name, table, columns, unique=True)
+
+def downgrade():
+    for name, (table, _) in UNIQUE_INDEXES.items():
+        drop_index_concurrently(name, table)
+    restore_archived("production", PRODUCTION_DUPLICATES)
+    drop_index_concurrently(PRODUCTION_HASH_INDEX, "production")
+    for table in HASHED_COLUMNS:
+        with op.batch_alter_table(table) as batch:
+            batch.drop_column("content_hash")
@@ -0,0 +1,29 @@
+"""Production source ids
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 11:00:00
+
+Stores the id the production source sends for each record (e.g. PBT001).
+Ingestion matches production rows on it and map popups look records up by
+it. Rows stored earlier get it on their next sync (matched once on their
+content hash); the unique index, which includes the partition key, is
+built concurrently.
+"""
+from alembic import op
+import sqlalchemy as sa
+from migrations.online import create_index_concurrently, drop_index_concurrently
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column("production", sa.Column("source_id", sa.String()))
+    create_index_concurrently("uq_production_source_id", "production", ["source_id", "tanggal_produksi"], unique=True)
+
+def downgrade():
+    drop_index_concurrently("uq_production_source_id", "production")
+    with op.batch_alter_table("production") as batch:
+        batch.drop_column("source_id")
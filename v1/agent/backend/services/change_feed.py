@@ -0,0 +1,244 @@
+import asyncio
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set
+import asyncpg
+from sqlalchemy import delete, func, select, text
+from config import settings
+from database.db import database
+from database.models import ChangeEvent
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# PostgreSQL NOTIFY channel; the payload is only a wake-up, events are read from change_events
+CHANGE_CHANNEL = "tinsig_changes"
+
+# Transaction-level advisory lock that orders generations by commit (PostgreSQL)
+CHANGE_LOCK_KEY = 0x74696E73  # "tins"
+
+# Poll interval while LISTEN is active; only catches notifications missed during a reconnect
+LISTEN_SAFETY_POLL_SECONDS = 30.0
+
+# Rows read per catch-up query
+CATCH_UP_CHUNK = 1000
+
+# Above this many affected kabupaten an event sends null ("everywhere") to stay compact
+MAX_EVENT_KABUPATEN = 50
+
+async def record_change(session, table: str, count: int, kabupaten: Iterable[str]) -> int:
+    """Log a stored batch inside the caller's transaction; returns its generation.
+
+    On PostgreSQL the id is taken under an advisory lock held until commit, so
+    generations become visible in id order. Commit right after calling this.
+    """
+    postgresql = session.bind.dialect.name == "postgresql"
+    if postgresql:
+        await session.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": CHANGE_LOCK_KEY})
+    
+    event = ChangeEvent(table_name=table, count=count, kabupaten=sorted({name for name in kabupaten if name}))
+    session.add(event)
+    await session.flush()
+    
+    if settings.CHANGE_EVENTS_RETENTION > 0:
+        await session.execute(delete(ChangeEvent).where(ChangeEvent.id <= event.id - settings.CHANGE_EVENTS_RETENTION))
+    if postgresql:
+        await session.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": CHANGE_CHANNEL, "payload": str(event.id)})
+    return event.id
+
+def event_payload(row: ChangeEvent) -> Dict[str, Any]:
+    return {
+        "generation": row.id,
+        "table": row.table_name,
+        "count": row.count,
+        "kabupaten": row.kabupaten or []
+    }
+
+class Subscription:
+    """Per-client pending changes, coalesced by table.
+
+    Publishing never blocks and never queues: a change merges into the
+    pending entry for its table (counts add up, kabupaten sets union, the
+    generation moves forward). A client that is slow to read therefore gets
+    fewer, larger events instead of an ever-growing backlog.
+    """
+    
+    def __init__(self, tables: Optional[Set[str]] = None, after: int = 0):
+        self.tables = tables
+        self.after = after  # Changes at or below this generation were already sent
+        self.pending: Dict[str, Dict[str, Any]] = {}
+        self.ready = asyncio.Event()
+        self.received = 0
+        self.coalesced = 0
+        self.delivered = 0
+    
+    def offer(self, event: Dict[str, Any]) -> None:
+        if event["generation"] <= self.after or (self.tables and event["table"] not in self.tables):
+            return
+        self.received += 1
+        
+        current = self.pending.get(event["table"])
+        if current is None:
+            self.pending[event["table"]] = {
+                "generation": event["generation"],
+                "from_generation": event["generation"],
+                "table": event["table"],
+                "count": event["count"],
+                "kabupaten": set(event["kabupaten"])
+            }
+        else:
+            self.coalesced += 1
+            current["generation"] = max(current["generation"], event["generation"])
+            current["count"] += event["count"]
+            current["kabupaten"].update(event["kabupaten"])
+        self.ready.set()
+    
+    async def next(self, timeout: float, window: float) -> Optional[List[Dict[str, Any]]]:
+        """Pending changes, oldest generation first; None when `timeout` passes without any"""
+        try:
+            await asyncio.wait_for(self.ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        
+        # Batches of one ingestion run commit in quick succession; let them merge
+        if window > 0:
+            await asyncio.sleep(window)
+        
+        self.ready.clear()
+        events, self.pending = sorted(self.pending.values(), key=lambda event: event["generation"]), {}
+        self.after = max([self.after] + [event["generation"] for event in events])
+        self.delivered += len(events)
+        return [
+            {**event, "kabupaten": sorted(event["kabupaten"]) if len(event["kabupaten"]) <= MAX_EVENT_KABUPATEN else None}
+            for event in events
+        ]
+
+class ChangeFeed:
+    """Fans committed ingestion batches out to subscribed clients.
+
+    Ingestion (often a separate process) writes a change_events row per
+    committed batch. This feed follows that log: on PostgreSQL it LISTENs for
+    the NOTIFY sent at commit, elsewhere it polls every
+    CHANGE_EVENTS_POLL_SECONDS. Either way it reads rows past the last seen
+    generation, so nothing is lost across reconnects.
+    """
+    
+    def __init__(self):
+        self.generation = 0
+        self.subscribers: Set[Subscription] = set()
+        self.listening = False
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._connection = None
+        self._started_at = time.time()
+    
+    async def start(self) -> None:
+        async with database.async_session() as session:
+            self.generation = (await session.execute(select(func.max(ChangeEvent.id)))).scalar() or 0
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Change feed started at generation {self.generation}")
+    
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self._close_listener()
+    
+    def subscribe(self, tables: Optional[Set[str]] = None, after: Optional[int] = None) -> Subscription:
+        if len(self.subscribers) >= settings.CHANGE_EVENTS_MAX_SUBSCRIBERS:
+            raise RuntimeError(f"Too many change feed subscribers ({len(self.subscribers)})")
+        subscription = Subscription(tables, self.generation if after is None else after)
+        self.subscribers.add(subscription)
+        return subscription
+    
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self.subscribers.discard(subscription)
+    
+    def publish(self, event: Dict[str, Any]) -> None:
+        for subscription in self.subscribers:
+            subscription.offer(event)
+    
+    async def replay(self, subscription: Subscription) -> bool:
+        """Offer logged changes after the subscription's generation; False when they were pruned"""
+        async with database.async_session() as session:
+            oldest = (await session.execute(select(func.min(ChangeEvent.id)))).scalar()
+            if oldest is not None and subscription.after < oldest - 1:
+                return False
+            rows = (await session.execute(
+                select(ChangeEvent)
+                .where(ChangeEvent.id > subscription.after, ChangeEvent.id <= self.generation)
+                .order_by(ChangeEvent.id)
+            )).scalars().all()
+        for row in rows:
+            subscription.offer(event_payload(row))
+        return True
+    
+    async def _run(self) -> None:
+        while True:
+            if database.engine.dialect.name == "postgresql" and not self.listening:
+                await self._listen()
+            interval = LISTEN_SAFETY_POLL_SECONDS if self.listening else settings.CHANGE_EVENTS_POLL_SECONDS
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            
+            try:
+                await self._catch_up()
+            except Exception as e:
+                logger.warning(f"Change feed catch-up failed: {e}")
+    
+    async def _catch_up(self) -> None:
+        while True:
+            async with database.async_session() as session:
+                rows = (await session.execute(
+                    select(ChangeEvent).where(ChangeEvent.id > self.generation).order_by(ChangeEvent.id).limit(CATCH_UP_CHUNK)
+                )).scalars().all()
+            for row in rows:
+                self.generation = row.id
+                self.publish(event_payload(row))
+            if len(rows) < CATCH_UP_CHUNK:
+                return
+    
+    async def _listen(self) -> None:
+        """Open a dedicated asyncpg connection for LISTEN; polling covers any failure"""
+        try:
+            self._connection = await asyncpg.connect(settings.DATABASE_URL.replace("+asyncpg", ""))
+            await self._connection.add_listener(CHANGE_CHANNEL, lambda *args: self._wakeup.set())
+            self._connection.add_termination_listener(lambda *args: self._on_listener_lost())
+            self.listening = True
+            # Changes committed while not listening
+            self._wakeup.set()
+        except Exception as e:
+            logger.warning(f"LISTEN {CHANGE_CHANNEL} failed, polling every {settings.CHANGE_EVENTS_POLL_SECONDS}s: {e}")
+            await self._close_listener()
+    
+    def _on_listener_lost(self) -> None:
+        if self._connection is None:
+            return  # Closed on purpose
+        logger.warning("Change feed listener connection lost; reconnecting")
+        self.listening = False
+        self._connection = None
+        self._wakeup.set()
+    
+    async def _close_listener(self) -> None:
+        self.listening = False
+        if self._connection is not None:
+            connection, self._connection = self._connection, None
+            try:
+                await connection.close()
+            except Exception:
+                pass
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "generation": self.generation,
+            "mode": "listen" if self.listening else "poll",
+            "subscribers": len(self.subscribers),
+            "pending": sum(len(subscription.pending) for subscription in self.subscribers),
+            "coalesced": sum(subscription.coalesced for subscription in self.subscribers),
+            "uptime_seconds": round(time.time() - self._started_at, 1)
+        }
+
+# Global change feed instance
+change_feed = ChangeFeed()
@@ -1,11 +1,47 @@
 import aiohttp
 import asyncio
-from typing import Dict, List, Any, Optional
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Awaitable
+from sqlalchemy import select, insert, update
 from config import settings
+from database.db import database
+from database.models import IllegalMining, Production, IUP
+from database.partitioning import PARTITIONED_TABLES, ensure_partitions_for, maintain_partitions
+from services.change_feed import record_change
 from utils.logger import setup_logger
+from utils.hashing import content_hash, hashed_columns
+from utils.metrics import record_ingestion, record_ingestion_writes
+from vectors.record_index import record_index
 
 logger = setup_logger(__name__)
 
+# Date formats sent by the source APIs
+DATE_FORMATS = ["%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%d %b %Y", "%d %B %Y", "%d/%m/%Y"]
+
+# Content columns per model, hashed in this order during normalization
+HASHED_COLUMNS = {model: hashed_columns(model) for model in (IllegalMining, Production, IUP)}
+
+def parse_date(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(str(value).strip(), date_format)
+        except ValueError:
+            continue
+    return datetime.fromisoformat(str(value))
+
+def parse_coordinate(item: Dict, *keys: str) -> Optional[float]:
+    """First present coordinate among the keys (sources send latitude/longitude, older ones lat/lng)"""
+    for key in keys:
+        if item.get(key) not in (None, ""):
+            return float(item[key])
+    return None
+
 class DataIngestionService:
     """Service for ingesting data from source APIs"""
     
@@ -13,6 +49,7 @@ class DataIngestionService:
         self.source1_url = settings.SOURCE1_URL  # Illegal Mining
         self.source2_url = settings.SOURCE2_URL  # Production
         self.source3_url = settings.SOURCE3_URL  # IUP
+        self.write_counts: Dict[str, Dict[str, int]] = {}  # source -> inserted/updated/unchanged of its last run
     
     async def ingest_all_sources(self) -> Dict[str, Any]:
         """Ingest data from all source APIs"""
@@ -23,11 +60,18 @@ class DataIngestionService:
             "source3": {"status": "pending", "count": 0, "error": None}
         }
         
+        # Partitions for the coming months (and retention) before rows arrive
+        try:
+            async with database.engine.begin() as connection:
+                await connection.run_sync(maintain_partitions)
+        except Exception as e:
+            logger.warning(f"Partition maintenance failed: {e}")
+        
         # Run all ingestions concurrently
         tasks = [
-            self._ingest_source1(),
-            self._ingest_source2(),
-            self._ingest_source3()
+            self._timed("source1", self._ingest_source1()),
+            self._timed("source2", self._ingest_source2()),
+            self._timed("source3", self._ingest_source3())
         ]
         
         ingestion_results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -43,10 +87,18 @@ class DataIngestionService:
             else:
                 results[source_key]["status"] = "success"
                 results[source_key]["count"] = len(result)
+                results[source_key].update(self.write_counts.get(source_key, {}))
                 logger.info(f"{source_key} ingestion completed: {len(result)} records")
         
         return results
     
+    async def _timed(self, source: str, ingestion: Awaitable[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Run one source ingestion and record its row count and throughput"""
+        start = time.perf_counter()
+        records = await ingestion
+        record_ingestion(source, len(records), time.perf_counter() - start)
+        return records
+    
     async def _ingest_source1(self) -> List[Dict[str, Any]]:
         """Ingest illegal mining data from source1"""
         
@@ -59,7 +111,7 @@ class DataIngestionService:
                         
                         # Process and store in database
                         processed_data = await self._process_illegal_mining_data(raw_data)
-                        await self._store_illegal_mining_data(processed_data)
+                        self.write_counts["source1"] = await self._store_illegal_mining_data(processed_data)
                         
                         return processed_data
                     else:
@@ -80,7 +132,7 @@ class DataIngestionService:
                         
                         # Process and store in database
                         processed_data = await self._process_production_data(raw_data)
-                        await self._store_production_data(processed_data)
+                        self.write_counts["source2"] = await self._store_production_data(processed_data)
                         
                         return processed_data
                     else:
@@ -101,7 +153,7 @@ class DataIngestionService:
                         
                         # Process and store in database
                         processed_data = await self._process_iup_data(raw_data)
-                        await self._store_iup_data(processed_data)
+                        self.write_counts["source3"] = await self._store_iup_data(processed_data)
                         
                         return processed_data
                     else:
@@ -119,15 +171,19 @@ class DataIngestionService:
                 processed_item = {
                     "mobile_id": item.get("mobile_id"),
                     "kabupaten": item.get("kabupaten"),
-                    "tanggal_survey": item.get("tanggal_survey"),
-                    "lat": float(item.get("lat", 0)) if item.get("lat") else None,
-                    "lng": float(item.get("lng", 0)) if item.get("lng") else None,
+                    "tanggal_survey": parse_date(item.get("tanggal_survey")),
+                    "location_lat": parse_coordinate(item, "latitude", "lat"),
+                    "location_lng": parse_coordinate(item, "longitude", "lng"),
                     "nama_pemilik": item.get("nama_pemilik"),
                     "jenis_tambang": item.get("jenis_tambang"),
                     "kecamatan": item.get("kecamatan"),
                     "jumlah_pekerja": int(item.get("jumlah_pekerja", 0)) if item.get("jumlah_pekerja") else None,
-                    "estimasi_produksi_hari": float(item.get("estimasi_produksi_hari", 0)) if item.get("estimasi_produksi_hari") else None
+                    "estimasi_produksi_hari": float(item.get("estimasi_produksi_hari", 0)) if item.get("estimasi_produksi_hari") else None,
+                    "metadata_json": {"source_id": item.get("id")} if item.get("id") else None
                 }
+                if not (processed_item["mobile_id"] and processed_item["kabupaten"] and processed_item["tanggal_survey"]):
+                    raise ValueError("missing mobile_id, kabupaten or tanggal_survey")
+                processed_item["content_hash"] = content_hash(processed_item, HASHED_COLUMNS[IllegalMining])
                 processed.append(processed_item)
             except Exception as e:
                 logger.warning(f"Failed to process illegal mining record: {e}")
@@ -142,7 +198,8 @@ class DataIngestionService:
         for item in raw_data:
             try:
                 processed_item = {
-                    "tanggal_produksi": item.get("tanggal_produksi"),
+                    "source_id": item.get("id"),
+                    "tanggal_produksi": parse_date(item.get("tanggal_produksi")),
                     "lokasi": item.get("lokasi"),
                     "kabupaten": item.get("kabupaten"),
                     "kecamatan": item.get("kecamatan"),
@@ -150,9 +207,12 @@ class DataIngestionService:
                     "kadar_sn": float(item.get("kadar_sn", 0)) if item.get("kadar_sn") else None,
                     "metode_tambang": item.get("metode_tambang"),
                     "operator": item.get("operator"),
-                    "lat": float(item.get("lat", 0)) if item.get("lat") else None,
-                    "lng": float(item.get("lng", 0)) if item.get("lng") else None
+                    "location_lat": parse_coordinate(item, "latitude", "lat"),
+                    "location_lng": parse_coordinate(item, "longitude", "lng")
                 }
+                if not (processed_item["source_id"] and processed_item["tanggal_produksi"] and processed_item["lokasi"] and processed_item["kabupaten"]):
+                    raise ValueError("missing id, tanggal_produksi, lokasi or kabupaten")
+                processed_item["content_hash"] = content_hash(processed_item, HASHED_COLUMNS[Production])
                 processed.append(processed_item)
             except Exception as e:
                 logger.warning(f"Failed to process production record: {e}")
@@ -172,12 +232,15 @@ class DataIngestionService:
                     "daerah": item.get("daerah"),
                     "luas": float(item.get("luas", 0)) if item.get("luas") else None,
                     "no_sk": item.get("no_sk"),
-                    "tgl_sk": item.get("tgl_sk"),
+                    "tgl_sk": parse_date(item.get("tgl_sk")),
                     "cnc": item.get("cnc"),
                     "status": item.get("status"),
-                    "lat": float(item.get("lat", 0)) if item.get("lat") else None,
-                    "lng": float(item.get("lng", 0)) if item.get("lng") else None
+                    "location_lat": parse_coordinate(item, "latitude", "lat"),
+                    "location_lng": parse_coordinate(item, "longitude", "lng")
                 }
+                if not (processed_item["name"] and processed_item["du"] and processed_item["daerah"]):
+                    raise ValueError("missing name, du or daerah")
+                processed_item["content_hash"] = content_hash(processed_item, HASHED_COLUMNS[IUP])
                 processed.append(processed_item)
             except Exception as e:
                 logger.warning(f"Failed to process IUP record: {e}")
@@ -185,17 +248,104 @@ class DataIngestionService:
         
         return processed
     
-    async def _store_illegal_mining_data(self, data: List[Dict]) -> None:
+    async def _store_illegal_mining_data(self, data: List[Dict]) -> Dict[str, int]:
         """Store processed illegal mining data in database"""
-        # TODO: Implement actual database storage
-        logger.info(f"Would store {len(data)} illegal mining records")
+        return await self._store_rows("illegal", IllegalMining, data, IllegalMining.mobile_id)
     
-    async def _store_production_data(self, data: List[Dict]) -> None:
+    async def _store_production_data(self, data: List[Dict]) -> Dict[str, int]:
         """Store processed production data in database"""
-        # TODO: Implement actual database storage
-        logger.info(f"Would store {len(data)} production records")
+        return await self._store_rows("production", Production, data, Production.source_id)
     
-    async def _store_iup_data(self, data: List[Dict]) -> None:
+    async def _store_iup_data(self, data: List[Dict]) -> Dict[str, int]:
         """Store processed IUP data in database"""
-        # TODO: Implement actual database storage
-        logger.info(f"Would store {len(data)} IUP records")
+        return await self._store_rows("iup", IUP, data, IUP.du)
+    
+    async def _store_rows(self, entity: str, model, rows: List[Dict], natural_key) -> Dict[str, int]:
+        """Write rows in batches, comparing content hashes with what is stored.
+        
+        Rows are matched on the natural key: unknown rows are inserted, rows
+        whose hash changed are updated and identical rows are skipped, so a
+        re-sync of unchanged data writes nothing. Each batch with changes
+        commits together with its change event (pushed to dashboards) and is
+        added to the search index before the next one. Returns
+        inserted/updated/unchanged counts.
+        """
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+        partition_key = PARTITIONED_TABLES.get(model.__tablename__)
+        if partition_key:
+            # Every month of the run gets its partition before the session reads the
+            # parent table: creating one waits for the locks open transactions hold on it
+            await ensure_partitions_for(database.engine, model.__tablename__, (row[partition_key] for row in rows))
+        async with database.async_session() as session:
+            for start in range(0, len(rows), settings.INGESTION_BATCH_SIZE):
+                batch = rows[start:start + settings.INGESTION_BATCH_SIZE]
+                keys = [row[natural_key.key] for row in batch]
+                result = await session.execute(
+                    select(natural_key, model.id, model.content_hash).where(natural_key.in_(keys))
+                )
+                # natural key -> (id, content hash) of the stored row
+                existing = {key: (record_id, digest) for key, record_id, digest in result.all()}
+                if model is Production:
+                    existing.update(await self._match_unkeyed_rows(session, model, natural_key, batch, existing))
+                
+                inserts, updates = [], []
+                for row in batch:
+                    key = row[natural_key.key]
+                    stored = existing.get(key)
+                    if stored is None:
+                        record_id = str(uuid.uuid4())
+                        inserts.append({**row, "id": record_id})
+                    elif stored[1] == row["content_hash"]:
+                        counts["unchanged"] += 1
+                        continue
+                    else:
+                        record_id = stored[0]
+                        updates.append({**row, "id": record_id})
+                    # Later rows with the same key in this batch compare against this one
+                    existing[key] = (record_id, row["content_hash"])
+                
+                changed = inserts + updates
+                if changed:
+                    if inserts:
+                        await session.execute(insert(model), inserts)
+                    if updates:
+                        await session.execute(update(model), updates)
+                    if settings.CHANGE_EVENTS_ENABLED:
+                        region = model.daerah.key if model is IUP else model.kabupaten.key
+                        await record_change(session, entity, len(changed), (row[region] for row in changed))
+                    await session.commit()
+                    counts["inserted"] += len(inserts)
+                    counts["updated"] += len(updates)
+                
+                last_batch = start + settings.INGESTION_BATCH_SIZE >= len(rows)
+                await self._index_batch(session, entity, [row["id"] for row in changed], last_batch)
+        
+        record_ingestion_writes(entity, counts)
+        logger.info(
+            f"Stored {entity} records: {counts['inserted']} inserted, "
+            f"{counts['updated']} updated, {counts['unchanged']} unchanged"
+        )
+        return counts
+    
+    async def _match_unkeyed_rows(self, session, model, natural_key, batch: List[Dict], existing: Dict) -> Dict[str, tuple]:
+        """Stored rows without a natural key (written before it was kept), matched once on their content.
+        
+        They come back without a digest, so the batch updates them and they
+        get their key; later syncs match them on it.
+        """
+        unmatched = {row["content_hash"]: row[natural_key.key] for row in batch if row[natural_key.key] not in existing}
+        if not unmatched:
+            return {}
+        result = await session.execute(
+            select(model.content_hash, model.id).where(natural_key.is_(None), model.content_hash.in_(unmatched))
+        )
+        return {unmatched[digest]: (record_id, None) for digest, record_id in result.all()}
+    
+    async def _index_batch(self, session, entity: str, record_ids: List[str], persist: bool) -> None:
+        """Update the search index for a stored batch; indexing failures never fail ingestion"""
+        if not settings.SEARCH_INDEX_ENABLED or not (record_ids or persist):
+            return
+        try:
+            await record_index.update(session, entity, record_ids, persist=persist)
+        except Exception as e:
+            logger.warning(f"Search index update failed for {entity}: {e}")
@@ -0,0 +1,27 @@
+import os
+import sys
+import tempfile
+import pytest_asyncio
+
+# Tests import the backend packages (config, database) like the app does,
+# against a throwaway SQLite database configured before config is imported
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+TEST_DIR = tempfile.mkdtemp(prefix="tinsig-tests-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(TEST_DIR, 'test.db')}"
+os.environ["DATABASE_REPLICA_URLS"] = ""
+os.environ["SEARCH_INDEX_ENABLED"] = "false"
+os.environ["SEARCH_INDEX_DIR"] = os.path.join(TEST_DIR, "vector_store")
+os.environ["EMBEDDING_MODEL"] = "hashing"
+
+@pytest_asyncio.fixture
+async def db():
+    """The app's database with freshly created tables, dropped after the test"""
+    from database.db import database
+    from database.models import Base
+    
+    async with database.engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    yield database
+    async with database.engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+    await database.engine.dispose()
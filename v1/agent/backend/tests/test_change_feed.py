@@ -0,0 +1,47 @@
+import pytest
+from services.change_feed import MAX_EVENT_KABUPATEN, Subscription
+
+def change(generation, table="illegal", count=1, kabupaten=("Bangka",)):
+    return {"generation": generation, "table": table, "count": count, "kabupaten": list(kabupaten)}
+
+@pytest.mark.asyncio
+async def test_changes_to_one_table_coalesce():
+    subscription = Subscription()
+    subscription.offer(change(1, count=2, kabupaten=["Bangka"]))
+    subscription.offer(change(2, count=3, kabupaten=["Belitung", "Bangka"]))
+    
+    events = await subscription.next(timeout=1, window=0)
+    
+    assert events == [
+        {"generation": 2, "from_generation": 1, "table": "illegal", "count": 5, "kabupaten": ["Bangka", "Belitung"]}
+    ]
+    assert subscription.after == 2
+    assert (subscription.received, subscription.coalesced, subscription.delivered) == (2, 1, 1)
+
+@pytest.mark.asyncio
+async def test_tables_are_delivered_oldest_generation_first():
+    subscription = Subscription()
+    subscription.offer(change(5, table="production"))
+    subscription.offer(change(3, table="iup"))
+    
+    events = await subscription.next(timeout=1, window=0)
+    
+    assert [event["table"] for event in events] == ["iup", "production"]
+
+@pytest.mark.asyncio
+async def test_already_sent_and_unsubscribed_changes_are_skipped():
+    subscription = Subscription(tables={"illegal"}, after=4)
+    subscription.offer(change(4))
+    subscription.offer(change(5, table="iup"))
+    
+    assert subscription.received == 0
+    assert await subscription.next(timeout=0.01, window=0) is None
+
+@pytest.mark.asyncio
+async def test_many_kabupaten_are_sent_as_everywhere():
+    subscription = Subscription()
+    subscription.offer(change(1, kabupaten=[f"Kabupaten {i}" for i in range(MAX_EVENT_KABUPATEN + 1)]))
+    
+    events = await subscription.next(timeout=1, window=0)
+    
+    assert events[0]["kabupaten"] is None
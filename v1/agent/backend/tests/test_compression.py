@@ -0,0 +1,56 @@
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+from middleware.compression import CompressionMiddleware
+
+@pytest.fixture
+def middleware():
+    middleware = CompressionMiddleware(app=None)
+    middleware.preference = ["br", "zstd", "gzip"]
+    return middleware
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("gzip, br", "br"),
+    ("gzip", "gzip"),
+    ("br;q=0, gzip;q=0.5", "gzip"),
+    ("br;q=0, zstd;q=0, *", "gzip"),
+    ("gzip;q=0", None),
+    ("identity", None),
+    ("", None),
+    ("gzip;q=bogus", None)
+])
+def test_negotiate_picks_first_server_preference_the_client_accepts(middleware, accept_encoding, expected):
+    assert middleware.negotiate(accept_encoding) == expected
+
+def test_size_threshold_follows_content_type_overrides(middleware):
+    middleware.size_overrides = [("application/json", 512), ("text/", 1024)]
+    middleware.min_size = 2048
+    
+    assert middleware.threshold_for("application/json") == 512
+    assert middleware.threshold_for("text/csv") == 1024
+    assert middleware.threshold_for("image/svg+xml") == 2048
+
+def client(body):
+    app = Starlette(routes=[
+        Route("/json", lambda request: JSONResponse(body)),
+        Route("/small", lambda request: PlainTextResponse("ok"))
+    ])
+    app.add_middleware(CompressionMiddleware)
+    return TestClient(app)
+
+def test_large_response_is_gzipped():
+    body = {"rows": [{"kabupaten": "Bangka", "produksi_ton": i} for i in range(500)]}
+    
+    response = client(body).get("/json", headers={"Accept-Encoding": "gzip"})
+    
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json() == body
+    assert int(response.headers["content-length"]) < len(response.content)
+
+def test_small_response_is_sent_as_is():
+    response = client({}).get("/small", headers={"Accept-Encoding": "gzip"})
+    
+    assert "content-encoding" not in response.headers
+    assert response.text == "ok"
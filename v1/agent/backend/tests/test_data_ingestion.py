@@ -0,0 +1,63 @@
+import pytest
+from sqlalchemy import func, select
+from database.models import ChangeEvent, IUP, Production
+from services.data_ingestion import DataIngestionService
+
+PRODUCTION = [
+    {"id": "PBT001", "tanggal_produksi": "2024-03-01", "lokasi": "DU 1", "kabupaten": "Bangka", "produksi_ton": "12.5"},
+    {"id": "PBT002", "tanggal_produksi": "2024-03-01", "lokasi": "DU 1", "kabupaten": "Bangka", "produksi_ton": "12.5"},
+    {"id": "PBT003", "tanggal_produksi": "2024-04-02", "lokasi": "DU 7", "kabupaten": "Belitung", "produksi_ton": "3"}
+]
+
+IUPS = [
+    {"name": "PT Timah", "du": "DU 1", "daerah": "Bangka", "status": "Active"},
+    {"name": "PT Koba", "du": "DU 7", "daerah": "Bangka Tengah", "status": "Expired"}
+]
+
+async def count(db, model):
+    async with db.async_session() as session:
+        return (await session.execute(select(func.count()).select_from(model))).scalar()
+
+@pytest.mark.asyncio
+async def test_resync_of_unchanged_production_writes_nothing(db):
+    service = DataIngestionService()
+    rows = await service._process_production_data(PRODUCTION)
+    
+    assert await service._store_production_data(rows) == {"inserted": 3, "updated": 0, "unchanged": 0}
+    assert await service._store_production_data(rows) == {"inserted": 0, "updated": 0, "unchanged": 3}
+    # Same-day entries with identical content are distinct records
+    assert await count(db, Production) == 3
+    assert await count(db, ChangeEvent) == 1
+
+@pytest.mark.asyncio
+async def test_changed_record_is_updated_in_place(db):
+    service = DataIngestionService()
+    await service._store_production_data(await service._process_production_data(PRODUCTION))
+    
+    corrected = [{**PRODUCTION[0], "produksi_ton": "13"}] + PRODUCTION[1:]
+    counts = await service._store_production_data(await service._process_production_data(corrected))
+    
+    assert counts == {"inserted": 0, "updated": 1, "unchanged": 2}
+    async with db.async_session() as session:
+        tons = (await session.execute(select(Production.produksi_ton).where(Production.source_id == "PBT001"))).scalar()
+    assert tons == 13
+    assert await count(db, Production) == 3
+
+@pytest.mark.asyncio
+async def test_iup_is_matched_on_du(db):
+    service = DataIngestionService()
+    await service._store_iup_data(await service._process_iup_data(IUPS))
+    
+    renewed = [{**IUPS[1], "status": "Active"}]
+    counts = await service._store_iup_data(await service._process_iup_data(renewed))
+    
+    assert counts == {"inserted": 0, "updated": 1, "unchanged": 0}
+    assert await count(db, IUP) == 2
+
+@pytest.mark.asyncio
+async def test_records_missing_their_key_are_dropped():
+    service = DataIngestionService()
+    
+    rows = await service._process_production_data([{k: v for k, v in PRODUCTION[0].items() if k != "id"}])
+    
+    assert rows == []
@@ -0,0 +1,28 @@
+from datetime import datetime
+from database.models import Production
+from utils.hashing import content_hash, hashed_columns
+
+def test_hashed_columns_skip_bookkeeping_and_source_ids():
+    columns = hashed_columns(Production)
+    
+    assert "produksi_ton" in columns
+    assert not {"id", "source_id", "content_hash", "created_at"} & set(columns)
+
+def test_equal_content_gives_equal_hash():
+    columns = ["kabupaten", "tanggal", "produksi_ton"]
+    row = {"kabupaten": "Bangka", "tanggal": datetime(2024, 3, 1), "produksi_ton": 12.5}
+    
+    assert content_hash(row, columns) == content_hash(dict(reversed(list(row.items()))), columns)
+    assert len(content_hash(row, columns)) == 32
+
+def test_changed_or_missing_value_changes_hash():
+    columns = ["kabupaten", "produksi_ton"]
+    row = {"kabupaten": "Bangka", "produksi_ton": 12.5}
+    
+    assert content_hash(row, columns) != content_hash({**row, "produksi_ton": 12.6}, columns)
+    assert content_hash(row, columns) != content_hash({"kabupaten": "Bangka"}, columns)
+
+def test_columns_outside_the_list_are_ignored():
+    columns = ["kabupaten"]
+    
+    assert content_hash({"kabupaten": "Bangka", "id": "a"}, columns) == content_hash({"kabupaten": "Bangka", "id": "b"}, columns)
@@ -0,0 +1,73 @@
+from agents.planner import plan_query
+from agents.query_cache import QueryCache, normalize_question
+
+def cache_with(*questions):
+    cache = QueryCache(threshold=0.5)
+    for question in questions:
+        cache.store_plan(question, plan_query(question))
+    return cache
+
+def entry(cache, question):
+    return cache.entries[normalize_question(question)]
+
+def reuse(cache, cached_question, question):
+    return cache._reuse(entry(cache, cached_question), cache._slots(normalize_question(question)), question)
+
+def test_same_slots_reuse_the_plan():
+    question = "How many illegal mining sites are in Bangka Barat?"
+    cache = cache_with(question)
+    
+    plan = reuse(cache, question, "how many illegal mining sites are there in Bangka Barat")
+    
+    assert plan is not None
+    assert plan.question == "how many illegal mining sites are there in Bangka Barat"
+    assert plan.filters == {"kabupaten": "Bangka Barat"}
+
+def test_different_kabupaten_is_rejected():
+    question = "How many illegal mining sites are in Bangka Barat?"
+    cache = cache_with(question)
+    
+    assert reuse(cache, question, "How many illegal mining sites are in Bangka Tengah?") is None
+
+def test_different_keyword_intent_is_rejected():
+    question = "How many illegal mining sites are in Bangka?"
+    cache = cache_with(question)
+    
+    assert reuse(cache, question, "Illegal mining trend in Bangka") is None
+
+def test_period_presence_must_match():
+    question = "How many illegal mining sites are in Bangka in 2024?"
+    cache = cache_with(question)
+    
+    assert reuse(cache, question, "How many illegal mining sites are in Bangka?") is None
+
+def test_new_period_replaces_the_cached_one_without_touching_the_entry():
+    question = "How many illegal mining sites are in Bangka in 2024?"
+    cache = cache_with(question)
+    
+    plan = reuse(cache, question, "How many illegal mining sites are in Bangka in 2023?")
+    
+    assert (plan.filters["date_from"], plan.filters["date_to"]) == ("2023-01-01T00:00:00", "2024-01-01T00:00:00")
+    assert entry(cache, question).plan["filters"]["date_from"] == "2024-01-01T00:00:00"
+
+def test_period_the_planner_chose_itself_is_not_carried_over():
+    question = "What happened in Bangka in 2024?"
+    cache = QueryCache(threshold=0.5)
+    plan = plan_query(question)
+    plan.steps = [{
+        "tool": "count",
+        "args": {},
+        "entity": "iup",
+        "filters": {"date_from": "2024-06-01T00:00:00", "date_to": "2024-07-01T00:00:00"}
+    }]
+    cache.store_plan(question, plan)
+    
+    assert reuse(cache, question, "What happened in Bangka in 2023?") is None
+
+def test_lookup_counts_hits_and_misses():
+    cache = cache_with("How many illegal mining sites are in Bangka Barat?")
+    
+    assert cache.lookup("How many illegal mining sites are in Bangka Barat?").match == "exact"
+    assert cache.lookup("How many illegal mining sites are in Belitung?") is None
+    assert cache.stats()["hits"]["exact"] == 1
+    assert cache.stats()["misses"] == 1
@@ -0,0 +1,53 @@
+from datetime import datetime
+import pytest
+from sqlalchemy import update
+from database.models import IllegalMining
+from vectors.record_index import RecordIndex
+
+def site(mobile_id, owner, kabupaten="Bangka"):
+    return IllegalMining(
+        id=f"id-{mobile_id}",
+        mobile_id=mobile_id,
+        kabupaten=kabupaten,
+        tanggal_survey=datetime(2024, 1, 1),
+        nama_pemilik=owner
+    )
+
+@pytest.mark.asyncio
+async def test_update_save_load_round_trip(db, tmp_path):
+    async with db.async_session() as session:
+        session.add_all([site("M1", "Pemilik Toboali"), site("M2", "Koba Jaya", "Bangka Tengah")])
+        await session.commit()
+    
+    writer = RecordIndex(str(tmp_path))
+    async with db.async_session() as session:
+        # Nothing on disk yet: the first update indexes everything
+        assert await writer.update(session, "illegal", ["id-M1"]) == 2
+    
+    reader = RecordIndex(str(tmp_path))
+    assert reader.load(mmap=True)
+    assert len(reader) == 2
+    assert reader.search("Pemilik Toboali", k=1, entity="illegal")[0][:2] == ("illegal", "id-M1")
+
+@pytest.mark.asyncio
+async def test_update_re_embeds_only_changed_text(db, tmp_path):
+    async with db.async_session() as session:
+        session.add_all([site("M1", "Pemilik Toboali"), site("M2", "Koba Jaya")])
+        await session.commit()
+    
+    index = RecordIndex(str(tmp_path))
+    async with db.async_session() as session:
+        await index.rebuild(session)
+        assert await index.update(session, "illegal", ["id-M1", "id-M2"]) == 0
+        
+        await session.execute(update(IllegalMining).where(IllegalMining.id == "id-M2").values(nama_pemilik="Sungailiat Makmur"))
+        await session.commit()
+        assert await index.update(session, "illegal", ["id-M1", "id-M2"]) == 1
+    
+    reloaded = RecordIndex(str(tmp_path))
+    assert reloaded.load(mmap=True)
+    assert len(reloaded) == 2
+    assert reloaded.search("Sungailiat Makmur", k=1)[0][:2] == ("illegal", "id-M2")
+
+def test_load_without_files_returns_false(tmp_path):
+    assert not RecordIndex(str(tmp_path)).load()
@@ -0,0 +1,15 @@
+import hashlib
+from typing import Any, Dict, List, Sequence
+import orjson
+
+# Bookkeeping columns and source ids, which are not part of a record's content
+UNHASHED_COLUMNS = {"id", "source_id", "content_hash", "created_at"}
+
+def hashed_columns(model) -> List[str]:
+    """Content columns of a model, in table order"""
+    return [column.key for column in model.__table__.columns if column.key not in UNHASHED_COLUMNS]
+
+def content_hash(values: Dict[str, Any], columns: Sequence[str]) -> str:
+    """128-bit digest of a record's normalized values; equal content gives an equal hash"""
+    payload = orjson.dumps([values.get(column) for column in columns], option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
@@ -0,0 +1,148 @@
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+from prometheus_client import Counter, Gauge, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, REGISTRY
+
+# Request latency and payload size
+HTTP_REQUEST_DURATION = Histogram(
+    "tinsig_http_request_duration_seconds",
+    "HTTP request latency by route",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+HTTP_RESPONSE_BYTES = Histogram(
+    "tinsig_http_response_bytes",
+    "Serialized response body size by route (after compression)",
+    ["route"],
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+)
+
+# Database work done per request
+DB_QUERIES_PER_REQUEST = Histogram(
+    "tinsig_db_queries_per_request",
+    "Number of SQL statements executed per request",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100)
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "tinsig_db_query_seconds_per_request",
+    "Total SQL execution time per request",
+    ["route"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+
+# Caches
+CACHE_LOOKUPS = Counter(
+    "tinsig_cache_lookups_total",
+    "Cache lookups by cache and result (hit/miss)",
+    ["cache", "result"]
+)
+
+# Ingestion
+INGESTION_ROWS = Counter(
+    "tinsig_ingestion_rows_total",
+    "Rows ingested per source",
+    ["source"]
+)
+INGESTION_DURATION = Histogram(
+    "tinsig_ingestion_duration_seconds",
+    "Duration of one ingestion run per source",
+    ["source"],
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+)
+INGESTION_WRITES = Counter(
+    "tinsig_ingestion_writes_total",
+    "Ingested rows per table by outcome (inserted/updated/unchanged)",
+    ["table", "result"]
+)
+INGESTION_ROWS_PER_SECOND = Gauge(
+    "tinsig_ingestion_rows_per_second",
+    "Throughput of the most recent ingestion run per source",
+    ["source"]
+)
+
+class RequestDBStats:
+    """SQL statement count and time accumulated for the current request"""
+    
+    __slots__ = ("queries", "seconds")
+    
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+request_db_stats: ContextVar[Optional[RequestDBStats]] = ContextVar("request_db_stats", default=None)
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    CACHE_LOOKUPS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+def record_ingestion(source: str, rows: int, seconds: float) -> None:
+    INGESTION_ROWS.labels(source=source).inc(rows)
+    INGESTION_DURATION.labels(source=source).observe(seconds)
+    if seconds > 0:
+        INGESTION_ROWS_PER_SECOND.labels(source=source).set(rows / seconds)
+
+def record_ingestion_writes(table: str, counts: Dict[str, int]) -> None:
+    for result, count in counts.items():
+        INGESTION_WRITES.labels(table=table, result=result).inc(count)
+
+def instrument_engine(engine) -> None:
+    """Attach SQLAlchemy cursor hooks that feed the per-request DB stats"""
+    from sqlalchemy import event
+    
+    sync_engine = getattr(engine, "sync_engine", engine)
+    
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+    
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("query_start")
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        stats = request_db_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.seconds += elapsed
+
+class DatabasePoolCollector:
+    """Expose connection pool occupancy and wait metrics at scrape time"""
+    
+    GAUGES = {
+        "size": "Configured pool size",
+        "checked_out": "Connections currently checked out",
+        "overflow": "Current overflow connections",
+        "avg_wait_ms": "Average checkout wait in milliseconds",
+        "max_wait_ms": "Maximum checkout wait in milliseconds"
+    }
+    
+    # Cumulative since startup; exported as counters (the _total suffix is added on exposition)
+    COUNTERS = {
+        "checkouts": "Successful checkouts",
+        "exhausted": "Checkouts that found the pool exhausted",
+        "timeouts": "Checkouts that timed out"
+    }
+    
+    def __init__(self, database):
+        self.database = database
+    
+    def collect(self):
+        status = self.database.pool_status()
+        families = [(GaugeMetricFamily, self.GAUGES), (CounterMetricFamily, self.COUNTERS)]
+        for metric_family, metrics in families:
+            for key, description in metrics.items():
+                family = metric_family(f"tinsig_db_pool_{key}", description, labels=["engine"])
+                for engine_name, values in status.items():
+                    if values.get(key) is not None:
+                        family.add_metric([engine_name], float(values[key]))
+                yield family
+
+_pool_collector_registered = False
+
+def register_pool_collector(database) -> None:
+    global _pool_collector_registered
+    if not _pool_collector_registered:
+        REGISTRY.register(DatabasePoolCollector(database))
+        _pool_collector_registered = True
@@ -0,0 +1,167 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import re
+import sys
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from config import settings
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+def profiling_token() -> str:
+    """Token that forces a profile capture, derived from SECRET_KEY"""
+    return hmac.new(settings.SECRET_KEY.encode(), b"tinsig-profile", hashlib.sha256).hexdigest()
+
+def is_valid_profiling_token(token: Optional[str]) -> bool:
+    return bool(token) and hmac.compare_digest(token, profiling_token())
+
+class ProfileCapture:
+    """Stack samples collected for one request"""
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.started_at = datetime.now(timezone.utc)
+        self.samples: Counter = Counter()
+
+    def folded(self) -> str:
+        """Samples in collapsed-stack format (flamegraph.pl, speedscope, inferno)"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+class StackSampler:
+    """Samples the event loop thread's stack and attributes it to the running request.
+
+    A background thread wakes every `interval` seconds while at least one request
+    is being profiled, reads the loop thread's current frame and the loop's current
+    task, and adds the collapsed stack to that task's capture.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._captures: Dict[asyncio.Task, ProfileCapture] = {}
+        self._lock = threading.Lock()
+        self._active = threading.Event()
+        self._stopped = threading.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread_id: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        self._thread_id = threading.get_ident()
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._active.set()
+        if self._thread:
+            self._thread.join(timeout=1)
+
+    def begin(self, task: asyncio.Task, capture: ProfileCapture) -> None:
+        with self._lock:
+            self._captures[task] = capture
+            self._active.set()
+
+    def end(self, task: asyncio.Task) -> Optional[ProfileCapture]:
+        with self._lock:
+            capture = self._captures.pop(task, None)
+            if not self._captures:
+                self._active.clear()
+        return capture
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._active.wait()
+            if self._stopped.wait(self.interval):
+                break
+
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None:
+                continue
+            task = asyncio.current_task(self._loop)
+
+            with self._lock:
+                capture = self._captures.get(task)
+                if capture is None and len(self._captures) == 1:
+                    # Only one request in flight: the loop is working for it
+                    capture = next(iter(self._captures.values()))
+                if capture is not None:
+                    capture.samples[self._collapse(frame)] += 1
+
+    @staticmethod
+    def _collapse(frame) -> str:
+        stack: List[str] = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+            frame = frame.f_back
+        return ";".join(reversed(stack))
+
+class ProfileStore:
+    """Rotating directory of captured profiles"""
+
+    def __init__(self, directory: str, max_files: int):
+        self.directory = directory
+        self.max_files = max_files
+
+    def save(self, capture: ProfileCapture, duration_ms: float, status: int, reason: str) -> Optional[str]:
+        if not capture.samples:
+            return None
+
+        os.makedirs(self.directory, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", capture.path).strip("-") or "root"
+        name = f"{capture.started_at:%Y%m%dT%H%M%S%f}_{capture.method}_{slug}_{int(duration_ms)}ms"
+
+        with open(os.path.join(self.directory, f"{name}.folded"), "w") as f:
+            f.write(capture.folded())
+        with open(os.path.join(self.directory, f"{name}.json"), "w") as f:
+            json.dump({
+                "name": name,
+                "method": capture.method,
+                "path": capture.path,
+                "started_at": capture.started_at.isoformat(),
+                "duration_ms": round(duration_ms, 2),
+                "status": status,
+                "reason": reason,
+                "samples": sum(capture.samples.values())
+            }, f)
+
+        self._rotate()
+        return name
+
+    def list(self) -> List[Dict[str, Any]]:
+        if not os.path.isdir(self.directory):
+            return []
+        captures = []
+        for filename in sorted(os.listdir(self.directory), reverse=True):
+            if filename.endswith(".json"):
+                try:
+                    with open(os.path.join(self.directory, filename)) as f:
+                        captures.append(json.load(f))
+                except (OSError, ValueError):
+                    continue
+        return captures
+
+    def path_for(self, name: str) -> Optional[str]:
+        path = os.path.join(self.directory, f"{os.path.basename(name)}.folded")
+        return path if os.path.isfile(path) else None
+
+    def _rotate(self) -> None:
+        names = sorted(f[:-len(".folded")] for f in os.listdir(self.directory) if f.endswith(".folded"))
+        for name in names[:-self.max_files] if len(names) > self.max_files else []:
+            for suffix in (".folded", ".json"):
+                try:
+                    os.remove(os.path.join(self.directory, name + suffix))
+                except OSError:
+                    pass
+
+sampler = StackSampler(settings.PROFILING_SAMPLE_INTERVAL_MS / 1000)
+profile_store = ProfileStore(settings.PROFILING_DIR, settings.PROFILING_MAX_FILES)
@@ -0,0 +1,16 @@
+from typing import Any
+from fastapi.responses import JSONResponse
+import orjson
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson.
+
+    orjson serializes datetimes, dates, UUIDs and numpy values natively, so
+    routes can return query rows as-is. Routes that return this class directly
+    also skip FastAPI's jsonable_encoder pass.
+    """
+    
+    media_type = "application/json"
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
@@ -0,0 +1,103 @@
+import re
+import zlib
+from typing import Callable, Dict, List, Tuple
+import numpy as np
+from config import settings
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+class HashingEmbedder:
+    """Feature-hashing embedder: word unigrams, bigrams and character trigrams.
+
+    Deterministic and dependency-free, so indexes and caches can be built and
+    tested offline. It captures lexical overlap rather than meaning, which is
+    what matching reworded dashboard questions and record fields mostly needs.
+    """
+    
+    name = "hashing"
+    
+    # Memoised feature buckets kept before the memo is reset
+    MAX_MEMO = 200000
+    
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+        self._buckets: Dict[str, Tuple[int, float]] = {}
+    
+    def _features(self, text: str) -> List[str]:
+        words = TOKEN_PATTERN.findall(text.lower())
+        features = [f"w:{word}" for word in words]
+        features += [f"b:{a} {b}" for a, b in zip(words, words[1:])]
+        for word in words:
+            padded = f"#{word}#"
+            features += [f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+        return features
+    
+    def _bucket(self, feature: str) -> Tuple[int, float]:
+        """Hashed dimension and signed weight of a feature, memoised"""
+        bucket = self._buckets.get(feature)
+        if bucket is None:
+            if len(self._buckets) >= self.MAX_MEMO:
+                self._buckets.clear()
+            digest = zlib.crc32(feature.encode())
+            # Word features weigh more than the trigrams that also describe them
+            weight = 1.0 if feature[0] == "c" else 2.0
+            bucket = self._buckets[feature] = (digest % self.dim, weight if digest & 0x80000000 else -weight)
+        return bucket
+    
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """L2-normalised float32 matrix, one row per text"""
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            # Accumulate in a dict; per-element numpy writes dominate otherwise
+            counts: Dict[int, float] = {}
+            for feature in self._features(text):
+                column, weight = self._bucket(feature)
+                counts[column] = counts.get(column, 0.0) + weight
+            if counts:
+                vectors[row, list(counts)] = list(counts.values())
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+class SentenceTransformerEmbedder:
+    """sentence-transformers model (e.g. all-MiniLM-L6-v2), normalised for cosine search"""
+    
+    name = "sentence-transformers"
+    
+    def __init__(self, model: str):
+        from sentence_transformers import SentenceTransformer
+        
+        self.model = SentenceTransformer(model)
+        self.dim = self.model.get_sentence_embedding_dimension()
+    
+    def embed(self, texts: List[str]) -> np.ndarray:
+        return self.model.encode(texts, normalize_embeddings=True, convert_to_numpy=True).astype(np.float32)
+
+# Embedder factories by name; register_embedder() adds more
+EMBEDDER_FACTORIES: Dict[str, Callable[[], object]] = {
+    "hashing": lambda: HashingEmbedder(settings.EMBEDDING_DIM),
+    "sentence-transformers": lambda: SentenceTransformerEmbedder(settings.EMBEDDING_MODEL_NAME)
+}
+
+_embedders: Dict[str, object] = {}
+
+def register_embedder(name: str, factory: Callable[[], object]) -> None:
+    EMBEDDER_FACTORIES[name] = factory
+    _embedders.pop(name, None)
+
+def get_embedder(name: str = None):
+    """Embedder instance by name, falling back to the hashing embedder if it cannot be created"""
+    name = name or settings.EMBEDDING_MODEL
+    if name not in _embedders:
+        factory = EMBEDDER_FACTORIES.get(name)
+        if factory is None:
+            raise ValueError(f"Unknown embedding model '{name}'. Available: {', '.join(EMBEDDER_FACTORIES)}")
+        try:
+            _embedders[name] = factory()
+        except Exception as e:
+            logger.warning(f"Embedding model '{name}' unavailable ({e}); using the hashing embedder")
+            _embedders[name] = EMBEDDER_FACTORIES["hashing"]()
+    return _embedders[name]
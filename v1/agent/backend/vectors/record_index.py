@@ -0,0 +1,283 @@
+import asyncio
+import hashlib
+import heapq
+import os
+import time
+import zlib
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+import orjson
+from sqlalchemy import select
+from config import settings
+from database.models import IllegalMining, Production, IUP
+from utils.logger import setup_logger
+from vectors.embeddings import get_embedder
+from vectors.store import STORE_CLASSES, create_vector_store
+
+logger = setup_logger(__name__)
+
+# Model and the text fields embedded for each record type
+RECORD_FIELDS = {
+    "illegal": (IllegalMining, ["nama_pemilik", "mobile_id", "jenis_tambang", "kecamatan", "kabupaten", "metadata_json"]),
+    "iup": (IUP, ["name", "du", "no_sk", "daerah", "status", "cnc"]),
+    "production": (Production, ["operator", "lokasi", "metode_tambang", "kecamatan", "kabupaten"])
+}
+
+# Rows read per query while rebuilding or updating
+FETCH_CHUNK = 5000
+
+def record_text(row: Dict[str, Any], fields: List[str]) -> str:
+    """Field values joined into one string; JSON metadata contributes its values"""
+    parts = []
+    for field in fields:
+        value = row.get(field)
+        if isinstance(value, dict):
+            parts.extend(str(item) for item in value.values() if item not in (None, ""))
+        elif isinstance(value, (list, tuple)):
+            parts.extend(str(item) for item in value if item not in (None, ""))
+        elif value not in (None, ""):
+            parts.append(str(value))
+    return " ".join(parts)
+
+def record_label(record_id: str) -> int:
+    """Stable non-negative int64 vector id for a record primary key"""
+    return int.from_bytes(hashlib.blake2b(record_id.encode(), digest_size=8).digest(), "big") & 0x7FFFFFFFFFFFFFFF
+
+def chunks(items: List[Any], size: int) -> Iterator[List[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+class EntityIndex:
+    """Vectors of one record type plus the label -> primary key map and text digests"""
+    
+    def __init__(self, store):
+        self.store = store
+        self.ids: Dict[int, str] = {}
+        self.digests: Dict[int, int] = {}
+
+class RecordIndex:
+    """Embedding index over illegal mining, IUP and production records.
+
+    One vector store per record type, persisted under `directory`. The API
+    process loads it memory-mapped (read-only, near-instant startup) and
+    reloads when the files change; the ingestion process opens it writable
+    and updates it after every stored batch, re-embedding only rows whose
+    indexed text changed.
+    """
+    
+    def __init__(self, directory: str, embedder=None, batch_size: int = 256, reload_seconds: float = 5):
+        self.directory = directory
+        self.batch_size = batch_size
+        self.reload_seconds = reload_seconds
+        self._embedder = embedder
+        self.entities: Dict[str, EntityIndex] = {}
+        self.writable = False
+        self.dirty = False
+        self.loaded_mtime: Optional[float] = None
+        self._reload_checked_at = 0.0
+        self._write_lock = asyncio.Lock()
+    
+    @property
+    def embedder(self):
+        if self._embedder is None:
+            self._embedder = get_embedder()
+        return self._embedder
+    
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+    
+    @property
+    def meta_path(self) -> str:
+        return self._path("meta.json")
+    
+    def __len__(self) -> int:
+        return sum(len(index.store) for index in self.entities.values())
+    
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Embed in batches of batch_size"""
+        if not texts:
+            return np.empty((0, self.embedder.dim), dtype=np.float32)
+        return np.vstack([self.embedder.embed(batch) for batch in chunks(texts, self.batch_size)])
+    
+    def load(self, mmap: bool = True) -> bool:
+        """Load the persisted index; False when missing or built with a different embedder"""
+        try:
+            with open(self.meta_path, "rb") as f:
+                meta = orjson.loads(f.read())
+            mtime = os.path.getmtime(self.meta_path)
+        except FileNotFoundError:
+            return False
+        
+        if meta["embedder"] != self.embedder.name or meta["dim"] != self.embedder.dim:
+            logger.warning(
+                f"Search index was built with {meta['embedder']} ({meta['dim']}d), "
+                f"current embedder is {self.embedder.name} ({self.embedder.dim}d); rebuild required"
+            )
+            return False
+        
+        store_class = STORE_CLASSES[meta["store"]]
+        entities = {}
+        for entity in RECORD_FIELDS:
+            index = EntityIndex(store_class.load(self._path(f"{entity}.{meta['store']}"), mmap=mmap))
+            with open(self._path(f"{entity}.keys.json"), "rb") as f:
+                keys = orjson.loads(f.read())
+            index.ids = dict(zip(keys["labels"], keys["ids"]))
+            index.digests = dict(zip(keys["labels"], keys["digests"]))
+            entities[entity] = index
+        
+        self.entities = entities
+        self.writable = not mmap
+        self.loaded_mtime = mtime
+        logger.info(f"Loaded search index: {len(self)} vectors ({'mmap' if mmap else 'writable'})")
+        return True
+    
+    def maybe_reload(self) -> None:
+        """Pick up an index rewritten by another process, checking at most every reload_seconds"""
+        now = time.monotonic()
+        if now - self._reload_checked_at < self.reload_seconds:
+            return
+        self._reload_checked_at = now
+        try:
+            mtime = os.path.getmtime(self.meta_path)
+        except FileNotFoundError:
+            return
+        if mtime != self.loaded_mtime:
+            self.load(mmap=not self.writable)
+    
+    def save(self) -> None:
+        """Write every file to a temporary name and swap it in; meta.json goes last"""
+        os.makedirs(self.directory, exist_ok=True)
+        kind = next(iter(self.entities.values())).store.kind
+        suffix = f".{os.getpid()}.tmp"
+        for entity, index in self.entities.items():
+            path = self._path(f"{entity}.{kind}")
+            index.store.save(path + suffix)
+            os.replace(path + suffix, path)
+            labels = list(index.ids)
+            keys = {
+                "labels": labels,
+                "ids": [index.ids[label] for label in labels],
+                "digests": [index.digests[label] for label in labels]
+            }
+            path = self._path(f"{entity}.keys.json")
+            with open(path + suffix, "wb") as f:
+                f.write(orjson.dumps(keys))
+            os.replace(path + suffix, path)
+        
+        meta = {
+            "embedder": self.embedder.name,
+            "dim": self.embedder.dim,
+            "store": kind,
+            "count": len(self),
+            "updated_at": datetime.now(timezone.utc).isoformat()
+        }
+        with open(self.meta_path + suffix, "wb") as f:
+            f.write(orjson.dumps(meta))
+        os.replace(self.meta_path + suffix, self.meta_path)
+        self.loaded_mtime = os.path.getmtime(self.meta_path)
+        self.dirty = False
+    
+    def _reset(self) -> None:
+        self.entities = {entity: EntityIndex(create_vector_store(self.embedder.dim)) for entity in RECORD_FIELDS}
+        self.writable = True
+    
+    async def _fetch(self, session, entity: str, record_ids: Optional[List[str]] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        model, fields = RECORD_FIELDS[entity]
+        columns = [model.id] + [getattr(model, field) for field in fields]
+        if record_ids is None:
+            last_id = ""
+            while True:
+                query = select(*columns).where(model.id > last_id).order_by(model.id).limit(FETCH_CHUNK)
+                rows = [dict(row) for row in (await session.execute(query)).mappings()]
+                if not rows:
+                    return
+                last_id = rows[-1]["id"]
+                yield rows
+        else:
+            for batch in chunks(record_ids, FETCH_CHUNK):
+                yield [dict(row) for row in (await session.execute(select(*columns).where(model.id.in_(batch)))).mappings()]
+    
+    async def _apply(self, entity: str, rows: List[Dict[str, Any]]) -> int:
+        """Re-embed rows whose text changed; returns the number of vectors written"""
+        index = self.entities[entity]
+        fields = RECORD_FIELDS[entity][1]
+        changed, texts = [], []
+        for row in rows:
+            text = record_text(row, fields)
+            label, digest = record_label(row["id"]), zlib.crc32(text.encode())
+            if index.digests.get(label) != digest:
+                changed.append((label, row["id"], digest))
+                texts.append(text)
+        if not changed:
+            return 0
+        
+        # Embedding is CPU-bound; keep it off the event loop
+        vectors = await asyncio.to_thread(self.embed, texts)
+        label_array = np.array([label for label, _, _ in changed], dtype=np.int64)
+        index.store.remove(label_array)
+        index.store.add(label_array, vectors)
+        for label, record_id, digest in changed:
+            index.ids[label] = record_id
+            index.digests[label] = digest
+        return len(changed)
+    
+    async def rebuild(self, session) -> int:
+        """Embed every record from scratch and persist"""
+        async with self._write_lock:
+            return await self._rebuild(session)
+    
+    async def _rebuild(self, session) -> int:
+        start = time.perf_counter()
+        self._reset()
+        for entity in RECORD_FIELDS:
+            async for rows in self._fetch(session, entity):
+                await self._apply(entity, rows)
+        self.save()
+        logger.info(f"Built search index: {len(self)} vectors in {time.perf_counter() - start:.1f}s")
+        return len(self)
+    
+    async def update(self, session, entity: str, record_ids: List[str], persist: bool = True) -> int:
+        """Index new or changed records after an ingestion batch.
+
+        Pass persist=False for all but the last batch of a run to write the
+        files once instead of after every batch.
+        """
+        async with self._write_lock:
+            if not self.writable and not self.load(mmap=False):
+                # Nothing usable on disk: index everything, which includes this batch
+                return await self._rebuild(session)
+            
+            written = 0
+            async for rows in self._fetch(session, entity, record_ids):
+                written += await self._apply(entity, rows)
+            self.dirty = self.dirty or written > 0
+            if persist and self.dirty:
+                self.save()
+            return written
+    
+    def search(self, query: str, k: int = 10, entity: Optional[str] = None) -> List[Tuple[str, str, float]]:
+        """Top-k (entity, record id, score) across the requested record types"""
+        self.maybe_reload()
+        targets = [entity] if entity else list(self.entities)
+        vector = self.embed([query])
+        
+        candidates = []
+        for name in targets:
+            index = self.entities.get(name)
+            if index is None or not len(index.store):
+                continue
+            scores, labels = index.store.search(vector, k)
+            for score, label in zip(scores[0], labels[0]):
+                record_id = index.ids.get(int(label))
+                if label >= 0 and record_id is not None:
+                    candidates.append((float(score), name, record_id))
+        
+        return [(name, record_id, round(score, 4)) for score, name, record_id in heapq.nlargest(k, candidates)]
+
+# Global record index instance
+record_index = RecordIndex(
+    settings.SEARCH_INDEX_DIR,
+    batch_size=settings.EMBEDDING_BATCH_SIZE,
+    reload_seconds=settings.SEARCH_INDEX_RELOAD_SECONDS
+)
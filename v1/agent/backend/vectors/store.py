@@ -0,0 +1,117 @@
+from typing import Tuple
+import numpy as np
+from config import settings
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+class FaissVectorStore:
+    """Exact inner-product search over normalised vectors, keyed by int64 ids"""
+    
+    kind = "faiss"
+    
+    def __init__(self, dim: int):
+        import faiss
+        
+        self.faiss = faiss
+        self.dim = dim
+        self.index = faiss.IndexIDMap2(faiss.IndexFlatIP(dim))
+    
+    def __len__(self) -> int:
+        return self.index.ntotal
+    
+    def add(self, ids: np.ndarray, vectors: np.ndarray) -> None:
+        if len(ids):
+            self.index.add_with_ids(np.ascontiguousarray(vectors, dtype=np.float32), np.asarray(ids, dtype=np.int64))
+    
+    def remove(self, ids: np.ndarray) -> None:
+        if len(ids):
+            self.index.remove_ids(np.asarray(ids, dtype=np.int64))
+    
+    def search(self, vectors: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(scores, ids) of shape (len(vectors), k); missing neighbours have id -1"""
+        return self.index.search(np.ascontiguousarray(vectors, dtype=np.float32), k)
+    
+    def reset(self) -> None:
+        self.index.reset()
+    
+    def save(self, path: str) -> None:
+        self.faiss.write_index(self.index, path)
+    
+    @classmethod
+    def load(cls, path: str, mmap: bool = False) -> "FaissVectorStore":
+        """Read an index; with mmap the vectors stay in the page cache and the store is read-only"""
+        import faiss
+        
+        flags = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP) if mmap else 0
+        store = cls.__new__(cls)
+        store.faiss = faiss
+        store.index = faiss.read_index(path, flags)
+        store.dim = store.index.d
+        return store
+
+class NumpyVectorStore:
+    """Brute-force fallback with the same interface when faiss is not installed"""
+    
+    kind = "memory"
+    
+    def __init__(self, dim: int):
+        self.dim = dim
+        self.reset()
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    def add(self, ids: np.ndarray, vectors: np.ndarray) -> None:
+        if len(ids):
+            self.ids = np.concatenate([self.ids, np.asarray(ids, dtype=np.int64)])
+            self.vectors = np.vstack([self.vectors, np.asarray(vectors, dtype=np.float32)])
+    
+    def remove(self, ids: np.ndarray) -> None:
+        keep = ~np.isin(self.ids, np.asarray(ids, dtype=np.int64))
+        self.ids, self.vectors = self.ids[keep], self.vectors[keep]
+    
+    def search(self, vectors: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        queries = np.asarray(vectors, dtype=np.float32)
+        scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        ids = np.full((len(queries), k), -1, dtype=np.int64)
+        if len(self.ids):
+            similarity = queries @ self.vectors.T
+            top = min(k, len(self.ids))
+            order = np.argsort(-similarity, axis=1)[:, :top]
+            scores[:, :top] = np.take_along_axis(similarity, order, axis=1)
+            ids[:, :top] = self.ids[order]
+        return scores, ids
+    
+    def reset(self) -> None:
+        self.ids = np.empty(0, dtype=np.int64)
+        self.vectors = np.empty((0, self.dim), dtype=np.float32)
+    
+    def save(self, path: str) -> None:
+        with open(path, "wb") as f:
+            np.save(f, self.ids)
+            np.save(f, self.vectors)
+    
+    @classmethod
+    def load(cls, path: str, mmap: bool = False) -> "NumpyVectorStore":
+        with open(path, "rb") as f:
+            ids = np.load(f)
+            vectors = np.load(f)
+        store = cls(vectors.shape[1])
+        store.ids, store.vectors = ids, vectors
+        return store
+
+STORE_CLASSES = {"faiss": FaissVectorStore, "memory": NumpyVectorStore}
+
+def create_vector_store(dim: int, kind: str = None):
+    """Vector store for VECTOR_STORE_TYPE; falls back to the in-memory store when faiss is missing"""
+    kind = (kind or settings.VECTOR_STORE_TYPE).lower()
+    if kind == "memory":
+        return NumpyVectorStore(dim)
+    if kind != "faiss":
+        logger.warning(f"Vector store '{kind}' is not supported for local indexes; using faiss")
+    try:
+        return FaissVectorStore(dim)
+    except ImportError:
+        logger.warning("faiss is not installed; using the in-memory vector store")
+        return NumpyVectorStore(dim)
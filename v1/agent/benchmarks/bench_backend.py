@@ -0,0 +1,193 @@
+"""
+Backend benchmarks: ingestion throughput and data API route latency.
+
+ingestion  DataIngestionService.ingest_all_sources() against the mock source
+           servers (mock_sources) serving N synthetic records each, into
+           empty tables, including the per-batch search index updates
+routes     latency (p50/p95/mean) and payload size of every api/data.py route
+           against a database seeded with N rows per table
+
+The database defaults to a throwaway SQLite file; pass --database-url to
+benchmark against PostgreSQL. Tables are dropped and re-created per size.
+
+Usage:
+    python benchmarks/bench_backend.py [--sizes 10000,100000] [--suites ingestion,routes]
+                                       [--database-url URL] [--iterations 10] [--output results.json]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from seed_database import seed_database
+
+# (name, path); paths are relative to the data router
+ROUTES = [
+    ("illegal-mining", "/illegal-mining?limit=1000"),
+    ("illegal-mining?kabupaten", "/illegal-mining?kabupaten=Bangka&limit=1000"),
+    ("illegal-mining?fields", "/illegal-mining?fields=id,kabupaten,location_lat,location_lng&limit=1000"),
+    ("production", "/production?limit=1000"),
+    ("production?date-range", "/production?date_from=2023-06-01T00:00:00&date_to=2023-12-31T00:00:00&limit=1000"),
+    ("iup", "/iup?limit=1000"),
+    ("stats/summary", "/stats/summary"),
+    ("stats/distribution", "/stats/distribution?entity=illegal&field=jenis_tambang"),
+    ("stats/production-trend", "/stats/production-trend"),
+    ("activity/recent", "/activity/recent?limit=10"),
+    ("map-data", "/map-data"),
+    ("map-data?kabupaten", "/map-data?layer=illegal&kabupaten=Bangka&kabupaten=Belitung"),
+    ("detail", "/illegal/FIM1700000000000")
+]
+
+def percentile(values, pct: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+def summarize(timings) -> dict:
+    return {
+        "p50_ms": round(percentile(timings, 50) * 1000, 3),
+        "p95_ms": round(percentile(timings, 95) * 1000, 3),
+        "mean_ms": round(statistics.mean(timings) * 1000, 3)
+    }
+
+async def bench_ingestion(size: int) -> dict:
+    from services.data_ingestion import DataIngestionService
+    from mock_sources.server import start_sources
+    from database.db import database
+    from database.schema import reset_schema
+    from vectors.record_index import record_index
+
+    await reset_schema(database.engine)
+    # Start from an empty search index so every run indexes incrementally
+    async with database.async_session() as session:
+        await record_index.rebuild(session)
+
+    # The ingestion service fetches one unpaged request, so serve everything on page one
+    sources = await start_sources(ports={"illegal": 0, "production": 0, "iup": 0},
+                                  record_count=size, page_size=size, max_page_size=size)
+    try:
+        service = DataIngestionService()
+        service.source1_url = sources["illegal"].url
+        service.source2_url = sources["production"].url
+        service.source3_url = sources["iup"].url
+
+        start = time.perf_counter()
+        results = await service.ingest_all_sources()
+        elapsed = time.perf_counter() - start
+
+        # Unchanged source data again: content hashes should make this write nothing
+        start = time.perf_counter()
+        resync = await service.ingest_all_sources()
+        resync_elapsed = time.perf_counter() - start
+    finally:
+        for source in sources.values():
+            await source.stop()
+
+    rows = sum(result["count"] for result in results.values())
+    return {
+        "suite": "ingestion",
+        "size": size,
+        "seconds": round(elapsed, 3),
+        "rows": rows,
+        "rows_per_second": round(rows / elapsed) if elapsed else None,
+        "resync_seconds": round(resync_elapsed, 3),
+        "resync_written": sum(r.get("inserted", 0) + r.get("updated", 0) for r in resync.values()),
+        "indexed": len(record_index),
+        "source_bytes": sum(source.stats["bytes"] for source in sources.values()),
+        "sources": {key: {"status": r["status"], "count": r["count"], "error": r["error"]} for key, r in results.items()}
+    }
+
+async def bench_routes(size: int, iterations: int) -> list:
+    import httpx
+    from main import app
+
+    seed_seconds = await seed_database(size)
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench/api/v1/data", timeout=None) as client:
+        for name, path in ROUTES:
+            # Warm up, and record the uncompressed and negotiated payload sizes
+            response = await client.get(path, headers={"accept-encoding": "identity"})
+            response.raise_for_status()
+            raw_bytes = len(response.content)
+            compressed = await client.get(path, headers={"accept-encoding": "br, gzip"})
+            wire_bytes = int(compressed.headers.get("content-length", len(compressed.content)))
+
+            timings = []
+            for _ in range(iterations):
+                start = time.perf_counter()
+                response = await client.get(path, headers={"accept-encoding": "identity"})
+                _ = response.content
+                timings.append(time.perf_counter() - start)
+
+            result = {
+                "suite": "routes",
+                "size": size,
+                "route": name,
+                "bytes": raw_bytes,
+                "wire_bytes": wire_bytes,
+                "content_encoding": compressed.headers.get("content-encoding", "identity"),
+                **summarize(timings)
+            }
+            if name.startswith("map-data"):
+                result["features"] = len(response.json().get("features", []))
+            results.append(result)
+
+    return [{"suite": "seed", "size": size, "seconds": round(seed_seconds, 3)}] + results
+
+async def run(sizes, suites, iterations: int) -> list:
+    from database.db import database
+
+    results = []
+    for size in sizes:
+        if "ingestion" in suites:
+            results.append(await bench_ingestion(size))
+        if "routes" in suites:
+            results.extend(await bench_routes(size, iterations))
+    await database.engine.dispose()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ingestion and data API routes")
+    parser.add_argument("--sizes", default="10000", help="Comma-separated row counts per table")
+    parser.add_argument("--suites", default="ingestion,routes")
+    parser.add_argument("--database-url", help="Database to seed (default: temporary SQLite file)")
+    parser.add_argument("--iterations", type=int, default=10, help="Timed requests per route")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    # Settings are read at import time, so configure the environment first
+    workdir = tempfile.mkdtemp(prefix="tinsig-bench-")
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite+aiosqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ["DATABASE_REPLICA_URLS"] = ""
+    os.environ["SEARCH_INDEX_DIR"] = os.path.join(workdir, "vector_store")
+    # Per-batch ingestion logs would dominate the output
+    logging.disable(logging.INFO)
+
+    sizes = [int(n) for n in args.sizes.split(",") if n]
+    suites = [s.strip() for s in args.suites.split(",") if s.strip()]
+    results = asyncio.run(run(sizes, suites, args.iterations))
+
+    for r in results:
+        if r["suite"] == "routes":
+            print(f"{r['size']:>9}  {r['route']:<26}{r['p50_ms']:>10} ms p50{r['p95_ms']:>10} ms p95{r['bytes']:>12} B")
+        elif r["suite"] == "ingestion":
+            print(f"{r['size']:>9}  ingestion {r['rows']:>10} rows {r['seconds']:>8} s {r['rows_per_second']:>10} rows/s")
+        else:
+            print(f"{r['size']:>9}  seed {r['seconds']:>8} s")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"benchmark": "backend", "results": results}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
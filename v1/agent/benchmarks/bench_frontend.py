@@ -0,0 +1,101 @@
+"""
+Frontend benchmarks: time the Streamlit render_* functions headless.
+
+frontend/app.py is imported outside `streamlit run` (bare mode), so figures
+and maps are built and serialized but nothing is sent to a browser. Records
+are generated in the source-API format the frontend receives.
+
+Runs in its own process: frontend/ and backend/ both have a `utils` package.
+
+Usage:
+    python benchmarks/bench_frontend.py [--sizes 10000,100000] [--repeat 3]
+                                        [--folium-max 100000] [--output results.json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import warnings
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'frontend'))
+
+from mock_sources.generators import generate
+
+DATA_TYPES = ["illegal", "production", "iup"]
+
+def load_app():
+    """Import frontend/app.py with Streamlit's bare-mode warnings silenced"""
+    from streamlit import config, logger as streamlit_logger
+    config.set_option("logger.level", "error")
+    streamlit_logger.set_log_level("error")
+    warnings.filterwarnings("ignore")
+    import app
+    return app
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def bench_data_type(app, data_type: str, size: int, repeat: int, folium_max: int) -> list:
+    records = generate(data_type, size)
+    df = app.build_dataset_frame(records)
+    version = app.compute_fingerprint(records)
+
+    cases = {
+        "build_dataset_frame": lambda: app.build_dataset_frame(records),
+        "compute_fingerprint": lambda: app.compute_fingerprint(records),
+        "render_map_chart": lambda: app.render_map_chart(df, data_type, 1, version),
+        "render_pie_chart": lambda: app.render_statistical_chart(df, data_type, 1, "pie", version),
+        "render_bar_chart": lambda: app.render_statistical_chart(df, data_type, 1, "bar", version),
+        "render_line_chart": lambda: app.render_statistical_chart(df, data_type, 1, "line", version),
+        "render_statistical_chart": lambda: app.render_statistical_chart(df, data_type, 1, None, version),
+        "render_data_table": lambda: app.render_data_table(df, data_type, 1, version)
+    }
+
+    results = []
+    for name, func in cases.items():
+        seconds = best_of(func, repeat)
+        results.append({"suite": "frontend", "size": size, "data_type": data_type, "case": name,
+                        "ms": round(seconds * 1000, 3)})
+
+    # Folium path, which "auto" mode only uses below MAP_WEBGL_THRESHOLD points
+    if size <= folium_max:
+        mode = app.MAP_RENDER_MODE
+        app.MAP_RENDER_MODE = "folium"
+        try:
+            seconds = best_of(lambda: app.render_map_chart(df, data_type, 1, version), repeat)
+        finally:
+            app.MAP_RENDER_MODE = mode
+        results.append({"suite": "frontend", "size": size, "data_type": data_type, "case": "render_map_chart[folium]",
+                        "ms": round(seconds * 1000, 3)})
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark frontend rendering headless")
+    parser.add_argument("--sizes", default="10000", help="Comma-separated record counts")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--folium-max", type=int, default=100000, help="Largest size to render with folium")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    app = load_app()
+    results = []
+    for size in [int(n) for n in args.sizes.split(",") if n]:
+        for data_type in DATA_TYPES:
+            results.extend(bench_data_type(app, data_type, size, args.repeat, args.folium_max))
+
+    for r in results:
+        print(f"{r['size']:>9}  {r['data_type']:<12}{r['case']:<28}{r['ms']:>12} ms")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"benchmark": "frontend", "results": results}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
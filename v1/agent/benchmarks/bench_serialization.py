@@ -0,0 +1,134 @@
+"""
+Compare response serialization before and after the orjson switch.
+
+"before" reproduces the old path: datetimes converted with .isoformat() by
+hand, then FastAPI's jsonable_encoder and Starlette's stdlib json render.
+"after" renders the raw rows with ORJSONResponse.
+
+Usage:
+    python benchmarks/bench_serialization.py [--rows 1000,10000] [--features 10000,100000] [--output results.json]
+"""
+import argparse
+import json
+import random
+import sys
+import os
+import time
+from datetime import datetime, timedelta
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse
+from utils.responses import ORJSONResponse
+
+KABUPATEN = ["Bangka", "Bangka Barat", "Bangka Selatan", "Bangka Tengah", "Belitung", "Belitung Timur"]
+
+def make_production_rows(count: int):
+    base = datetime(2024, 1, 1)
+    return [
+        {
+            "id": f"00000000-0000-0000-0000-{i:012d}",
+            "tanggal_produksi": base + timedelta(hours=i),
+            "lokasi": f"DU {1500 + i % 100}",
+            "kabupaten": random.choice(KABUPATEN),
+            "kecamatan": f"Kecamatan {i % 40}",
+            "location_lat": -2.0 - random.random(),
+            "location_lng": 105.5 + random.random(),
+            "produksi_ton": round(random.uniform(5, 50), 2),
+            "kadar_sn": round(random.uniform(55, 75), 1),
+            "metode_tambang": "Marine Dredging",
+            "operator": "PT Timah Tbk",
+            "created_at": base + timedelta(minutes=i)
+        }
+        for i in range(count)
+    ]
+
+def make_map_features(count: int):
+    return [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [105.5 + random.random(), -2.0 - random.random()]},
+            "properties": {
+                "type": "illegal",
+                "id": f"00000000-0000-0000-0000-{i:012d}",
+                "kabupaten": random.choice(KABUPATEN),
+                "jenis_tambang": "TAMBANG KECIL ILEGAL",
+                "nama_pemilik": f"Pemilik {i}"
+            }
+        }
+        for i in range(count)
+    ]
+
+def render_before_list(rows):
+    data = [
+        {**row,
+         "tanggal_produksi": row["tanggal_produksi"].isoformat(),
+         "created_at": row["created_at"].isoformat()}
+        for row in rows
+    ]
+    content = {"data": data, "total": len(data), "filters": {"kabupaten": None, "limit": len(data)}}
+    return JSONResponse(jsonable_encoder(content)).body
+
+def render_after_list(rows):
+    content = {"data": rows, "total": len(rows), "filters": {"kabupaten": None, "limit": len(rows)}}
+    return ORJSONResponse(content).body
+
+def render_before_map(features):
+    return JSONResponse(jsonable_encoder({"type": "FeatureCollection", "features": features})).body
+
+def render_after_map(features):
+    return ORJSONResponse({"type": "FeatureCollection", "features": features}).body
+
+def best_of(func, payload, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(payload)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def run(row_counts, feature_counts, repeat: int):
+    results = []
+    cases = [("list", count, make_production_rows(count), render_before_list, render_after_list) for count in row_counts]
+    cases += [("map-data", count, make_map_features(count), render_before_map, render_after_map) for count in feature_counts]
+    
+    for name, count, payload, before, after in cases:
+        before_s = best_of(before, payload, repeat)
+        after_s = best_of(after, payload, repeat)
+        results.append({
+            "case": name,
+            "records": count,
+            "before_ms": round(before_s * 1000, 3),
+            "after_ms": round(after_s * 1000, 3),
+            "speedup": round(before_s / after_s, 2) if after_s else None,
+            "bytes": len(after(payload))
+        })
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON response serialization")
+    parser.add_argument("--rows", default="1000,10000", help="List response sizes")
+    parser.add_argument("--features", default="10000,100000", help="Map-data feature counts")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+    
+    random.seed(42)
+    results = run(
+        [int(n) for n in args.rows.split(",") if n],
+        [int(n) for n in args.features.split(",") if n],
+        args.repeat
+    )
+    
+    print(f"{'case':<10}{'records':>10}{'before ms':>12}{'after ms':>12}{'speedup':>10}{'bytes':>12}")
+    for r in results:
+        print(f"{r['case']:<10}{r['records']:>10}{r['before_ms']:>12}{r['after_ms']:>12}{r['speedup']:>10}{r['bytes']:>12}")
+    
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"benchmark": "serialization", "results": results}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
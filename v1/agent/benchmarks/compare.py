@@ -0,0 +1,63 @@
+"""
+Diff two run_benchmarks.py result files.
+
+Each result is matched on its suite, size and case (route, data type) and
+the timing is compared; changes beyond --threshold percent are flagged.
+Exits non-zero when any case regressed, so it can gate CI.
+
+Usage:
+    python benchmarks/compare.py results/before.json results/after.json [--threshold 10]
+"""
+import argparse
+import json
+import sys
+
+# Timing field compared for each suite
+METRICS = {"ingestion": "seconds", "seed": "seconds", "routes": "p50_ms", "frontend": "ms", "load": "p95_ms"}
+
+def result_key(result: dict) -> tuple:
+    return (result["suite"], result["size"], result.get("route") or result.get("data_type", ""), result.get("case", ""))
+
+def load(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Percent change reported as a regression")
+    args = parser.parse_args()
+
+    baseline, candidate = load(args.baseline), load(args.candidate)
+    before = {result_key(r): r for r in baseline["results"]}
+    regressions = 0
+
+    print(f"baseline {baseline.get('commit')}  candidate {candidate.get('commit')}")
+    for result in candidate["results"]:
+        key = result_key(result)
+        metric = METRICS.get(result["suite"])
+        old = before.get(key, {}).get(metric)
+        new = result.get(metric)
+        if old is None or new is None:
+            continue
+
+        change = (new - old) / old * 100 if old else 0.0
+        flag = ""
+        if change > args.threshold:
+            flag = "REGRESSION"
+            regressions += 1
+        elif change < -args.threshold:
+            flag = "improved"
+
+        label = " ".join(str(part) for part in key if part != "")
+        line = f"{label:<60}{old:>12.3f}{new:>12.3f}{change:>+9.1f}%  {flag}"
+        if "bytes" in result and before[key].get("bytes") != result["bytes"]:
+            line += f"  bytes {before[key].get('bytes')} -> {result['bytes']}"
+        print(line)
+
+    print(f"{regressions} regression(s) over {args.threshold:g}%")
+    sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
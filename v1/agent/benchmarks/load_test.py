@@ -0,0 +1,302 @@
+"""
+Load-test the dashboard API with weighted request mixes.
+
+Closed-loop workers replay a scenario (a weighted mix of dashboard requests
+with randomized filters) for a fixed duration at each concurrency level and
+report throughput, error count and p50/p95/p99 latency overall and per route.
+
+By default the app is started locally with uvicorn against a freshly seeded
+database (temporary SQLite unless --database-url is given). Passing several
+--workers values sweeps the uvicorn worker count and reports where adding
+workers stops increasing peak throughput. Use --url to target an already
+running server instead.
+
+Usage:
+    python benchmarks/load_test.py [--scenario dashboard] [--concurrency 1,8,32,64]
+                                   [--duration 15] [--workers 1,2,4,8] [--seed-size 10000]
+                                   [--database-url URL | --url http://host:8000] [--output results.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import quote
+
+import aiohttp
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from bench_backend import percentile
+from mock_sources.generators import BASE_DATE, KABUPATEN
+from run_benchmarks import RESULTS_DIR, git_commit
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')
+STARTUP_TIMEOUT = 60
+
+# Peak throughput gain below which extra workers count as saturated
+SATURATION_GAIN = 0.10
+
+def _kabupaten(rng: random.Random) -> str:
+    return quote(rng.choice(list(KABUPATEN)))
+
+def _date_window(rng: random.Random) -> str:
+    start = BASE_DATE + timedelta(days=rng.randrange(800))
+    end = start + timedelta(days=rng.choice([7, 30, 90, 180]))
+    return f"date_from={start:%Y-%m-%dT00:00:00}&date_to={end:%Y-%m-%dT00:00:00}"
+
+def _mobile_id(rng: random.Random, size: int) -> str:
+    return f"FIM{1700000000000 + rng.randrange(max(size, 1))}"
+
+def _overview_batch(rng: random.Random) -> dict:
+    """The frontend's overview batch, half of the time for one kabupaten"""
+    region = {"kabupaten": [rng.choice(list(KABUPATEN))]} if rng.random() < 0.5 else {}
+    return {"queries": [
+        {"type": "summary", "params": region},
+        {"type": "distribution", "params": {"entity": "illegal", "field": "jenis_tambang"}},
+        {"type": "production-trend", "params": region},
+        {"type": "recent-activity", "params": {"limit": 10, **region}}
+    ]}
+
+# name -> (weight, route, request builder(rng, seeded rows per table)); a builder
+# returns a path to GET or a (path, JSON body) pair to POST
+Scenario = List[Tuple[int, str, Callable[[random.Random, int], Union[str, Tuple[str, dict]]]]]
+
+SCENARIOS: Dict[str, Scenario] = {
+    # A dashboard page load: the overview batch, headline stats, filtered lists, map layers and popups
+    "dashboard": [
+        (15, "dashboard/batch", lambda rng, n: ("/api/v1/dashboard/batch", _overview_batch(rng))),
+        (20, "stats/summary", lambda rng, n: "/api/v1/data/stats/summary"),
+        (15, "illegal-mining?kabupaten", lambda rng, n: f"/api/v1/data/illegal-mining?kabupaten={_kabupaten(rng)}&limit=100"),
+        (10, "illegal-mining?fields", lambda rng, n: "/api/v1/data/illegal-mining?fields=id,kabupaten,jenis_tambang&limit=1000"),
+        (10, "production?date-range", lambda rng, n: f"/api/v1/data/production?{_date_window(rng)}&limit=1000"),
+        (10, "iup?status", lambda rng, n: "/api/v1/data/iup?status=Active&limit=100"),
+        (10, "map-data?kabupaten", lambda rng, n: f"/api/v1/data/map-data?layer=illegal&kabupaten={_kabupaten(rng)}"),
+        (5, "map-data", lambda rng, n: "/api/v1/data/map-data"),
+        (20, "detail", lambda rng, n: f"/api/v1/data/illegal/{_mobile_id(rng, n)}")
+    ],
+    # Map exploration: layers per region plus popup lookups
+    "map": [
+        (40, "map-data?kabupaten", lambda rng, n: f"/api/v1/data/map-data?layer=illegal&kabupaten={_kabupaten(rng)}"),
+        (10, "map-data", lambda rng, n: "/api/v1/data/map-data"),
+        (50, "detail", lambda rng, n: f"/api/v1/data/illegal/{_mobile_id(rng, n)}")
+    ],
+    # Aggregates only: headline stats, distributions, production trend and the activity feed
+    "aggregates": [
+        (30, "stats/summary", lambda rng, n: "/api/v1/data/stats/summary"),
+        (10, "stats/summary?kabupaten", lambda rng, n: f"/api/v1/data/stats/summary?kabupaten={_kabupaten(rng)}"),
+        (15, "stats/distribution", lambda rng, n: "/api/v1/data/stats/distribution?entity=illegal&field=jenis_tambang"),
+        (5, "stats/distribution?iup", lambda rng, n: "/api/v1/data/stats/distribution?entity=iup&field=status"),
+        (15, "stats/production-trend", lambda rng, n: "/api/v1/data/stats/production-trend"),
+        (10, "stats/production-trend?kabupaten", lambda rng, n: f"/api/v1/data/stats/production-trend?kabupaten={_kabupaten(rng)}&{_date_window(rng)}"),
+        (15, "activity/recent", lambda rng, n: "/api/v1/data/activity/recent?limit=20")
+    ]
+}
+
+def latency_summary(latencies: List[float]) -> Dict[str, float]:
+    if not latencies:
+        return {"p50_ms": None, "p95_ms": None, "p99_ms": None, "mean_ms": None}
+    return {
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "mean_ms": round(statistics.mean(latencies) * 1000, 3)
+    }
+
+async def run_load(base_url: str, scenario: Scenario, concurrency: int, duration: float,
+                   size: int, seed: int = 0, warmup: float = 0.0) -> dict:
+    """Run `concurrency` closed-loop workers for `duration` seconds"""
+    weights = [weight for weight, _, _ in scenario]
+    latencies: Dict[str, List[float]] = {route: [] for _, route, _ in scenario}
+    errors: Dict[str, int] = {}
+    measuring = asyncio.Event()
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    timeout = aiohttp.ClientTimeout(total=60)
+    async with aiohttp.ClientSession(base_url, connector=connector, timeout=timeout) as session:
+        async def worker(worker_id: int, deadline: float):
+            rng = random.Random(seed * 100003 + worker_id)
+            while time.perf_counter() < deadline:
+                _, route, build = rng.choices(scenario, weights)[0]
+                request = build(rng, size)
+                path, body = request if isinstance(request, tuple) else (request, None)
+                start = time.perf_counter()
+                try:
+                    async with session.request("GET" if body is None else "POST", path, json=body) as response:
+                        await response.read()
+                        failed = response.status >= 400
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    failed = True
+                elapsed = time.perf_counter() - start
+
+                if not measuring.is_set():
+                    continue
+                if failed:
+                    errors[route] = errors.get(route, 0) + 1
+                else:
+                    latencies[route].append(elapsed)
+
+        started = time.perf_counter()
+        deadline = started + warmup + duration
+        workers = [asyncio.create_task(worker(i, deadline)) for i in range(concurrency)]
+        await asyncio.sleep(warmup)
+        measuring.set()
+        measure_start = time.perf_counter()
+        await asyncio.gather(*workers)
+        elapsed = time.perf_counter() - measure_start
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    error_count = sum(errors.values())
+    return {
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 3),
+        "requests": len(all_latencies),
+        "errors": error_count,
+        "rps": round(len(all_latencies) / elapsed, 2) if elapsed else None,
+        **latency_summary(all_latencies),
+        "routes": {
+            route: {"requests": len(values), "errors": errors.get(route, 0), **latency_summary(values)}
+            for route, values in latencies.items()
+        }
+    }
+
+class LocalServer:
+    """uvicorn serving main:app in a subprocess"""
+
+    def __init__(self, workers: int, database_url: str):
+        self.workers = workers
+        self.database_url = database_url
+        self.process: Optional[subprocess.Popen] = None
+        self.url: Optional[str] = None
+
+    def start(self) -> str:
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+
+        env = {**os.environ, "DATABASE_URL": self.database_url, "DATABASE_REPLICA_URLS": "", "PROFILING_ENABLED": "false"}
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+             "--workers", str(self.workers), "--log-level", "warning", "--no-access-log"],
+            cwd=BACKEND_DIR,
+            env=env,
+            stdout=subprocess.DEVNULL
+        )
+        self.url = f"http://127.0.0.1:{port}"
+        asyncio.run(self._wait_ready())
+        return self.url
+
+    async def _wait_ready(self) -> None:
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        async with aiohttp.ClientSession() as session:
+            while time.monotonic() < deadline:
+                if self.process.poll() is not None:
+                    raise RuntimeError(f"uvicorn exited with status {self.process.returncode}")
+                try:
+                    async with session.get(f"{self.url}/health/") as response:
+                        if response.status == 200:
+                            return
+                except aiohttp.ClientError:
+                    pass
+                await asyncio.sleep(0.25)
+        raise RuntimeError(f"uvicorn did not become ready within {STARTUP_TIMEOUT} s")
+
+    def stop(self) -> None:
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+def saturation(results: List[dict]) -> dict:
+    """Peak throughput per worker count and the count after which more workers stop helping"""
+    peaks = {}
+    for result in results:
+        best = peaks.get(result["workers"])
+        if best is None or (result["rps"] or 0) > best["rps"]:
+            peaks[result["workers"]] = {"workers": result["workers"], "rps": result["rps"] or 0, "concurrency": result["concurrency"]}
+
+    ordered = [peaks[workers] for workers in sorted(peaks)]
+    saturated_at = ordered[-1]["workers"] if ordered else None
+    for previous, current in zip(ordered, ordered[1:]):
+        if previous["rps"] and (current["rps"] - previous["rps"]) / previous["rps"] < SATURATION_GAIN:
+            saturated_at = previous["workers"]
+            break
+    return {"peaks": ordered, "saturated_at_workers": saturated_at}
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the dashboard API")
+    parser.add_argument("--scenario", default="dashboard", choices=list(SCENARIOS))
+    parser.add_argument("--concurrency", default="1,8,32,64", help="Comma-separated concurrency levels")
+    parser.add_argument("--duration", type=float, default=15.0, help="Measured seconds per level")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Unmeasured seconds before each level")
+    parser.add_argument("--workers", default="1", help="Comma-separated uvicorn worker counts to sweep")
+    parser.add_argument("--seed-size", type=int, default=10000, help="Rows per table to seed (0 keeps existing data)")
+    parser.add_argument("--database-url", help="Database for the local server (default: temporary SQLite file)")
+    parser.add_argument("--url", help="Target a running server instead of starting one")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the request mix")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/load_<timestamp>_<commit>.json)")
+    args = parser.parse_args()
+
+    scenario = SCENARIOS[args.scenario]
+    levels = [int(n) for n in args.concurrency.split(",") if n]
+    worker_counts = [int(n) for n in args.workers.split(",") if n]
+    database_url = args.database_url or f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(prefix='tinsig-load-'), 'load.db')}"
+    started_at = datetime.now()
+
+    if not args.url and args.seed_size:
+        subprocess.run([
+            sys.executable, os.path.join(os.path.dirname(__file__), "seed_database.py"),
+            "--size", str(args.seed_size), "--database-url", database_url
+        ], check=True)
+
+    results = []
+    for workers in ([None] if args.url else worker_counts):
+        server = None if args.url else LocalServer(workers, database_url)
+        base_url = args.url or server.start()
+        try:
+            for concurrency in levels:
+                result = asyncio.run(run_load(base_url, scenario, concurrency, args.duration,
+                                              args.seed_size, args.seed, args.warmup))
+                label = f"{args.scenario} w{workers} c{concurrency}" if workers else f"{args.scenario} c{concurrency}"
+                results.append({"suite": "load", "size": args.seed_size, "case": label,
+                                "scenario": args.scenario, "workers": workers, **result})
+                print(f"{label:<28}{result['rps']:>10} req/s{result['p50_ms'] or 0:>10} p50{result['p95_ms'] or 0:>10} p95"
+                      f"{result['p99_ms'] or 0:>10} p99{result['errors']:>8} errors")
+        finally:
+            if server:
+                server.stop()
+
+    summary = saturation(results) if not args.url else None
+    if summary and len(worker_counts) > 1:
+        print(f"Peak throughput stops improving by {SATURATION_GAIN:.0%} beyond {summary['saturated_at_workers']} worker(s)")
+
+    commit = git_commit()
+    output = args.output or os.path.join(RESULTS_DIR, f"load_{started_at:%Y%m%dT%H%M%S}_{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "commit": commit,
+            "started_at": started_at.isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "target": args.url or database_url.split("://")[0],
+            "scenario": args.scenario,
+            "saturation": summary,
+            "results": results
+        }, f, indent=2)
+    print(f"Results written to {output}")
+
+if __name__ == "__main__":
+    main()
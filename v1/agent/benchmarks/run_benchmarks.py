@@ -0,0 +1,81 @@
+"""
+Run the benchmark suites and write one JSON result file per run.
+
+Each suite runs in its own subprocess (the backend and frontend cannot share
+an interpreter). The result file records the git commit so two runs can be
+diffed with compare.py.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--sizes 10000,100000,1000000]
+                                        [--suites ingestion,routes,frontend]
+                                        [--database-url URL] [--output results/run.json]
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def run_script(script: str, arguments: list) -> list:
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
+        output = f.name
+    try:
+        subprocess.run([sys.executable, os.path.join(BENCH_DIR, script), *arguments, "--output", output], check=True)
+        with open(output) as f:
+            return json.load(f)["results"]
+    finally:
+        os.remove(output)
+
+def main():
+    parser = argparse.ArgumentParser(description="Run TINSIG benchmarks")
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="Comma-separated row counts")
+    parser.add_argument("--suites", default="ingestion,routes,frontend")
+    parser.add_argument("--database-url", help="Database for the routes suite (default: temporary SQLite file)")
+    parser.add_argument("--iterations", type=int, default=10, help="Timed requests per route")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeats per frontend render")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/<timestamp>_<commit>.json)")
+    args = parser.parse_args()
+
+    suites = [s.strip() for s in args.suites.split(",") if s.strip()]
+    commit = git_commit()
+    started_at = datetime.now()
+    results = []
+
+    backend_suites = [s for s in suites if s in ("ingestion", "routes")]
+    if backend_suites:
+        arguments = ["--sizes", args.sizes, "--suites", ",".join(backend_suites), "--iterations", str(args.iterations)]
+        if args.database_url:
+            arguments += ["--database-url", args.database_url]
+        results.extend(run_script("bench_backend.py", arguments))
+
+    if "frontend" in suites:
+        results.extend(run_script("bench_frontend.py", ["--sizes", args.sizes, "--repeat", str(args.repeat)]))
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{started_at:%Y%m%dT%H%M%S}_{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "commit": commit,
+            "started_at": started_at.isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sizes": [int(n) for n in args.sizes.split(",") if n],
+            "suites": suites,
+            "results": results
+        }, f, indent=2)
+    print(f"Results written to {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Seed a database with synthetic IllegalMining, Production and IUP rows.
+
+Tables are dropped and re-created first. DATABASE_URL must be set before
+the backend modules are imported, so other scripts either call
+seed_database() after configuring the environment or run this file.
+
+Usage:
+    python benchmarks/seed_database.py --size 100000 --database-url URL
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from mock_sources.generators import generate, to_model_rows
+
+SEED_CHUNK_SIZE = 10000
+
+async def seed_database(size: int) -> float:
+    """Re-create the tables with `size` rows each; returns the elapsed seconds"""
+    from database.db import database
+    from database.models import IllegalMining, Production, IUP
+    from database.partitioning import PARTITIONED_TABLES, ensure_partitions_for
+    from database.schema import reset_schema
+    from utils.hashing import content_hash, hashed_columns
+
+    start = time.perf_counter()
+    await reset_schema(database.engine)
+
+    for kind, model in (("illegal", IllegalMining), ("production", Production), ("iup", IUP)):
+        rows = to_model_rows(kind, generate(kind, size))
+        columns = hashed_columns(model)
+        for row in rows:
+            row["content_hash"] = content_hash(row, columns)
+        if model.__tablename__ in PARTITIONED_TABLES:
+            column = PARTITIONED_TABLES[model.__tablename__]
+            await ensure_partitions_for(database.engine, model.__tablename__, (row[column] for row in rows))
+        for offset in range(0, len(rows), SEED_CHUNK_SIZE):
+            async with database.engine.begin() as conn:
+                await conn.execute(model.__table__.insert(), rows[offset:offset + SEED_CHUNK_SIZE])
+    return time.perf_counter() - start
+
+async def _seed(size: int) -> float:
+    from database.db import database
+
+    try:
+        return await seed_database(size)
+    finally:
+        await database.engine.dispose()
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed the database with synthetic data")
+    parser.add_argument("--size", type=int, default=10000, help="Rows per table")
+    parser.add_argument("--database-url", required=True)
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ["DATABASE_REPLICA_URLS"] = ""
+    logging.disable(logging.INFO)
+
+    seconds = asyncio.run(_seed(args.size))
+    print(f"Seeded {args.size:,} rows per table in {seconds:.1f} s")
+
+if __name__ == "__main__":
+    main()
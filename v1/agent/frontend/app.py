@@ -3,11 +3,18 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import folium
+from folium.plugins import FastMarkerCluster
+import pydeck as pdk
 from streamlit_folium import st_folium
 from typing import Dict, List, Any
-import re
+import json
+import os
 import asyncio
 from services.api_client import TinsigAPIClient
+from services.change_listener import ChangeListener
+from utils.command_parser import DEFAULT_REGIONS, CommandIntent, CommandParser
+from utils.datasets import build_dataset_frame, compute_fingerprint, filter_by_date
+from utils.downsampling import aggregate_categories, downsample_series
 
 # Page config
 st.set_page_config(
@@ -24,6 +31,21 @@ if "charts" not in st.session_state:
 if "chart_counter" not in st.session_state:
     st.session_state.chart_counter = 0
 
+# Typed DataFrames keyed by dataset fingerprint, shared by all charts
+if "datasets" not in st.session_state:
+    st.session_state.datasets = {}
+
+# Live updates: charts refresh when the backend pushes a change for their data
+LIVE_UPDATES_ENABLED = os.getenv("LIVE_UPDATES_ENABLED", "true").lower() == "true"
+LIVE_UPDATE_CHECK_SECONDS = float(os.getenv("LIVE_UPDATE_CHECK_SECONDS", "2"))
+
+if "live_updates" not in st.session_state:
+    st.session_state.live_updates = LIVE_UPDATES_ENABLED
+
+# Last change-feed generation this session's charts reflect
+if "seen_generation" not in st.session_state:
+    st.session_state.seen_generation = None
+
 # Initialize API client
 @st.cache_resource
 def get_api_client():
@@ -31,13 +53,109 @@ def get_api_client():
 
 api_client = get_api_client()
 
+# One change-feed subscription shared by every session of this Streamlit process
+@st.cache_resource
+def get_change_listener() -> ChangeListener:
+    return ChangeListener(api_client).start()
+
+# Command parser compiled over the region gazetteer; rebuilt when the cache expires
+@st.cache_resource(ttl=600)
+def get_command_parser() -> CommandParser:
+    regions = {}
+    try:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        regions = loop.run_until_complete(api_client.get_regions())
+        loop.close()
+    except Exception:
+        pass
+    return CommandParser({**DEFAULT_REGIONS, **regions})
+
+# Map rendering: "auto" switches from folium to WebGL (pydeck) above the point threshold
+MAP_RENDER_MODE = os.getenv("MAP_RENDER_MODE", "auto")  # auto | folium | webgl
+MAP_WEBGL_THRESHOLD = int(os.getenv("MAP_WEBGL_THRESHOLD", "1000"))
+MAP_HEXAGON_THRESHOLD = int(os.getenv("MAP_HEXAGON_THRESHOLD", "50000"))
+
+# Chart point budget: time series are LTTB-downsampled and categorical charts
+# pre-aggregated so figure size stays bounded regardless of data size
+CHART_POINT_BUDGET = int(os.getenv("CHART_POINT_BUDGET", "2000"))
+CHART_MAX_CATEGORIES = int(os.getenv("CHART_MAX_CATEGORIES", "30"))
+
+# Date column and value column (None = record count) for trend charts
+TREND_COLUMNS = {
+    "illegal": ("tanggal_survey", None),
+    "production": ("tanggal_produksi", "produksi_ton"),
+    "iup": ("tgl_sk", None)
+}
+
+# Detail fields shown in map popups and tooltips: (label, column, suffix)
+MAP_DETAIL_FIELDS = {
+    "illegal": [("Type", "jenis_tambang", ""), ("Owner", "nama_pemilik", ""), ("Workers", "jumlah_pekerja", "")],
+    "production": [("Production", "produksi_ton", " tons"), ("Operator", "operator", ""), ("Date", "tanggal_produksi", "")],
+    "iup": [("Name", "name", ""), ("Area", "luas", " ha"), ("Status", "status", ""), ("Region", "daerah", "")]
+}
+
+# Column used to look up a map point's details from the backend, per data type.
+# Rows fetched from the source APIs carry the source id as "id" (used when the column is absent).
+MAP_RECORD_KEYS = {"illegal": "mobile_id", "production": "source_id", "iup": "du"}
+
+# Clustered folium markers: popups are fetched from the backend on first open
+# instead of being rendered into the page for every point
+MAP_CLUSTER_CALLBACK = """(function () {
+    var detailUrl = %(detail_url)s;
+    var fields = %(fields)s;
+    var color = %(color)s;
+    function esc(value) {
+        var span = document.createElement("span");
+        span.textContent = value == null ? "N/A" : value;
+        return span.innerHTML;
+    }
+    return function (row) {
+        var marker = L.marker(new L.LatLng(row[0], row[1]), {
+            icon: L.AwesomeMarkers.icon({markerColor: color})
+        });
+        marker.bindPopup("Loading...");
+        marker.on("popupopen", function (e) {
+            if (marker._detailLoaded) { return; }
+            fetch(detailUrl + encodeURIComponent(row[2]))
+                .then(function (response) {
+                    if (!response.ok) { throw new Error(response.status); }
+                    return response.json();
+                })
+                .then(function (record) {
+                    var html = "<b>Location:</b> " + esc(record.kabupaten || "Unknown") + "<br>";
+                    fields.forEach(function (field) {
+                        var value = record[field[1]];
+                        html += "<b>" + field[0] + ":</b> " + esc(value) + (value == null ? "" : field[2]) + "<br>";
+                    });
+                    e.popup.setContent(html);
+                    marker._detailLoaded = true;
+                })
+                .catch(function () { e.popup.setContent("Details unavailable"); });
+        });
+        return marker;
+    };
+})()"""
+
 # Data fetching functions
-async def fetch_data_async(data_type: str, location_filter: str = None) -> List[Dict]:
+def region_filters(data_type: str, region: Dict = None) -> Dict:
+    """Source API filters for a region resolved by the command parser"""
+    if not region:
+        return {}
+    if data_type == "iup":
+        # IUP records only carry a free-text "daerah" with both names in it
+        return {"daerah": region["name"]}
+    filters = {}
+    if region["kabupaten"]:
+        filters["kabupaten"] = region["kabupaten"]
+    if region["level"] == "kecamatan":
+        filters["kecamatan"] = region["name"]
+    return filters
+
+async def fetch_data_async(data_type: str, filters: Dict = None) -> List[Dict]:
     """Fetch real data from API sources"""
     try:
-        filters = {}
-        if location_filter:
-            filters["kabupaten"] = location_filter
+        filters = filters or {}
             
         if data_type == "illegal":
             data = await api_client.get_illegal_mining_data(filters)
@@ -53,13 +171,13 @@ async def fetch_data_async(data_type: str, location_filter: str = None) -> List[
         st.error(f"Error fetching {data_type} data: {str(e)}")
         return []
 
-def fetch_data(data_type: str, location_filter: str = None) -> List[Dict]:
+def fetch_data(data_type: str, filters: Dict = None) -> List[Dict]:
     """Synchronous wrapper for async data fetching"""
     try:
         # Create new event loop for this call
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
-        data = loop.run_until_complete(fetch_data_async(data_type, location_filter))
+        data = loop.run_until_complete(fetch_data_async(data_type, filters))
         loop.close()
         return data
     except Exception as e:
@@ -69,6 +187,68 @@ def fetch_data(data_type: str, location_filter: str = None) -> List[Dict]:
         st.info("💡 **Possible Solutions:**\n- Check if backend services are running\n- Verify database connection\n- Contact system administrator")
         return []
 
+# Dashboard overview: KPIs, mining types, production trend and recent activity
+# come from one batch request instead of one round-trip per dataset
+OVERVIEW_QUERIES = [
+    {"type": "summary"},
+    {"type": "distribution", "params": {"entity": "illegal", "field": "jenis_tambang"}},
+    {"type": "production-trend"},
+    {"type": "recent-activity", "params": {"limit": 10}}
+]
+
+@st.cache_data(ttl=60, show_spinner=False)
+def load_overview() -> Dict[str, Any]:
+    """Fetch every overview dataset in one batch request; cleared when live updates report a change"""
+    try:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        overview = loop.run_until_complete(api_client.get_dashboard_batch(OVERVIEW_QUERIES))
+        loop.close()
+        return overview
+    except Exception:
+        return {}
+
+def render_overview():
+    """Render the dashboard overview from the batched datasets"""
+    overview = load_overview()
+    if not overview:
+        st.warning("Dashboard overview unavailable - check that the backend is running")
+        return
+    
+    summary = overview.get("summary") or {}
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Illegal Mining Sites", f"{summary.get('illegal_mining_count', 0):,}")
+    with col2:
+        st.metric("Total Production", f"{summary.get('total_production_tons', 0.0):,.1f} t")
+    with col3:
+        st.metric("Active IUPs", f"{summary.get('active_iup_count', 0):,}")
+    with col4:
+        st.metric("Production Records", f"{summary.get('production_record_count', 0):,}")
+    
+    col1, col2 = st.columns(2)
+    distribution = (overview.get("distribution") or {}).get("distribution", {})
+    if distribution:
+        with col1:
+            fig = px.pie(values=list(distribution.values()), names=list(distribution),
+                        title="Illegal Mining by Type")
+            st.plotly_chart(fig, use_container_width=True, key="overview_distribution")
+    trend = (overview.get("production-trend") or {}).get("trend", [])
+    if trend:
+        with col2:
+            fig = px.line(pd.DataFrame(trend), x="date", y="production",
+                         title="Monthly Production (tons)")
+            st.plotly_chart(fig, use_container_width=True, key="overview_trend")
+    
+    activities = (overview.get("recent-activity") or {}).get("activities", [])
+    if activities:
+        with st.expander("Recent Activity"):
+            st.dataframe(
+                pd.DataFrame(activities)[["timestamp", "type", "location", "details"]],
+                use_container_width=True,
+                hide_index=True
+            )
+
 # Custom CSS
 st.markdown("""
 <style>
@@ -101,20 +281,20 @@ page = st.sidebar.selectbox("Navigate to:", ["Show Data", "Settings"])
 
 def process_chart_command(command: str) -> str:
     """Process user commands to add/remove/modify charts"""
-    command_lower = command.lower()
-    
     try:
+        intent = get_command_parser().parse(command)
+        
         # Add chart commands
-        if any(word in command_lower for word in ["add", "create", "show", "display"]):
-            return handle_add_chart_command(command)
+        if intent.action == "add":
+            return handle_add_chart_command(intent)
         
         # Remove chart commands
-        elif any(word in command_lower for word in ["remove", "delete", "clear"]):
-            return handle_remove_chart_command(command)
+        elif intent.action == "remove":
+            return handle_remove_chart_command(intent)
         
         # Modify chart commands  
-        elif any(word in command_lower for word in ["change", "modify", "update", "replace"]):
-            return handle_modify_chart_command(command)
+        elif intent.action == "modify":
+            return handle_modify_chart_command(intent)
         
         else:
             return "I didn't understand that command. Try commands like:\n- Add chart view for illegal mining\n- Remove all charts\n- Change second chart to map view"
@@ -122,23 +302,21 @@ def process_chart_command(command: str) -> str:
     except Exception as e:
         return f"Error processing command: {str(e)}"
 
-def handle_add_chart_command(command: str) -> str:
+def handle_add_chart_command(intent: CommandIntent) -> str:
     """Handle commands to add new charts - supports multiple charts in one command"""
-    command_lower = command.lower()
-    
-    # Determine data type
-    data_type = "illegal"  # default
-    if "production" in command_lower:
-        data_type = "production"
-    elif "iup" in command_lower:
-        data_type = "iup"
+    data_type = intent.data_type or "illegal"  # default
     
-    # Extract location filter
-    location_filter = extract_location(command)
+    # Location and date range filters
+    region = intent.region
+    location_filter = region["name"] if region else ""
+    date_range = ""
+    if intent.date_from:
+        date_range = f"{intent.date_from} to {intent.date_to}"
     
     # Get real data from database
     with st.spinner(f"Fetching {data_type} data from database..."):
-        data = fetch_data(data_type, location_filter)
+        data = fetch_data(data_type, region_filters(data_type, region))
+        data = filter_by_date(data, TREND_COLUMNS[data_type][0], intent.date_from, intent.date_to)
     
     if not data:
         # Show modal-style error message and return special code
@@ -147,38 +325,26 @@ def handle_add_chart_command(command: str) -> str:
         **No {data_type} data found with the specified criteria:**
         - Data Type: {data_type}
         - Location Filter: {location_filter if location_filter else 'None'}
+        - Date Range: {date_range if date_range else 'None'}
         
         **Possible reasons:**
         - Database is empty for this data type
-        - Location filter is too restrictive  
+        - Location or date filter is too restrictive  
         - Backend services are not running
         - Data sync from PHP sources hasn't completed yet
         """)
-        st.info("💡 **Try:** Remove location filters or check if data exists in the database")
+        st.info("💡 **Try:** Remove location or date filters or check if data exists in the database")
         return "MODAL_ALREADY_SHOWN"  # Special return code to prevent duplicate modals
     
-    # Detect multiple chart types requested
-    charts_to_create = []
-    
-    # Check for specific chart types
-    if "pie chart" in command_lower or "pie" in command_lower:
-        charts_to_create.append(("chart", "pie"))
-    
-    if "bar chart" in command_lower or "bar" in command_lower:
-        charts_to_create.append(("chart", "bar"))
+    # Fingerprint the dataset once so renders can build stable widget keys cheaply
+    data_version = compute_fingerprint(data)
     
-    if "table" in command_lower:
-        charts_to_create.append(("table", None))
+    # Build the typed DataFrame once; every chart for this dataset reuses it
+    if data_version not in st.session_state.datasets:
+        st.session_state.datasets[data_version] = build_dataset_frame(data)
     
-    if "map" in command_lower or "location" in command_lower or "geographic" in command_lower:
-        charts_to_create.append(("map", None))
-    
-    # If no specific types found, default behavior
-    if not charts_to_create:
-        if any(word in command_lower for word in ["chart", "graph", "plot"]):
-            charts_to_create.append(("chart", None))
-        else:
-            charts_to_create.append(("table", None))
+    # Chart types requested, in command order; a table when none was named
+    charts_to_create = list(intent.charts) or [("table", None)]
     
     # Create all requested charts
     created_charts = []
@@ -197,10 +363,15 @@ def handle_add_chart_command(command: str) -> str:
             "type": chart_type,
             "data_type": data_type,
             "specific_chart": specific_chart,
-            "data": data,
+            "data_version": data_version,
+            "record_count": len(data),
             "title": title,
             "filters": {
-                "location": location_filter
+                "location": location_filter,
+                "kabupaten": region["kabupaten"] if region else None,
+                "source": region_filters(data_type, region),
+                "date_from": intent.date_from,
+                "date_to": intent.date_to
             }
         }
         
@@ -212,20 +383,26 @@ def handle_add_chart_command(command: str) -> str:
     else:
         return f"Added {created_charts[0]} for {data_type} data ({len(data)} records)"
 
-def handle_remove_chart_command(command: str) -> str:
+def resolve_chart_number(chart_ref: int) -> int:
+    """1-based chart position for a parsed reference; -1 ("last") maps to the last chart"""
+    if chart_ref == -1:
+        return len(st.session_state.charts)
+    return chart_ref
+
+def handle_remove_chart_command(intent: CommandIntent) -> str:
     """Handle commands to remove charts"""
-    command_lower = command.lower()
-    
-    if "all" in command_lower:
+    if intent.all:
         count = len(st.session_state.charts)
         st.session_state.charts = []
+        prune_datasets()
         return f"Removed all {count} charts."
     
-    # Extract chart number/position
-    chart_num = extract_chart_number(command)
+    # Chart number/position
+    chart_num = resolve_chart_number(intent.chart_ref)
     if chart_num:
         if 1 <= chart_num <= len(st.session_state.charts):
             removed_chart = st.session_state.charts.pop(chart_num - 1)
+            prune_datasets()
             return f"Removed chart #{chart_num}: {removed_chart['title']}"
         else:
             return f"Chart #{chart_num} not found. Available charts: 1-{len(st.session_state.charts)}"
@@ -233,80 +410,124 @@ def handle_remove_chart_command(command: str) -> str:
     # Remove last chart if no specific number
     if st.session_state.charts:
         removed_chart = st.session_state.charts.pop()
+        prune_datasets()
         return f"Removed last chart: {removed_chart['title']}"
     else:
         return "No charts to remove."
 
-def handle_modify_chart_command(command: str) -> str:
-    """Handle commands to modify existing charts"""
-    command_lower = command.lower()
+def prune_datasets():
+    """Drop cached DataFrames that no remaining chart references"""
+    in_use = {chart.get("data_version") for chart in st.session_state.charts}
+    for key in list(st.session_state.datasets):
+        if key not in in_use:
+            del st.session_state.datasets[key]
+
+def chart_affected(chart_config: Dict, changes: Dict[str, Any]) -> bool:
+    """Whether a pushed change (table -> kabupaten, None = everywhere) can alter this chart's data"""
+    if chart_config["data_type"] not in changes:
+        return False
+    names = changes[chart_config["data_type"]]
+    region = chart_config["filters"].get("kabupaten") or chart_config["filters"].get("location")
+    if names is None or not region:
+        return True
+    # IUP changes carry free-text daerah names that contain the kabupaten
+    return any(region.lower() in name.lower() for name in names)
+
+def refresh_changed_charts(changes: Dict[str, Any]) -> int:
+    """Refetch the data of affected charts; returns how many charts got new data"""
+    refreshed = 0
+    fetched = {}
+    for chart_config in st.session_state.charts:
+        if not chart_affected(chart_config, changes):
+            continue
+        
+        # Charts created by the same command share one fetch
+        filters = chart_config["filters"]
+        key = (chart_config["data_type"], json.dumps(filters, sort_keys=True, default=str))
+        if key not in fetched:
+            data = fetch_data(chart_config["data_type"], filters.get("source"))
+            data = filter_by_date(data, TREND_COLUMNS[chart_config["data_type"]][0], filters.get("date_from"), filters.get("date_to"))
+            if not data:
+                fetched[key] = None  # Keep showing the current data rather than an empty chart
+            else:
+                data_version = compute_fingerprint(data)
+                if data_version not in st.session_state.datasets:
+                    st.session_state.datasets[data_version] = build_dataset_frame(data)
+                fetched[key] = (data_version, len(data))
+        
+        if fetched[key] and fetched[key][0] != chart_config.get("data_version"):
+            chart_config["data_version"], chart_config["record_count"] = fetched[key]
+            refreshed += 1
+    
+    if refreshed:
+        prune_datasets()
+    return refreshed
+
+@st.fragment(run_every=LIVE_UPDATE_CHECK_SECONDS)
+def watch_data_changes():
+    """Check the shared listener for pushed changes (in memory, no API call) and refresh the overview and affected charts"""
+    listener = get_change_listener()
+    generation = listener.generation
+    if listener.connected:
+        st.caption(f"🟢 Live updates on · data generation {generation}")
+    else:
+        st.caption("⚪ Live updates reconnecting...")
+    
+    if st.session_state.seen_generation is None:
+        st.session_state.seen_generation = generation
+        return
+    
+    changes = listener.changes_since(st.session_state.seen_generation)
+    st.session_state.seen_generation = generation
+    if not changes:
+        return
     
-    # Extract chart number
-    chart_num = extract_chart_number(command)
-    if not chart_num or chart_num > len(st.session_state.charts):
+    # The overview covers every table, so any change makes it stale
+    load_overview.clear()
+    refresh_changed_charts(changes)
+    st.rerun()
+
+def handle_modify_chart_command(intent: CommandIntent) -> str:
+    """Handle commands to modify existing charts"""
+    # Chart number
+    chart_num = resolve_chart_number(intent.chart_ref)
+    if not 1 <= chart_num <= len(st.session_state.charts):
         return f"Please specify a valid chart number (1-{len(st.session_state.charts)})"
     
     chart_index = chart_num - 1
     current_chart = st.session_state.charts[chart_index]
     
-    # Determine new chart type
-    new_type = current_chart["type"]
-    if any(word in command_lower for word in ["map", "location", "geographic"]):
-        new_type = "map"
-    elif any(word in command_lower for word in ["chart", "graph", "plot"]):
-        new_type = "chart"
-    elif "table" in command_lower:
-        new_type = "table"
+    # New chart type: the last one named ("change pie chart 2 to a map" -> map)
+    new_type, specific_chart = current_chart["type"], current_chart.get("specific_chart")
+    if intent.charts:
+        new_type, specific_chart = intent.charts[-1]
     
     # Update chart configuration
     st.session_state.charts[chart_index]["type"] = new_type
-    st.session_state.charts[chart_index]["title"] = f"{current_chart['data_type'].title()} {new_type.title()} #{chart_num}"
-    
-    return f"Changed chart #{chart_num} to {new_type} view"
-
-def extract_location(command: str) -> str:
-    """Extract location from command text"""
-    command_lower = command.lower()
-    if "jakarta" in command_lower:
-        return "Jakarta"
-    elif "bangka" in command_lower:
-        return "Bangka"
-    elif "selatan" in command_lower:
-        return "Selatan"
-    return ""
-
-def extract_chart_number(command: str) -> int:
-    """Extract chart number from command text"""
-    if "first" in command.lower() or "1st" in command.lower():
-        return 1
-    elif "second" in command.lower() or "2nd" in command.lower():
-        return 2
-    elif "third" in command.lower() or "3rd" in command.lower():
-        return 3
-    
-    # Look for numbers
-    numbers = re.findall(r'\d+', command)
-    if numbers:
-        return int(numbers[0])
-    
-    return 0
+    st.session_state.charts[chart_index]["specific_chart"] = specific_chart
+    if specific_chart:
+        st.session_state.charts[chart_index]["title"] = f"{current_chart['data_type'].title()} {specific_chart.title()} Chart #{chart_num}"
+    else:
+        st.session_state.charts[chart_index]["title"] = f"{current_chart['data_type'].title()} {new_type.title()} #{chart_num}"
+    
+    return f"Changed chart #{chart_num} to {specific_chart or new_type} view"
 
 def render_chart(chart_config: Dict):
     """Render a chart based on its configuration"""
-    data = chart_config["data"]
     chart_type = chart_config["type"]
     data_type = chart_config["data_type"]
     chart_id = chart_config.get("id", 0)
     specific_chart = chart_config.get("specific_chart")
+    data_version = chart_config.get("data_version", "")
     
-    if not data:
+    # Reuse the DataFrame built when the dataset was fetched
+    df = st.session_state.datasets.get(data_version)
+    if df is None or df.empty:
         st.warning("No data available for this chart.")
         return
     
-    df = pd.DataFrame(data)
-    
     # Generate description based on chart type and data
-    description = generate_chart_description(data_type, chart_type, specific_chart, len(data))
+    description = generate_chart_description(data_type, chart_type, specific_chart, chart_config.get("record_count", len(df)))
     
     # Create a styled container using Streamlit's container and CSS
     with st.container():
@@ -323,11 +544,11 @@ def render_chart(chart_config: Dict):
         
         # Render the chart content within the styled container
         if chart_type == "map":
-            render_map_chart(df, data_type, chart_id)
+            render_map_chart(df, data_type, chart_id, data_version)
         elif chart_type == "chart":
-            render_statistical_chart(df, data_type, chart_id, specific_chart)
+            render_statistical_chart(df, data_type, chart_id, specific_chart, data_version)
         else:  # table
-            render_data_table(df, data_type, chart_id)
+            render_data_table(df, data_type, chart_id, data_version)
         
         # Close the styled div
         st.markdown("</div>", unsafe_allow_html=True)
@@ -360,6 +581,9 @@ def generate_chart_description(data_type: str, chart_type: str, specific_chart:
         elif specific_chart == "bar":
             return f"Regional distribution of {base_desc} comparing quantities across different areas ({record_count} records)"
         
+        elif specific_chart == "line":
+            return f"Daily trend of {base_desc} over time ({record_count} records)"
+        
         else:  # General chart
             if data_type == "illegal":
                 return f"Analysis of illegal mining patterns showing both type distribution and regional breakdown ({record_count} violations)"
@@ -374,7 +598,7 @@ def generate_chart_description(data_type: str, chart_type: str, specific_chart:
     # Fallback description
     return f"Visualization of {base_desc} ({record_count} records)"
 
-def render_map_chart(df: pd.DataFrame, data_type: str, chart_id: int = None):
+def render_map_chart(df: pd.DataFrame, data_type: str, chart_id: int = None, data_version: str = ""):
     """Render map visualization"""
     # Handle different coordinate column names
     lat_col = 'location_lat' if 'location_lat' in df.columns else 'latitude'
@@ -391,7 +615,14 @@ def render_map_chart(df: pd.DataFrame, data_type: str, chart_id: int = None):
         return
     
     # Generate unique key for this chart
-    unique_key = f"{data_type}_{chart_id}_{hash(str(df.to_dict()))}"
+    unique_key = f"{data_type}_{chart_id}_{data_version}"
+    
+    use_webgl = MAP_RENDER_MODE == "webgl" or (
+        MAP_RENDER_MODE == "auto" and len(df_clean) > MAP_WEBGL_THRESHOLD
+    )
+    if use_webgl:
+        render_webgl_map(df_clean, data_type, lat_col, lng_col)
+        return
     
     # Create map
     center_lat = df_clean[lat_col].mean()
@@ -402,40 +633,91 @@ def render_map_chart(df: pd.DataFrame, data_type: str, chart_id: int = None):
     colors = {"illegal": "red", "production": "green", "iup": "blue"}
     color = colors.get(data_type, "gray")
     
-    for idx, row in df_clean.iterrows():
-        popup_content = f"<b>Location:</b> {row.get('kabupaten', 'Unknown')}<br>"
-        if data_type == "illegal":
-            popup_content += f"<b>Type:</b> {row.get('jenis_tambang', 'N/A')}<br>"
-            popup_content += f"<b>Owner:</b> {row.get('nama_pemilik', 'N/A')}<br>"
-            popup_content += f"<b>Workers:</b> {row.get('jumlah_pekerja', 'N/A')}<br>"
-        elif data_type == "production":
-            popup_content += f"<b>Production:</b> {row.get('produksi_ton', 'N/A')} tons<br>"
-            popup_content += f"<b>Operator:</b> {row.get('operator', 'N/A')}<br>"
-            popup_content += f"<b>Date:</b> {row.get('tanggal_produksi', 'N/A')}<br>"
-        elif data_type == "iup":
-            popup_content += f"<b>Name:</b> {row.get('name', 'N/A')}<br>"
-            popup_content += f"<b>Area:</b> {row.get('luas', 'N/A')} ha<br>"
-            popup_content += f"<b>Status:</b> {row.get('status', 'N/A')}<br>"
-            popup_content += f"<b>Region:</b> {row.get('daerah', 'N/A')}<br>"
-        
-        folium.Marker(
-            location=[row[lat_col], row[lng_col]],
-            popup=popup_content,
-            icon=folium.Icon(color=color)
-        ).add_to(m)
+    # Only coordinates and a lookup key go into the page; details load on click
+    key_col = MAP_RECORD_KEYS.get(data_type, "id")
+    if key_col not in df_clean.columns:
+        key_col = "id"
+    keys = df_clean[key_col].astype(str).tolist() if key_col in df_clean.columns else [""] * len(df_clean)
+    points = [
+        [lat, lng, key]
+        for lat, lng, key in zip(df_clean[lat_col].astype(float).tolist(), df_clean[lng_col].astype(float).tolist(), keys)
+    ]
+    
+    callback = MAP_CLUSTER_CALLBACK % {
+        "detail_url": json.dumps(f"{api_client.public_backend_url}/api/v1/data/{data_type}/"),
+        "fields": json.dumps(MAP_DETAIL_FIELDS.get(data_type, [])),
+        "color": json.dumps(color)
+    }
+    FastMarkerCluster(points, callback=callback).add_to(m)
     
     st_folium(m, width=700, height=400, key=f"map_{unique_key}")
 
-def render_statistical_chart(df: pd.DataFrame, data_type: str, chart_id: int = None, specific_chart: str = None):
+def render_webgl_map(df_clean: pd.DataFrame, data_type: str, lat_col: str, lng_col: str):
+    """Render large point sets on the GPU with pydeck"""
+    colors = {"illegal": [220, 53, 69], "production": [40, 167, 69], "iup": [31, 119, 180]}
+    color = colors.get(data_type, [128, 128, 128])
+    
+    # Ship only the columns the layer and tooltip need
+    tooltip_fields = [
+        (label, col) for label, col, _ in MAP_DETAIL_FIELDS.get(data_type, [])
+        if col in df_clean.columns and not pd.api.types.is_datetime64_any_dtype(df_clean[col])
+    ]
+    columns = [lng_col, lat_col] + [col for _, col in tooltip_fields]
+    if 'kabupaten' in df_clean.columns:
+        columns.append('kabupaten')
+    points = df_clean[columns].rename(columns={lng_col: "lng", lat_col: "lat"})
+    
+    view_state = pdk.ViewState(
+        latitude=float(points["lat"].mean()),
+        longitude=float(points["lng"].mean()),
+        zoom=8
+    )
+    
+    if len(points) > MAP_HEXAGON_THRESHOLD:
+        # Aggregate into hexagonal bins on the GPU for very large point sets
+        layer = pdk.Layer(
+            "HexagonLayer",
+            data=points[["lng", "lat"]],
+            get_position=["lng", "lat"],
+            radius=1000,
+            elevation_scale=20,
+            extruded=True,
+            pickable=True,
+            auto_highlight=True
+        )
+        tooltip = {"html": "<b>Sites:</b> {elevationValue}"}
+    else:
+        layer = pdk.Layer(
+            "ScatterplotLayer",
+            data=points,
+            get_position=["lng", "lat"],
+            get_fill_color=color + [180],
+            radius_min_pixels=3,
+            radius_max_pixels=12,
+            get_radius=100,
+            pickable=True,
+            auto_highlight=True
+        )
+        tooltip_html = "<b>Location:</b> {kabupaten}<br>" if 'kabupaten' in points.columns else ""
+        tooltip_html += "<br>".join(f"<b>{label}:</b> {{{col}}}" for label, col in tooltip_fields)
+        tooltip = {"html": tooltip_html}
+    
+    deck = pdk.Deck(layers=[layer], initial_view_state=view_state, tooltip=tooltip)
+    st.pydeck_chart(deck, use_container_width=True)
+    st.caption(f"WebGL map: {len(points):,} points")
+
+def render_statistical_chart(df: pd.DataFrame, data_type: str, chart_id: int = None, specific_chart: str = None, data_version: str = ""):
     """Render statistical charts"""
     # Generate unique key for this chart
-    unique_key = f"{data_type}_{chart_id}_{hash(str(df.to_dict()))}"
+    unique_key = f"{data_type}_{chart_id}_{data_version}"
     
     # If specific chart is requested, show only that chart
     if specific_chart == "pie":
         render_pie_chart(df, data_type, unique_key)
     elif specific_chart == "bar":
         render_bar_chart(df, data_type, unique_key)
+    elif specific_chart == "line":
+        render_line_chart(df, data_type, unique_key)
     else:
         # Show default combination of charts
         col1, col2 = st.columns(2)
@@ -449,12 +731,12 @@ def render_statistical_chart(df: pd.DataFrame, data_type: str, chart_id: int = N
 def render_pie_chart(df: pd.DataFrame, data_type: str, unique_key: str):
     """Render pie chart only"""
     if data_type == "illegal" and 'jenis_tambang' in df.columns:
-        type_counts = df['jenis_tambang'].value_counts()
+        type_counts = aggregate_categories(df, 'jenis_tambang', max_categories=CHART_MAX_CATEGORIES)
         fig = px.pie(values=type_counts.values, names=type_counts.index,
                    title="Illegal Mining Types Distribution")
         st.plotly_chart(fig, use_container_width=True, key=f"pie_{unique_key}")
     elif data_type == "iup" and 'status' in df.columns:
-        status_counts = df['status'].value_counts()
+        status_counts = aggregate_categories(df, 'status', max_categories=CHART_MAX_CATEGORIES)
         fig = px.pie(values=status_counts.values, names=status_counts.index,
                    title="IUP Status Distribution")
         st.plotly_chart(fig, use_container_width=True, key=f"pie_{unique_key}")
@@ -465,31 +747,59 @@ def render_bar_chart(df: pd.DataFrame, data_type: str, unique_key: str):
     """Render bar chart only"""
     if 'kabupaten' in df.columns:
         if data_type == "production" and 'produksi_ton' in df.columns:
-            fig = px.bar(df, x='kabupaten', y='produksi_ton',
+            region_totals = aggregate_categories(df, 'kabupaten', 'produksi_ton', max_categories=CHART_MAX_CATEGORIES)
+            fig = px.bar(x=region_totals.index, y=region_totals.values,
+                       labels={"x": "kabupaten", "y": "produksi_ton"},
                        title="Production by Region")
             st.plotly_chart(fig, use_container_width=True, key=f"bar_{unique_key}")
         else:
-            region_counts = df['kabupaten'].value_counts()
+            region_counts = aggregate_categories(df, 'kabupaten', max_categories=CHART_MAX_CATEGORIES)
             fig = px.bar(x=region_counts.index, y=region_counts.values,
                        title=f"{data_type.title()} by Region")
             st.plotly_chart(fig, use_container_width=True, key=f"bar_{unique_key}")
     else:
         st.warning(f"Bar chart not available for {data_type} data with current columns.")
 
+def render_line_chart(df: pd.DataFrame, data_type: str, unique_key: str):
+    """Render a daily trend line, downsampled to the chart point budget"""
+    date_col, value_col = TREND_COLUMNS.get(data_type, (None, None))
+    if date_col not in df.columns or (value_col and value_col not in df.columns):
+        st.warning(f"Trend chart not available for {data_type} data with current columns.")
+        return
+    
+    # Aggregate to one point per day before downsampling
+    dated = df.dropna(subset=[date_col])
+    days = dated[date_col].dt.floor("D")
+    if value_col:
+        daily = dated.groupby(days)[value_col].sum()
+    else:
+        daily = dated.groupby(days).size()
+    daily = daily.rename("value").reset_index()
+    
+    points = downsample_series(daily, date_col, "value", CHART_POINT_BUDGET)
+    fig = px.line(points, x=date_col, y="value",
+                labels={"value": value_col or "records"},
+                title=f"{data_type.title()} Trend")
+    st.plotly_chart(fig, use_container_width=True, key=f"line_{unique_key}")
+    if len(points) < len(daily):
+        st.caption(f"Downsampled {len(daily):,} daily points to {len(points):,}")
+
 def render_primary_chart(df: pd.DataFrame, data_type: str, unique_key: str):
     """Render the primary chart for data type"""
     if data_type == "illegal" and 'jenis_tambang' in df.columns:
-        type_counts = df['jenis_tambang'].value_counts()
+        type_counts = aggregate_categories(df, 'jenis_tambang', max_categories=CHART_MAX_CATEGORIES)
         fig = px.pie(values=type_counts.values, names=type_counts.index,
                    title=f"{data_type.title()} Mining Types")
         st.plotly_chart(fig, use_container_width=True, key=f"chart1_{unique_key}")
     elif data_type == "production" and 'kabupaten' in df.columns:
         if 'produksi_ton' in df.columns:
-            fig = px.bar(df, x='kabupaten', y='produksi_ton',
+            region_totals = aggregate_categories(df, 'kabupaten', 'produksi_ton', max_categories=CHART_MAX_CATEGORIES)
+            fig = px.bar(x=region_totals.index, y=region_totals.values,
+                       labels={"x": "kabupaten", "y": "produksi_ton"},
                        title="Production by Region")
             st.plotly_chart(fig, use_container_width=True, key=f"chart1_{unique_key}")
     elif data_type == "iup" and 'status' in df.columns:
-        status_counts = df['status'].value_counts()
+        status_counts = aggregate_categories(df, 'status', max_categories=CHART_MAX_CATEGORIES)
         fig = px.pie(values=status_counts.values, names=status_counts.index,
                    title="IUP Status Distribution")
         st.plotly_chart(fig, use_container_width=True, key=f"chart1_{unique_key}")
@@ -497,15 +807,15 @@ def render_primary_chart(df: pd.DataFrame, data_type: str, unique_key: str):
 def render_secondary_chart(df: pd.DataFrame, data_type: str, unique_key: str):
     """Render the secondary chart (regional distribution)"""
     if 'kabupaten' in df.columns:
-        region_counts = df['kabupaten'].value_counts()
+        region_counts = aggregate_categories(df, 'kabupaten', max_categories=CHART_MAX_CATEGORIES)
         fig = px.bar(x=region_counts.index, y=region_counts.values,
                    title=f"{data_type.title()} by Region")
         st.plotly_chart(fig, use_container_width=True, key=f"chart2_{unique_key}")
 
-def render_data_table(df: pd.DataFrame, data_type: str, chart_id: int = None):
+def render_data_table(df: pd.DataFrame, data_type: str, chart_id: int = None, data_version: str = ""):
     """Render data table"""
     # Generate unique key for this table
-    unique_key = f"table_{data_type}_{chart_id}_{hash(str(df.to_dict()))}"
+    unique_key = f"table_{data_type}_{chart_id}_{data_version}"
     st.dataframe(df, use_container_width=True, key=unique_key)
     st.caption(f"Showing {len(df)} {data_type} records")
 
@@ -513,6 +823,10 @@ def render_data_table(df: pd.DataFrame, data_type: str, chart_id: int = None):
 if page == "Show Data":
     st.markdown("<h1 class='main-header'>📊 Show Data</h1>", unsafe_allow_html=True)
     
+    # Overview
+    st.markdown("### 📈 Overview")
+    render_overview()
+    
     # Command input
     st.markdown("### 🎯 Chart Management")
     st.markdown("Tell me what you want to do with charts:")
@@ -523,7 +837,7 @@ if page == "Show Data":
         with col1:
             command = st.text_input(
                 "Command Input",
-                placeholder="e.g., add chart view for illegal mining in Jakarta",
+                placeholder="e.g., add chart view for illegal mining in Bangka Selatan",
                 key="command_input",
                 label_visibility="hidden"
             )
@@ -565,7 +879,7 @@ if page == "Show Data":
     # Example commands
     st.markdown("#### 💡 Example Commands:")
     example_commands = [
-        "Add chart view for illegal mining in Jakarta",
+        "Add chart view for illegal mining in Bangka Selatan",
         "Add map view for production data",
         "Add table view for IUP data",
         "Remove all charts",
@@ -609,6 +923,8 @@ if page == "Show Data":
     if st.session_state.charts:
         st.markdown("### 📈 Current Charts")
         st.markdown(f"*Showing {len(st.session_state.charts)} chart(s)*")
+        if st.session_state.live_updates:
+            watch_data_changes()
         
         for chart_config in st.session_state.charts:
             render_chart(chart_config)
@@ -621,7 +937,8 @@ elif page == "Settings":
     # API Configuration
     st.markdown("### 🔧 API Configuration")
     with st.expander("Backend API Settings"):
-        backend_url = st.text_input("Backend URL", value="http://localhost:8000")
+        backend_url = st.text_input("Backend URL", value=api_client.backend_url)
+        st.text_input("Public Backend URL (used by the browser)", value=api_client.public_backend_url, disabled=True)
         st.text_input("Source 1 URL (Illegal Mining)", value="http://localhost:8001", disabled=True)
         st.text_input("Source 2 URL (Production)", value="http://localhost:8002", disabled=True)
         st.text_input("Source 3 URL (IUP)", value="http://localhost:8003", disabled=True)
@@ -638,9 +955,11 @@ elif page == "Settings":
     with st.expander("Data Processing Settings"):
         max_records = st.number_input("Maximum records per query", min_value=10, max_value=1000, value=100)
         use_real_data = st.checkbox("Use real API data", value=True, disabled=True, help="Always enabled - fetches data from SQLite database via API")
-        auto_refresh = st.checkbox("Auto-refresh data", value=False)
-        if auto_refresh:
-            refresh_interval = st.selectbox("Refresh interval", ["30 seconds", "1 minute", "5 minutes", "10 minutes"])
+        st.session_state.live_updates = st.checkbox(
+            "Live updates",
+            value=st.session_state.live_updates,
+            help="Refresh charts when the backend reports newly ingested data for them (pushed, no polling)"
+        )
     
     # System Status
     st.markdown("### 🚦 System Status")
@@ -660,6 +979,7 @@ elif page == "Settings":
     with col1:
         if st.button("Clear All Charts"):
             st.session_state.charts = []
+            st.session_state.datasets = {}
             st.success("All charts cleared!")
             st.rerun()
     
@@ -2,16 +2,19 @@ import aiohttp
 import asyncio
 from typing import Dict, List, Optional, Any
 import json
+import os
 import streamlit as st
 from datetime import datetime
 
 class TinsigAPIClient:
     def __init__(self):
-        self.backend_url = "http://localhost:8000"
+        self.backend_url = os.getenv("BACKEND_URL", "http://localhost:8000")
+        # Backend URL as the user's browser reaches it (map popups fetch details client-side)
+        self.public_backend_url = os.getenv("PUBLIC_BACKEND_URL") or self.backend_url
         self.source1_url = "http://localhost:8001"  # Illegal Mining
         self.source2_url = "http://localhost:8002"  # Production
         self.source3_url = "http://localhost:8003"  # IUP
-        
+    
     async def _make_request(self, method: str, url: str, **kwargs) -> Optional[Dict]:
         """Make HTTP request with error handling"""
         try:
@@ -33,6 +36,56 @@ class TinsigAPIClient:
         
         return await self._make_request("POST", url, json=payload)
     
+    async def stream_ai_agent(self, user_query: str):
+        """Stream agent events (plan, sql, tool_result, token, answer, done) from the backend"""
+        url = f"{self.backend_url}/api/v1/query"
+        payload = {"query": user_query, "stream": True}
+        
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.post(url, json=payload, headers={"Accept": "text/event-stream"}) as response:
+                    if response.status != 200:
+                        st.error(f"API request failed: {response.status}")
+                        return
+                    
+                    event_type, data_lines = "message", []
+                    async for raw_line in response.content:
+                        line = raw_line.decode("utf-8").rstrip("\r\n")
+                        if line.startswith("event:"):
+                            event_type = line[6:].strip()
+                        elif line.startswith("data:"):
+                            data_lines.append(line[5:].strip())
+                        elif not line and data_lines:
+                            yield {"event": event_type, "data": json.loads("\n".join(data_lines))}
+                            event_type, data_lines = "message", []
+        except Exception as e:
+            st.error(f"Connection error: {str(e)}")
+    
+    async def stream_changes(self, since: Optional[int] = None):
+        """Yield change events (table, count, kabupaten, generation) pushed by the backend.
+        
+        Runs until the connection drops and raises on failure, so a background
+        listener can reconnect with the last generation it saw.
+        """
+        url = f"{self.backend_url}/api/v1/events"
+        params = {"since": since} if since is not None else {}
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=10, sock_read=60)
+        
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            async with session.get(url, params=params, headers={"Accept": "text/event-stream"}) as response:
+                response.raise_for_status()
+                
+                event_type, data_lines = "message", []
+                async for raw_line in response.content:
+                    line = raw_line.decode("utf-8").rstrip("\r\n")
+                    if line.startswith("event:"):
+                        event_type = line[6:].strip()
+                    elif line.startswith("data:"):
+                        data_lines.append(line[5:].strip())
+                    elif not line and data_lines:
+                        yield {"event": event_type, "data": json.loads("\n".join(data_lines))}
+                        event_type, data_lines = "message", []
+    
     async def get_illegal_mining_data(self, filters: Dict = None) -> List[Dict]:
         """Fetch illegal mining data"""
         params = filters or {}
@@ -57,99 +110,67 @@ class TinsigAPIClient:
         result = await self._make_request("GET", url, params=params)
         return result.get("data", {}).get("data", []) if result else []
     
-    async def get_illegal_mining_count(self, kabupaten_filter: List[str]) -> int:
-        """Get count of illegal mining sites"""
-        try:
-            data = await self.get_illegal_mining_data({"kabupaten": kabupaten_filter})
-            return len(data)
-        except:
-            return 0
+    async def get_regions(self) -> Dict[str, List[str]]:
+        """Fetch the kabupaten -> kecamatan gazetteer"""
+        url = f"{self.backend_url}/api/v1/data/regions"
+        
+        result = await self._make_request("GET", url)
+        return result.get("regions", {}) if result else {}
     
-    async def get_production_total(self, kabupaten_filter: List[str]) -> float:
-        """Get total production"""
-        try:
-            data = await self.get_production_data({"kabupaten": kabupaten_filter})
-            return sum(float(item.get("produksi_ton", 0)) for item in data)
-        except:
-            return 0.0
+    async def get_dashboard_batch(self, queries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Run several backend data queries in one request; results keyed by sub-query id"""
+        url = f"{self.backend_url}/api/v1/dashboard/batch"
+        
+        result = await self._make_request("POST", url, json={"queries": queries})
+        if not result:
+            return {}
+        return {item["id"]: item.get("data") if item["status"] == 200 else None for item in result["results"]}
     
-    async def get_active_iups_count(self) -> int:
-        """Get count of active IUPs"""
-        try:
-            data = await self.get_iup_data({"status": "active"})
-            return len(data)
-        except:
-            return 0
+    def _kabupaten_params(self, kabupaten_filter: Optional[List[str]]) -> List[tuple]:
+        """Repeated ?kabupaten= query parameters"""
+        return [("kabupaten", name) for name in kabupaten_filter or []]
+    
+    async def get_summary_stats(self, kabupaten_filter: List[str] = None) -> Dict[str, Any]:
+        """Get counts and production total computed by the backend"""
+        url = f"{self.backend_url}/api/v1/data/stats/summary"
+        
+        return await self._make_request("GET", url, params=self._kabupaten_params(kabupaten_filter)) or {}
     
     async def get_production_trends(self, kabupaten_filter: List[str]) -> List[Dict]:
-        """Get production trends data"""
+        """Get monthly production totals"""
         try:
-            data = await self.get_production_data({"kabupaten": kabupaten_filter})
-            # Process data for trends - mock implementation
-            return [
-                {"date": "2024-01", "production": 150.5},
-                {"date": "2024-02", "production": 165.2},
-                {"date": "2024-03", "production": 142.8}
-            ]
+            url = f"{self.backend_url}/api/v1/data/stats/production-trend"
+            result = await self._make_request("GET", url, params=self._kabupaten_params(kabupaten_filter))
+            return result.get("trend", []) if result else []
         except:
             return []
     
     async def get_mining_types_distribution(self) -> Dict[str, int]:
-        """Get mining types distribution"""
+        """Get illegal mining site counts per mining type"""
         try:
-            data = await self.get_illegal_mining_data()
-            # Process data for distribution - mock implementation
-            return {
-                "Timah": 25,
-                "Emas": 15,
-                "Batubara": 10,
-                "Pasir": 8
-            }
+            url = f"{self.backend_url}/api/v1/data/stats/distribution"
+            params = {"entity": "illegal", "field": "jenis_tambang"}
+            result = await self._make_request("GET", url, params=params)
+            return result.get("distribution", {}) if result else {}
         except:
             return {}
     
     async def get_recent_activities(self, limit: int = 10) -> List[Dict]:
-        """Get recent activities"""
+        """Get the newest events across illegal mining, production and IUP records"""
         try:
-            # Mock implementation - combine recent data from all sources
-            return [
-                {
-                    "timestamp": "2024-08-18 10:30:00",
-                    "type": "Illegal Mining Detected",
-                    "location": "Jakarta",
-                    "details": "New illegal mining site detected in Jakarta area"
-                },
-                {
-                    "timestamp": "2024-08-18 09:15:00", 
-                    "type": "Production Report",
-                    "location": "Bandung",
-                    "details": "Monthly production report submitted"
-                }
-            ]
+            url = f"{self.backend_url}/api/v1/data/activity/recent"
+            result = await self._make_request("GET", url, params={"limit": limit})
+            return result.get("activities", []) if result else []
         except:
             return []
     
     async def get_map_data(self, layer: str, kabupaten: List[str]) -> Dict:
         """Get geospatial data for maps"""
         try:
-            # Mock GeoJSON data
-            return {
-                "type": "FeatureCollection",
-                "features": [
-                    {
-                        "type": "Feature",
-                        "geometry": {
-                            "type": "Point",
-                            "coordinates": [106.845599, -6.208763]
-                        },
-                        "properties": {
-                            "name": "Sample Mining Site",
-                            "type": layer,
-                            "kabupaten": "Jakarta"
-                        }
-                    }
-                ]
-            }
+            url = f"{self.backend_url}/api/v1/data/map-data"
+            params = [("layer", layer)] + self._kabupaten_params(kabupaten)
+            result = await self._make_request("GET", url, params=params)
+            return result or {"type": "FeatureCollection", "features": []}
         except:
             return {"type": "FeatureCollection", "features": []}
     
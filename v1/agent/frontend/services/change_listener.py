@@ -0,0 +1,81 @@
+import asyncio
+import logging
+import threading
+from typing import Dict, Optional, Set
+from services.api_client import TinsigAPIClient
+
+# Seconds between reconnect attempts, doubling up to the maximum
+RECONNECT_MIN_SECONDS = 1
+RECONNECT_MAX_SECONDS = 30
+
+logger = logging.getLogger(__name__)
+
+class ChangeListener:
+    """One background subscription to the backend change feed per Streamlit process.
+
+    Sessions never call the API to look for new data: they compare their last
+    seen generation with this listener's, which is updated by server push.
+    """
+    
+    def __init__(self, api_client: TinsigAPIClient):
+        self.api_client = api_client
+        self.generation = 0
+        self.connected = False
+        self.reset_generation = 0  # Changes up to here were lost; sessions below it reload everything
+        self.changes: Dict[str, Dict] = {}  # table -> latest generation and affected kabupaten since startup
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self) -> "ChangeListener":
+        if self._thread is None:
+            self._thread = threading.Thread(target=lambda: asyncio.run(self._run()), name="change-listener", daemon=True)
+            self._thread.start()
+        return self
+    
+    async def _run(self):
+        delay = RECONNECT_MIN_SECONDS
+        warn = True  # First failure, and the first one after each successful connect
+        while True:
+            try:
+                since = self.generation or None
+                async for item in self.api_client.stream_changes(since):
+                    delay = RECONNECT_MIN_SECONDS
+                    self._handle(item["event"], item["data"])
+                    warn = warn or self.connected
+            except Exception as e:
+                if warn:
+                    logger.warning(f"Change feed connection failed, reconnecting with backoff: {e!r}")
+                    warn = False
+                else:
+                    logger.debug(f"Change feed reconnect failed: {e!r}")
+            self.connected = False
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_SECONDS)
+    
+    def _handle(self, event: str, data: Dict):
+        with self._lock:
+            if event == "ready":
+                self.connected = True
+                self.generation = max(self.generation, data["generation"])
+            elif event == "reset":
+                self.generation = self.reset_generation = data["generation"]
+            elif event == "change":
+                change = self.changes.setdefault(data["table"], {"generation": 0, "kabupaten": {}})
+                change["generation"] = data["generation"]
+                # kabupaten -> generation of its latest change; None means every region
+                for name in data["kabupaten"] if data["kabupaten"] else [None]:
+                    change["kabupaten"][name] = data["generation"]
+                self.generation = max(self.generation, data["generation"])
+    
+    def changes_since(self, generation: int) -> Dict[str, Optional[Set[str]]]:
+        """Tables changed after `generation` -> affected kabupaten (None when every region may have changed)"""
+        with self._lock:
+            if generation < self.reset_generation:
+                return {table: None for table in ("illegal", "production", "iup")}
+            result = {}
+            for table, change in self.changes.items():
+                if change["generation"] <= generation:
+                    continue
+                names = {name for name, seen in change["kabupaten"].items() if seen > generation}
+                result[table] = None if None in names else names
+            return result
@@ -0,0 +1,38 @@
+import asyncio
+import logging
+
+import pytest
+
+from services import change_listener
+from services.change_listener import ChangeListener
+
+
+class FlakyFeed:
+    """Fails every connection; the third one gets as far as the ready event"""
+
+    def __init__(self, attempts):
+        self.attempts = attempts
+        self.calls = 0
+
+    async def stream_changes(self, since):
+        self.calls += 1
+        if self.calls > self.attempts:
+            raise asyncio.CancelledError
+        if self.calls == 3:
+            yield {"event": "ready", "data": {"generation": 5}}
+        raise ConnectionError(f"attempt {self.calls}")
+
+
+def test_warns_once_per_lost_connection(monkeypatch, caplog):
+    monkeypatch.setattr(change_listener, "RECONNECT_MIN_SECONDS", 0)
+    monkeypatch.setattr(change_listener, "RECONNECT_MAX_SECONDS", 0)
+    listener = ChangeListener(FlakyFeed(attempts=5))
+
+    with caplog.at_level(logging.DEBUG, logger=change_listener.__name__):
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(listener._run())
+
+    levels = [record.levelno for record in caplog.records if record.name == change_listener.__name__]
+    assert levels == [logging.WARNING, logging.DEBUG, logging.WARNING, logging.DEBUG, logging.DEBUG]
+    assert listener.generation == 5
+    assert not listener.connected
@@ -0,0 +1,76 @@
+import importlib.util
+import os
+from datetime import date
+
+import pytest
+
+from utils.command_parser import PERIOD_WORDS, CommandParser
+
+TODAY = date(2024, 5, 15)
+
+
+@pytest.fixture(scope="module")
+def parser():
+    return CommandParser({"Bangka Selatan": ["Toboali", "Payung"], "Bangka Tengah": ["Koba"], "Belitung": []})
+
+
+def test_action_data_type_chart_and_region(parser):
+    intent = parser.parse("Add a pie chart of illegal mining in Bangka Selatan", TODAY)
+
+    assert intent.action == "add"
+    assert intent.data_type == "illegal"
+    assert intent.charts == [("chart", "pie")]
+    assert intent.region == {"name": "Bangka Selatan", "level": "kabupaten", "kabupaten": "Bangka Selatan"}
+
+
+def test_kecamatan_resolves_to_its_kabupaten(parser):
+    intent = parser.parse("show production table for Koba", TODAY)
+
+    assert intent.region == {"name": "Koba", "level": "kecamatan", "kabupaten": "Bangka Tengah"}
+    assert intent.charts == [("table", None)]
+
+
+def test_unique_region_suffix_stands_for_the_kabupaten(parser):
+    assert parser.parse("map of Selatan", TODAY).region["name"] == "Bangka Selatan"
+
+
+def test_ordinal_and_number_refer_to_charts(parser):
+    assert parser.parse("remove the second chart", TODAY).chart_ref == 2
+    intent = parser.parse("delete chart 3", TODAY)
+    assert intent.chart_ref == 3
+    assert intent.charts == []
+
+
+@pytest.mark.parametrize("command, date_from, date_to", [
+    ("production in 2023", "2023-01-01", "2024-01-01"),
+    ("production from 2021 to 2023", "2021-01-01", "2024-01-01"),
+    ("production in march 2023", "2023-03-01", "2023-04-01"),
+    ("production from jan to mar 2023", "2023-01-01", "2023-04-01"),
+    ("production in may", "2024-05-01", "2024-06-01"),
+    ("production bulan des", "2024-12-01", "2025-01-01"),
+    ("production this month", "2024-05-01", "2024-06-01"),
+    ("production last month", "2024-04-01", "2024-05-01"),
+    ("production previous year", "2023-01-01", "2024-01-01"),
+    ("produksi tahun lalu", "2023-01-01", "2024-01-01")
+])
+def test_dates(parser, command, date_from, date_to):
+    intent = parser.parse(command, TODAY)
+
+    assert (intent.date_from, intent.date_to) == (date_from, date_to)
+
+
+@pytest.mark.parametrize("command", ["may I see the iup table in Selatan", "show the des chart", "add a mar chart"])
+def test_month_abbreviations_outside_date_context_are_not_dates(parser, command):
+    intent = parser.parse(command, TODAY)
+
+    assert intent.date_from is None and intent.date_to is None
+
+
+def test_period_words_match_the_backend_planner():
+    # The planner is stdlib-only; load it by path since backend is not on sys.path here
+    path = os.path.join(os.path.dirname(__file__), "..", "..", "backend", "agents", "planner.py")
+    spec = importlib.util.spec_from_file_location("backend_planner", path)
+    planner = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(planner)
+
+    assert PERIOD_WORDS == planner.RELATIVE_PERIODS
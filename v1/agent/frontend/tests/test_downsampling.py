@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+from utils.downsampling import downsample_series, lttb_indices
+
+
+def test_small_threshold_or_short_series_keeps_every_point():
+    x = np.arange(10)
+
+    assert list(lttb_indices(x, x, 20)) == list(range(10))
+    assert list(lttb_indices(x, x, 2)) == list(range(10))
+
+
+def test_keeps_endpoints_and_returns_sorted_unique_indices():
+    x = np.arange(1000)
+    y = np.sin(x / 20)
+
+    indices = lttb_indices(x, y, 50)
+
+    assert len(indices) == 50
+    assert indices[0] == 0 and indices[-1] == 999
+    assert np.all(np.diff(indices) > 0)
+
+
+def test_keeps_a_spike():
+    x = np.arange(1000)
+    y = np.zeros(1000)
+    y[437] = 100.0
+
+    assert 437 in lttb_indices(x, y, 20)
+
+
+def test_downsample_series_sorts_and_respects_the_budget():
+    df = pd.DataFrame({
+        "tanggal": pd.date_range("2024-01-01", periods=500, freq="D")[::-1],
+        "produksi_ton": np.arange(500.0)
+    })
+
+    result = downsample_series(df, "tanggal", "produksi_ton", 100)
+
+    assert len(result) == 100
+    assert result["tanggal"].is_monotonic_increasing
+    assert result["tanggal"].iloc[0] == df["tanggal"].min()
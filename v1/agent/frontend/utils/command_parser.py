@@ -0,0 +1,378 @@
+import re
+from collections import deque
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+# Kabupaten/kota of Bangka Belitung, used until the gazetteer is loaded
+DEFAULT_REGIONS = {
+    "Bangka": [],
+    "Bangka Barat": [],
+    "Bangka Selatan": [],
+    "Bangka Tengah": [],
+    "Belitung": [],
+    "Belitung Timur": [],
+    "Pangkal Pinang": []
+}
+
+ACTION_WORDS = {
+    "add": ["add", "create", "show", "display", "tambah", "tampilkan", "buat"],
+    "remove": ["remove", "delete", "clear", "hapus"],
+    "modify": ["change", "modify", "update", "replace", "switch", "convert", "ubah", "ganti"]
+}
+
+DATA_TYPE_WORDS = {
+    "illegal": ["illegal", "ilegal", "illegal mining", "tambang ilegal", "pti"],
+    "production": ["production", "produksi"],
+    "iup": ["iup", "permit", "permits", "izin", "license"]
+}
+
+# (chart type, specific chart)
+CHART_WORDS = {
+    ("chart", "pie"): ["pie", "pie chart"],
+    ("chart", "bar"): ["bar", "bar chart", "bars"],
+    ("chart", "line"): ["line", "line chart", "trend", "trends", "tren"],
+    ("chart", None): ["chart", "charts", "graph", "graphs", "plot", "grafik"],
+    ("table", None): ["table", "tables", "tabel"],
+    ("map", None): ["map", "maps", "location", "locations", "geographic", "peta"]
+}
+
+ORDINAL_WORDS = {
+    1: ["first", "1st", "pertama"],
+    2: ["second", "2nd", "kedua"],
+    3: ["third", "3rd", "ketiga"],
+    4: ["fourth", "4th", "keempat"],
+    5: ["fifth", "5th", "kelima"],
+    6: ["sixth", "6th"],
+    7: ["seventh", "7th"],
+    8: ["eighth", "8th"],
+    9: ["ninth", "9th"],
+    10: ["tenth", "10th"],
+    -1: ["last", "terakhir"]
+}
+
+ALL_WORDS = ["all", "every", "everything", "semua"]
+
+MONTH_WORDS = {
+    1: ["january", "januari"],
+    2: ["february", "februari"],
+    3: ["march", "maret"],
+    4: ["april"],
+    5: ["mei"],
+    6: ["june", "juni"],
+    7: ["july", "juli"],
+    8: ["august", "agustus"],
+    9: ["september"],
+    10: ["october", "oktober"],
+    11: ["november"],
+    12: ["december", "desember"]
+}
+
+# "may" and the abbreviations are also ordinary words ("may I see ...");
+# they only count as months next to a year or after a date preposition
+AMBIGUOUS_MONTH_WORDS = {
+    1: ["jan"],
+    2: ["feb"],
+    3: ["mar"],
+    4: ["apr"],
+    5: ["may"],
+    6: ["jun"],
+    7: ["jul"],
+    8: ["aug", "agu"],
+    9: ["sep", "sept"],
+    10: ["oct", "okt"],
+    11: ["nov"],
+    12: ["dec", "des"]
+}
+
+DATE_PREPOSITIONS = ["in", "during", "from", "to", "since", "until", "bulan"]
+
+# Relative periods as (unit, offset from the current one); kept identical to
+# RELATIVE_PERIODS in backend/agents/planner.py
+PERIOD_WORDS = {
+    ("month", 0): ["this month", "bulan ini"],
+    ("month", -1): ["last month", "previous month", "bulan lalu"],
+    ("year", 0): ["this year", "tahun ini"],
+    ("year", -1): ["last year", "previous year", "tahun lalu"]
+}
+
+# Trailing words of kabupaten names that also work on their own ("Selatan")
+REGION_SUFFIXES = {"barat", "selatan", "tengah", "timur", "utara"}
+
+NON_WORD = re.compile(r"[^0-9a-z#]+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase, with every run of punctuation and whitespace collapsed to one space"""
+    return NON_WORD.sub(" ", text.lower()).strip()
+
+
+class PhraseMatcher:
+    """Aho-Corasick automaton over whole-word phrases.
+
+    Every phrase is found in one left-to-right pass over the text, so the
+    cost of a scan depends on the text length, not on how many phrases (for
+    example region names) are registered. Digit runs are reported in the
+    same pass as ("number", value) matches.
+    """
+
+    def __init__(self):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[List[Tuple[int, Any]]] = [[]]
+        self.built = False
+
+    def add(self, phrase: str, payload: Any) -> None:
+        phrase = normalize(phrase)
+        if not phrase:
+            return
+        state = 0
+        for char in phrase:
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][char] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            state = next_state
+        self.output[state].append((len(phrase), payload))
+        self.built = False
+
+    def build(self) -> "PhraseMatcher":
+        """Compute failure links breadth-first and merge outputs along them"""
+        queue = deque(self.goto[0].values())
+        for state in queue:
+            self.fail[state] = 0
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+        self.built = True
+        return self
+
+    def scan(self, text: str) -> List[Tuple[int, int, Any]]:
+        """All whole-word matches as (start, end, payload), longest leftmost first, without overlaps"""
+        if not self.built:
+            self.build()
+        text = normalize(text)
+        matches = []
+        state = 0
+        digits_start = None
+
+        for index, char in enumerate(text):
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+
+            end = index + 1
+            at_boundary = end == len(text) or text[end] == " "
+            if at_boundary:
+                for length, payload in self.output[state]:
+                    start = end - length
+                    if start == 0 or text[start - 1] == " ":
+                        matches.append((start, end, payload))
+
+            if char.isdigit():
+                if digits_start is None:
+                    digits_start = index
+                if at_boundary and (digits_start == 0 or text[digits_start - 1] in " #"):
+                    matches.append((digits_start, end, ("number", int(text[digits_start:end]))))
+            else:
+                digits_start = None
+
+        selected, last_end = [], 0
+        for start, end, payload in sorted(matches, key=lambda match: (match[0], match[0] - match[1])):
+            if start >= last_end:
+                selected.append((start, end, payload))
+                last_end = end
+        return selected
+
+
+class CommandIntent:
+    """Structured result of parsing one chart command"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.action: Optional[str] = None
+        self.data_type: Optional[str] = None
+        self.charts: List[Tuple[str, Optional[str]]] = []
+        self.regions: List[Dict[str, Optional[str]]] = []
+        self.date_from: Optional[str] = None
+        self.date_to: Optional[str] = None
+        self.chart_refs: List[int] = []
+        self.all = False
+
+    @property
+    def region(self) -> Optional[Dict[str, Optional[str]]]:
+        return self.regions[0] if self.regions else None
+
+    @property
+    def chart_ref(self) -> int:
+        """First referenced chart position (1-based, -1 for last), 0 when none"""
+        return self.chart_refs[0] if self.chart_refs else 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "text": self.text,
+            "action": self.action,
+            "data_type": self.data_type,
+            "charts": self.charts,
+            "regions": self.regions,
+            "date_from": self.date_from,
+            "date_to": self.date_to,
+            "chart_refs": self.chart_refs,
+            "all": self.all
+        }
+
+
+def _is_year(kind: str, value: Any) -> bool:
+    return kind == "number" and 1900 <= value <= 2100
+
+
+def _month_start(year: int, month: int) -> date:
+    return date(year + (month - 1) // 12, (month - 1) % 12 + 1, 1)
+
+
+class CommandParser:
+    """Parse chart commands into a CommandIntent with one compiled matcher.
+
+    The vocabulary (actions, data types, chart types, ordinals, months,
+    relative periods, date prepositions) and a gazetteer of kabupaten ->
+    kecamatan names are compiled into a single PhraseMatcher.
+    """
+
+    def __init__(self, regions: Optional[Dict[str, Iterable[str]]] = None):
+        self.matcher = PhraseMatcher()
+        for groups, kind in (
+            (ACTION_WORDS, "action"),
+            (DATA_TYPE_WORDS, "data_type"),
+            (CHART_WORDS, "chart"),
+            (ORDINAL_WORDS, "ordinal"),
+            (MONTH_WORDS, "month"),
+            (AMBIGUOUS_MONTH_WORDS, "ambiguous_month"),
+            (PERIOD_WORDS, "period")
+        ):
+            for value, words in groups.items():
+                for word in words:
+                    self.matcher.add(word, (kind, value))
+        for word in ALL_WORDS:
+            self.matcher.add(word, ("all", True))
+        for word in DATE_PREPOSITIONS:
+            self.matcher.add(word, ("preposition", word))
+
+        self.region_count = self._add_regions(regions or DEFAULT_REGIONS)
+        self.matcher.build()
+
+    def _add_regions(self, regions: Dict[str, Iterable[str]]) -> int:
+        names: Dict[str, Dict[str, Optional[str]]] = {}
+        for kabupaten, kecamatan_names in regions.items():
+            names[normalize(kabupaten)] = {"name": kabupaten, "level": "kabupaten", "kabupaten": kabupaten}
+        for kabupaten, kecamatan_names in regions.items():
+            for kecamatan in kecamatan_names:
+                key = normalize(kecamatan)
+                if key in names:
+                    # Kabupaten names win; a kecamatan name shared by two kabupaten is ambiguous
+                    if names[key]["level"] == "kecamatan" and names[key]["kabupaten"] != kabupaten:
+                        names[key] = {**names[key], "kabupaten": None}
+                    continue
+                names[key] = {"name": kecamatan, "level": "kecamatan", "kabupaten": kabupaten}
+
+        suffixes: Dict[str, List[str]] = {}
+        for kabupaten in regions:
+            words = normalize(kabupaten).split()
+            if len(words) > 1 and words[-1] in REGION_SUFFIXES:
+                suffixes.setdefault(words[-1], []).append(kabupaten)
+        for suffix, owners in suffixes.items():
+            if len(owners) == 1 and suffix not in names:
+                names[suffix] = names[normalize(owners[0])]
+
+        for key, region in names.items():
+            self.matcher.add(key, ("region", region))
+        return len(names)
+
+    def parse(self, command: str, today: Optional[date] = None) -> CommandIntent:
+        intent = CommandIntent(command)
+        today = today or date.today()
+        years: List[int] = []
+        months: List[int] = []
+        period = None
+
+        matches = self.matcher.scan(command)
+        for index, (start, end, (kind, value)) in enumerate(matches):
+            if kind == "action":
+                intent.action = intent.action or value
+            elif kind == "data_type":
+                intent.data_type = intent.data_type or value
+            elif kind == "chart":
+                if value not in intent.charts:
+                    intent.charts.append(value)
+            elif kind == "region":
+                if value not in intent.regions:
+                    intent.regions.append(value)
+            elif kind == "ordinal":
+                intent.chart_refs.append(value)
+            elif kind == "month":
+                months.append(value)
+            elif kind == "ambiguous_month":
+                if self._in_date_context(matches, index):
+                    months.append(value)
+            elif kind == "period":
+                period = period or value
+            elif kind == "all":
+                intent.all = True
+            elif kind == "number":
+                if _is_year(kind, value):
+                    years.append(value)
+                else:
+                    intent.chart_refs.append(value)
+
+        # "chart 2" refers to a chart; a bare "chart" without a number still asks for one
+        if intent.chart_refs and ("chart", None) in intent.charts and intent.action != "add":
+            intent.charts.remove(("chart", None))
+
+        self._resolve_dates(intent, years, months, period, today)
+        return intent
+
+    @staticmethod
+    def _in_date_context(matches: List[Tuple[int, int, Any]], index: int) -> bool:
+        """Whether the match at `index` directly follows a date preposition or is next to a year"""
+        start, end, _ = matches[index]
+        if index > 0:
+            _, previous_end, (kind, value) = matches[index - 1]
+            if previous_end + 1 == start and (kind == "preposition" or _is_year(kind, value)):
+                return True
+        if index + 1 < len(matches):
+            next_start, _, (kind, value) = matches[index + 1]
+            if next_start == end + 1 and _is_year(kind, value):
+                return True
+        return False
+
+    @staticmethod
+    def _resolve_dates(intent: CommandIntent, years: List[int], months: List[int], period, today: date) -> None:
+        if months:
+            first_year = min(years) if years else today.year
+            last_year = max(years) if years else today.year
+            start = _month_start(first_year, min(months) if first_year == last_year else months[0])
+            end = _month_start(last_year, (max(months) if first_year == last_year else months[-1]) + 1)
+        elif years:
+            start, end = date(min(years), 1, 1), date(max(years) + 1, 1, 1)
+        elif period:
+            unit, offset = period
+            if unit == "year":
+                start, end = date(today.year + offset, 1, 1), date(today.year + offset + 1, 1, 1)
+            else:
+                start = _month_start(today.year, today.month + offset)
+                end = _month_start(today.year, today.month + offset + 1)
+        else:
+            return
+        intent.date_from, intent.date_to = start.isoformat(), end.isoformat()
+
+
+def parse_command(command: str, parser: Optional[CommandParser] = None) -> CommandIntent:
+    return (parser or CommandParser()).parse(command)
@@ -0,0 +1,69 @@
+import hashlib
+import json
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+
+def compute_fingerprint(records: List[Dict]) -> str:
+    """Compute a short content fingerprint for a fetched dataset.
+
+    Called once when data is fetched; the result is stored with the chart
+    and reused as part of widget keys so reruns never re-hash the data.
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    for record in records:
+        digest.update(json.dumps(record, sort_keys=True, default=str).encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+# Low-cardinality text columns stored as pandas categoricals
+CATEGORICAL_COLUMNS = ["kabupaten", "jenis_tambang", "status", "kecamatan"]
+
+# Coordinate columns from the backend API and from the PHP sources
+COORDINATE_COLUMNS = ["location_lat", "location_lng", "latitude", "longitude"]
+
+DATE_COLUMNS = ["tanggal_survey", "tanggal_produksi", "tgl_sk", "created_at"]
+
+
+def build_dataset_frame(records: List[Dict]) -> pd.DataFrame:
+    """Build a typed, columnar DataFrame for a fetched dataset.
+
+    Built once per fetch and shared by every chart that renders the dataset.
+    """
+    df = pd.DataFrame.from_records(records)
+
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+
+    for col in COORDINATE_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("float32")
+
+    for col in DATE_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], errors="coerce")
+
+    return df
+
+
+def filter_by_date(records: List[Dict], column: str, date_from: Optional[str] = None,
+                   date_to: Optional[str] = None) -> List[Dict]:
+    """Keep records whose date column falls in [date_from, date_to).
+
+    The source APIs cannot filter by date, so command date ranges are
+    applied client-side. Records without a parseable date are dropped
+    when a range is given.
+    """
+    if not records or (not date_from and not date_to):
+        return records
+
+    dates = pd.to_datetime(pd.Series([record.get(column) for record in records]), errors="coerce")
+    keep = dates.notna()
+    if date_from:
+        keep &= dates >= pd.Timestamp(date_from)
+    if date_to:
+        keep &= dates < pd.Timestamp(date_to)
+    return [record for record, kept in zip(records, keep) if kept]
@@ -0,0 +1,90 @@
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Select point indices with Largest-Triangle-Three-Buckets.
+
+    Keeps the first and last points and, from each bucket in between, the point
+    forming the largest triangle with the previously selected point and the
+    average of the next bucket. `x` must be sorted ascending.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # threshold - 2 buckets between the fixed first and last points
+    edges = np.floor(np.linspace(1, n - 1, threshold - 1)).astype(np.int64)
+
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    selected = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+        else:
+            next_start, next_end = n - 1, n
+
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        ax, ay = x[selected], y[selected]
+
+        areas = np.abs(
+            (ax - avg_x) * (y[start:end] - ay) - (ax - x[start:end]) * (avg_y - ay)
+        )
+        selected = start + int(np.argmax(areas))
+        indices[i + 1] = selected
+
+    return indices
+
+
+def downsample_series(df: pd.DataFrame, x_col: str, y_col: str, budget: int) -> pd.DataFrame:
+    """Downsample a time series to at most `budget` points with LTTB"""
+    series = df[[x_col, y_col]].dropna().sort_values(x_col)
+    if len(series) <= budget:
+        return series
+
+    x = series[x_col]
+    if pd.api.types.is_datetime64_any_dtype(x):
+        x_values = x.to_numpy(dtype="datetime64[ns]").astype(np.int64)
+    else:
+        x_values = x.to_numpy()
+
+    indices = lttb_indices(x_values, series[y_col].to_numpy(), budget)
+    return series.iloc[indices]
+
+
+def aggregate_categories(
+    df: pd.DataFrame,
+    category_col: str,
+    value_col: Optional[str] = None,
+    max_categories: int = 30,
+    other_label: str = "Other"
+) -> pd.Series:
+    """Pre-aggregate a categorical column for bar and pie charts.
+
+    Returns one value per category (sum of `value_col`, or row counts when it
+    is None), largest first. Categories beyond `max_categories` are folded
+    into a single `other_label` entry so the chart size stays bounded.
+    """
+    if value_col is None:
+        totals = df[category_col].value_counts()
+    else:
+        totals = df.groupby(category_col, observed=True)[value_col].sum().sort_values(ascending=False)
+
+    totals = totals[totals > 0] if value_col is None else totals
+    if len(totals) > max_categories:
+        head = totals.iloc[:max_categories - 1]
+        rest = totals.iloc[max_categories - 1:].sum()
+        head.index = head.index.astype(str)
+        totals = pd.concat([head, pd.Series({other_label: rest})])
+
+    return totals
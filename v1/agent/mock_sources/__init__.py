@@ -0,0 +1,11 @@
+"""
+TINSIG Mock Source APIs
+=======================
+
+Local stand-ins for the PHP source APIs (source1/2/3) that serve synthetic
+data in the same response envelope, for offline development, CI and load
+testing of ingestion.
+
+Run all three on the usual ports:
+    python -m mock_sources --records 100000 --latency-ms 50 --error-rate 0.01
+"""
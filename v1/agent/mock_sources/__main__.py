@@ -0,0 +1,66 @@
+"""
+Run the mock source APIs.
+
+Usage (from the agent directory):
+    python -m mock_sources [--sources illegal,production,iup] [--records 100000]
+                           [--page-size 100] [--max-page-size 1000]
+                           [--latency-ms 0] [--jitter-ms 0] [--error-rate 0.0]
+                           [--chunked] [--chunk-size 65536] [--chunk-delay-ms 0]
+"""
+import argparse
+import asyncio
+from mock_sources.server import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, SOURCES, start_sources
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Serve synthetic data in the source API format")
+    parser.add_argument("--sources", default=",".join(SOURCES), help="Comma-separated sources to start")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port-offset", type=int, default=0, help="Added to the default ports 8001/8002/8003")
+    parser.add_argument("--records", type=int, default=1000, help="Records per source")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE, help="Records per page when no limit is given")
+    parser.add_argument("--max-page-size", type=int, default=MAX_PAGE_SIZE, help="Upper bound for the limit parameter")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Fixed delay before each response")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Random extra delay, uniform in [0, jitter]")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with an error")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--chunked", action="store_true", help="Send bodies with chunked transfer encoding")
+    parser.add_argument("--chunk-size", type=int, default=65536)
+    parser.add_argument("--chunk-delay-ms", type=float, default=0.0, help="Delay between chunks (slow transfer)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for injected latency and errors")
+    return parser.parse_args()
+
+async def serve(args) -> None:
+    kinds = [kind.strip() for kind in args.sources.split(",") if kind.strip()]
+    servers = await start_sources(
+        kinds,
+        host=args.host,
+        ports={kind: SOURCES[kind]["port"] + args.port_offset for kind in kinds if kind in SOURCES},
+        record_count=args.records,
+        page_size=args.page_size,
+        max_page_size=args.max_page_size,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        chunked=args.chunked,
+        chunk_size=args.chunk_size,
+        chunk_delay_ms=args.chunk_delay_ms,
+        seed=args.seed
+    )
+    for kind, server in servers.items():
+        print(f"{kind:<12}{server.url}  ({server.record_count:,} records)")
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        for server in servers.values():
+            await server.stop()
+
+def main():
+    try:
+        asyncio.run(serve(parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Synthetic data generators for IllegalMining, Production and IUP.
+
+Records are produced in the source-API format served by source1/2/3
+(latitude/longitude keys, string dates) so they can be fed to the ingestion
+service. `to_model_rows` converts them to model column values for seeding
+the database directly.
+"""
+import random
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List
+
+KABUPATEN = {
+    "Bangka": ["Sungailiat", "Belinyu", "Merawang", "Pemali", "Riau Silip"],
+    "Bangka Barat": ["Mentok", "Jebus", "Kelapa", "Tempilang", "Simpang Teritip"],
+    "Bangka Selatan": ["Toboali", "Air Gegas", "Payung", "Simpang Rimba", "Lepar Pongok"],
+    "Bangka Tengah": ["Koba", "Pangkalan Baru", "Sungai Selan", "Namang", "Lubuk Besar"],
+    "Belitung": ["Tanjung Pandan", "Membalong", "Sijuk", "Badau", "Selat Nasik"],
+    "Belitung Timur": ["Manggar", "Gantung", "Kelapa Kampit", "Dendang", "Damar"]
+}
+JENIS_TAMBANG = ["TAMBANG BESAR ILEGAL", "TAMBANG KECIL ILEGAL", "TAMBANG MANUAL ILEGAL", "TAMBANG SEMPROT ILEGAL"]
+METODE_TAMBANG = ["Marine Dredging", "Open Pit", "Suction Dredge", "Offshore Mining"]
+OPERATORS = ["PT Timah Tbk", "PT Refined Bangka Tin", "CV Venus Inti Perkasa", "PT Stanindo Inti Perkasa"]
+IUP_STATUS = ["Active", "Inactive", "Expired", "Suspended"]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+# Approximate bounding box of the Bangka Belitung islands
+LAT_RANGE = (-3.3, -1.5)
+LNG_RANGE = (105.1, 108.3)
+
+BASE_DATE = datetime(2023, 1, 1)
+
+def _location(rng: random.Random):
+    kabupaten = rng.choice(list(KABUPATEN))
+    return kabupaten, rng.choice(KABUPATEN[kabupaten])
+
+def _coordinates(rng: random.Random):
+    return round(rng.uniform(*LAT_RANGE), 6), round(rng.uniform(*LNG_RANGE), 6)
+
+def illegal_mining_records(count: int, seed: int = 1) -> Iterator[Dict]:
+    rng = random.Random(seed)
+    for i in range(count):
+        kabupaten, kecamatan = _location(rng)
+        lat, lng = _coordinates(rng)
+        survey_date = BASE_DATE + timedelta(days=rng.randrange(900))
+        yield {
+            "id": f"FIM/{survey_date:%m/%y}/{i:07d}",
+            "mobile_id": f"FIM{1700000000000 + i}",
+            "kabupaten": kabupaten,
+            "tanggal_survey": survey_date.strftime("%Y-%m-%d"),
+            "latitude": lat,
+            "longitude": lng,
+            "nama_pemilik": f"Pemilik {rng.randrange(count // 3 + 1)}",
+            "jenis_tambang": rng.choice(JENIS_TAMBANG),
+            "kecamatan": kecamatan,
+            "jumlah_pekerja": rng.randint(1, 30),
+            "estimasi_produksi_hari": rng.randint(1, 200)
+        }
+
+def production_records(count: int, seed: int = 2) -> Iterator[Dict]:
+    rng = random.Random(seed)
+    for i in range(count):
+        kabupaten, kecamatan = _location(rng)
+        lat, lng = _coordinates(rng)
+        production_date = BASE_DATE + timedelta(days=rng.randrange(900))
+        yield {
+            "id": f"PBT{i:07d}",
+            "tanggal_produksi": production_date.strftime("%Y-%m-%d"),
+            "lokasi": f"DU {1500 + rng.randrange(500)}",
+            "kabupaten": kabupaten,
+            "kecamatan": kecamatan,
+            "produksi_ton": round(rng.uniform(1, 60), 1),
+            "kadar_sn": round(rng.uniform(55, 75), 1),
+            "metode_tambang": rng.choice(METODE_TAMBANG),
+            "operator": rng.choice(OPERATORS),
+            "latitude": lat,
+            "longitude": lng
+        }
+
+def iup_records(count: int, seed: int = 3) -> Iterator[Dict]:
+    rng = random.Random(seed)
+    for i in range(count):
+        kabupaten, kecamatan = _location(rng)
+        lat, lng = _coordinates(rng)
+        sk_date = datetime(2005, 1, 1) + timedelta(days=rng.randrange(6000))
+        du = str(100000 + i)
+        yield {
+            "name": du,
+            "du": du,
+            "longitude": lng,
+            "latitude": lat,
+            "daerah": f"Lt. {kecamatan} - {kabupaten}",
+            "luas": round(rng.uniform(100, 20000), 2),
+            "no_sk": f"188.45/{rng.randrange(1000)}/Tamben/{sk_date.year}",
+            "tgl_sk": f"{sk_date.day} {MONTHS[sk_date.month - 1]} {sk_date.year}",
+            "cnc": rng.choice(["I", "II", "III"]),
+            "status": rng.choice(IUP_STATUS)
+        }
+
+GENERATORS = {
+    "illegal": illegal_mining_records,
+    "production": production_records,
+    "iup": iup_records
+}
+
+def generate(kind: str, count: int) -> List[Dict]:
+    return list(GENERATORS[kind](count))
+
+def to_model_rows(kind: str, records: List[Dict]) -> List[Dict]:
+    """Convert source-format records to column values of the matching model"""
+    rows = []
+    for item in records:
+        if kind == "illegal":
+            rows.append({
+                "mobile_id": item["mobile_id"],
+                "kabupaten": item["kabupaten"],
+                "tanggal_survey": datetime.strptime(item["tanggal_survey"], "%Y-%m-%d"),
+                "location_lat": item["latitude"],
+                "location_lng": item["longitude"],
+                "nama_pemilik": item["nama_pemilik"],
+                "jenis_tambang": item["jenis_tambang"],
+                "kecamatan": item["kecamatan"],
+                "jumlah_pekerja": item["jumlah_pekerja"],
+                "estimasi_produksi_hari": item["estimasi_produksi_hari"]
+            })
+        elif kind == "production":
+            rows.append({
+                "tanggal_produksi": datetime.strptime(item["tanggal_produksi"], "%Y-%m-%d"),
+                "lokasi": item["lokasi"],
+                "kabupaten": item["kabupaten"],
+                "kecamatan": item["kecamatan"],
+                "produksi_ton": item["produksi_ton"],
+                "kadar_sn": item["kadar_sn"],
+                "metode_tambang": item["metode_tambang"],
+                "operator": item["operator"],
+                "location_lat": item["latitude"],
+                "location_lng": item["longitude"]
+            })
+        else:
+            rows.append({
+                "name": item["name"],
+                "du": item["du"],
+                "location_lat": item["latitude"],
+                "location_lng": item["longitude"],
+                "daerah": item["daerah"],
+                "luas": item["luas"],
+                "no_sk": item["no_sk"],
+                "tgl_sk": datetime.strptime(item["tgl_sk"], "%d %b %Y"),
+                "cnc": item["cnc"],
+                "status": item["status"]
+            })
+    return rows
@@ -0,0 +1,241 @@
+import asyncio
+import json
+import math
+import random
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from aiohttp import web
+from mock_sources.generators import GENERATORS
+
+# Per-source defaults mirroring source1/2/3/index.php
+SOURCES = {
+    "illegal": {
+        "port": 8001,
+        "message": "Illegal mining data retrieved successfully",
+        "filters": ("kabupaten", "kecamatan")
+    },
+    "production": {
+        "port": 8002,
+        "message": "Tin ore production data retrieved successfully",
+        "filters": ("kabupaten", "kecamatan")
+    },
+    "iup": {
+        "port": 8003,
+        "message": "Marine IUP data retrieved successfully",
+        "filters": ("daerah", "status")
+    }
+}
+
+# Same limits as the PHP sources
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Filtered index lists kept per distinct filter combination
+FILTER_CACHE_SIZE = 64
+
+class MockSourceServer:
+    """One mock source API.
+
+    Records are generated once and kept pre-serialized, so responses are
+    assembled by joining bytes and the server stays cheap at millions of
+    records. Latency, errors and chunked transfer are injected per request.
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        record_count: int = 1000,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        max_page_size: int = MAX_PAGE_SIZE,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        chunked: bool = False,
+        chunk_size: int = 65536,
+        chunk_delay_ms: float = 0.0,
+        seed: int = 0,
+        records: Optional[List[Dict]] = None
+    ):
+        if kind not in SOURCES:
+            raise ValueError(f"Unknown source '{kind}'. Available: {', '.join(SOURCES)}")
+
+        self.kind = kind
+        self.page_size = max(1, page_size)
+        self.max_page_size = max(self.page_size, max_page_size)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.chunked = chunked
+        self.chunk_size = max(1, chunk_size)
+        self.chunk_delay_ms = chunk_delay_ms
+        self.message = SOURCES[kind]["message"]
+        self.filter_fields = SOURCES[kind]["filters"]
+        self.rng = random.Random(seed)
+        self.stats = {"requests": 0, "errors": 0, "bytes": 0}
+
+        if records is None:
+            records = GENERATORS[kind](record_count)
+        self._encoded: List[bytes] = []
+        self._filter_values: Dict[str, List[str]] = {field: [] for field in self.filter_fields}
+        for record in records:
+            self._encoded.append(json.dumps(record).encode())
+            for field in self.filter_fields:
+                self._filter_values[field].append(str(record.get(field, "")).lower())
+        self._filter_cache: Dict[Tuple, List[int]] = {}
+
+        self._runner: Optional[web.AppRunner] = None
+        self.url: Optional[str] = None
+
+    @property
+    def record_count(self) -> int:
+        return len(self._encoded)
+
+    def application(self) -> web.Application:
+        app = web.Application()
+        app.router.add_route("*", "/", self.handle)
+        app.router.add_route("*", "/index.php", self.handle)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Serve on host:port (0 picks a free port) and return the base URL"""
+        self._runner = web.AppRunner(self.application(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.url = f"http://{host}:{port}"
+        return self.url
+
+    async def stop(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        self.stats["requests"] += 1
+
+        if request.method == "OPTIONS":
+            return web.Response(headers=self._cors_headers())
+
+        delay = self.latency_ms + (self.rng.uniform(0, self.jitter_ms) if self.jitter_ms else 0)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+        if self.error_rate and self.rng.random() < self.error_rate:
+            self.stats["errors"] += 1
+            return web.json_response(
+                {"status": "error", "message": "Simulated upstream failure", "timestamp": self._timestamp()},
+                status=self.error_status,
+                headers=self._cors_headers()
+            )
+
+        params = dict(request.query)
+        if request.method == "POST" and request.can_read_body:
+            try:
+                params.update(await request.post())
+            except ValueError:
+                pass
+
+        body = self.render(params)
+        self.stats["bytes"] += len(body)
+        headers = {"Content-Type": "application/json; charset=utf-8", **self._cors_headers()}
+
+        if not self.chunked:
+            return web.Response(body=body, headers=headers)
+
+        response = web.StreamResponse(headers=headers)
+        response.enable_chunked_encoding()
+        await response.prepare(request)
+        try:
+            for offset in range(0, len(body), self.chunk_size):
+                await response.write(body[offset:offset + self.chunk_size])
+                if self.chunk_delay_ms:
+                    await asyncio.sleep(self.chunk_delay_ms / 1000)
+            await response.write_eof()
+        except ConnectionResetError:
+            pass  # Client went away mid-transfer
+        return response
+
+    def render(self, params: Dict[str, str]) -> bytes:
+        """Build the paginated {"data": {"data": [...], "pagination": {...}}} envelope"""
+        page = max(1, self._int_param(params.get("page"), 1))
+        limit = self.page_size
+        if params.get("limit") is not None:
+            limit = max(1, min(self._int_param(params["limit"], self.page_size), self.max_page_size))
+
+        indices = self._filtered_indices(params)
+        total = self.record_count if indices is None else len(indices)
+        offset = (page - 1) * limit
+        if indices is None:
+            rows = self._encoded[offset:offset + limit]
+        else:
+            rows = [self._encoded[i] for i in indices[offset:offset + limit]]
+
+        pagination = {
+            "current_page": page,
+            "per_page": limit,
+            "total_records": total,
+            "total_pages": math.ceil(total / limit)
+        }
+        head = json.dumps({"status": "success", "message": self.message, "timestamp": self._timestamp()})
+        return b"".join([
+            head[:-1].encode(),
+            b', "data": {"data": [',
+            b", ".join(rows),
+            b'], "pagination": ',
+            json.dumps(pagination).encode(),
+            b"}}"
+        ])
+
+    def _filtered_indices(self, params: Dict[str, str]) -> Optional[List[int]]:
+        """Indices matching the case-insensitive substring filters, None when unfiltered"""
+        active = tuple((field, params[field].lower()) for field in self.filter_fields if params.get(field))
+        if not active:
+            return None
+
+        indices = self._filter_cache.get(active)
+        if indices is None:
+            indices = [
+                i for i in range(self.record_count)
+                if all(needle in self._filter_values[field][i] for field, needle in active)
+            ]
+            if len(self._filter_cache) >= FILTER_CACHE_SIZE:
+                self._filter_cache.pop(next(iter(self._filter_cache)))
+            self._filter_cache[active] = indices
+        return indices
+
+    @staticmethod
+    def _int_param(value: Optional[str], default: int) -> int:
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return default
+
+    @staticmethod
+    def _timestamp() -> str:
+        return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    @staticmethod
+    def _cors_headers() -> Dict[str, str]:
+        return {
+            "Access-Control-Allow-Origin": "*",
+            "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
+            "Access-Control-Allow-Headers": "Content-Type, Authorization, X-Requested-With"
+        }
+
+async def start_sources(
+    kinds: List[str] = None,
+    host: str = "127.0.0.1",
+    ports: Optional[Dict[str, int]] = None,
+    **options
+) -> Dict[str, MockSourceServer]:
+    """Start one mock server per source kind; ports default to 8001/8002/8003 (0 = any free port)"""
+    servers = {}
+    for kind in kinds or list(SOURCES):
+        server = MockSourceServer(kind, **options)
+        port = (ports or {}).get(kind, SOURCES[kind]["port"])
+        await server.start(host, port)
+        servers[kind] = server
+    return servers
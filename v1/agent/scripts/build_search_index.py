@@ -0,0 +1,34 @@
+import argparse
+import asyncio
+import sys
+import os
+import time
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from database.db import database
+from vectors.record_index import record_index
+
+async def main(query: str = None):
+    """Rebuild the record search index from the database"""
+    print("🔎 TINSIG AI Dashboard - Search Index")
+    print("=" * 50)
+    
+    start = time.perf_counter()
+    async with database.async_session() as session:
+        count = await record_index.rebuild(session)
+    print(f"✅ Indexed {count} records in {time.perf_counter() - start:.1f}s → {record_index.directory}")
+    
+    if query:
+        print(f"\nTop matches for '{query}':")
+        for entity, record_id, score in record_index.search(query, 5):
+            print(f"   {score:.3f}  {entity:<10} {record_id}")
+    
+    await database.engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the record search index")
+    parser.add_argument("--query", help="Run a test search after building")
+    args = parser.parse_args()
+    asyncio.run(main(args.query))
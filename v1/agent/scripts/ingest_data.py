@@ -36,6 +36,7 @@ async def main():
             
             if result["status"] == "success":
                 print(f"   📈 Records processed: {result['count']}")
+                print(f"   ✏️  Inserted: {result.get('inserted', 0)}, updated: {result.get('updated', 0)}, unchanged: {result.get('unchanged', 0)}")
                 total_success += result['count']
             else:
                 print(f"   ⚠️  Error: {result.get('error', 'Unknown error')}")
@@ -1,5 +1,7 @@
+import argparse
 import asyncio
 import asyncpg
+from datetime import datetime
 from sqlalchemy import create_engine
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 import sys
@@ -8,8 +10,12 @@ import os
 # Add the backend directory to the Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
 
-from backend.database.models import Base
-from backend.config import settings
+from database.partitioning import (
+    PARTITIONED_TABLES, convert_to_partitioned, detach_partitions_before, is_enabled, maintain_partitions,
+    month_start, table_kind
+)
+from database.schema import upgrade_schema
+from config import settings
 
 async def create_database():
     """Create database and enable PostGIS extension"""
@@ -53,30 +59,60 @@ async def create_database():
         print("Make sure PostgreSQL is running and credentials are correct")
 
 async def create_tables():
-    """Create all database tables"""
+    """Create or upgrade the database tables by applying the migrations"""
     
-    print("Creating database tables...")
+    print("Applying schema migrations...")
     
     try:
-        engine = create_async_engine(settings.DATABASE_URL)
+        await upgrade_schema()
+        print("✅ Schema is at the latest migration")
         
-        async with engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
+    except Exception as e:
+        print(f"❌ Migration error: {e}")
+
+async def manage_partitions(convert: bool = False, detach_before: str = None, drop: bool = False):
+    """Convert plain tables, create upcoming monthly partitions and detach old ones"""
+    
+    engine = create_async_engine(settings.DATABASE_URL)
+    try:
+        if not is_enabled(engine.dialect):
+            print("ℹ️  Partitioning needs PostgreSQL with PARTITIONING_ENABLED=true; skipped")
+            return
         
-        await engine.dispose()
-        print("✅ All tables created successfully")
+        print("Managing partitions...")
+        
+        if convert:
+            for table in PARTITIONED_TABLES:
+                async with engine.begin() as conn:
+                    if await conn.run_sync(table_kind, table) == "table":
+                        count = await conn.run_sync(convert_to_partitioned, table)
+                        print(f"✅ Converted {table} to monthly partitions ({count} rows)")
         
+        async with engine.begin() as conn:
+            await conn.run_sync(maintain_partitions)
+        print(f"✅ Partitions ready through {settings.PARTITION_PREMAKE_MONTHS} months ahead")
+        
+        if detach_before:
+            cutoff = month_start(datetime.strptime(detach_before, "%Y-%m"))
+            for table in PARTITIONED_TABLES:
+                async with engine.begin() as conn:
+                    names = await conn.run_sync(detach_partitions_before, table, cutoff, drop)
+                action = "Dropped" if drop else "Detached"
+                print(f"✅ {action} {len(names)} {table} partitions before {cutoff:%Y-%m}")
+                
     except Exception as e:
-        print(f"❌ Table creation error: {e}")
+        print(f"❌ Partition management error: {e}")
+    finally:
+        await engine.dispose()
 
-async def main():
+async def main(args):
     """Main setup function"""
     print("🏗️  TINSIG AI Dashboard - Database Setup")
     print("=" * 50)
     
     # Check if we can import required modules
     try:
-        from backend.config import settings
+        from config import settings
         print(f"📍 Database URL: {settings.DATABASE_URL}")
         print(f"📍 Database Name: {settings.DB_NAME}")
     except ImportError as e:
@@ -86,6 +122,7 @@ async def main():
     
     await create_database()
     await create_tables()
+    await manage_partitions(args.partition_existing, args.detach_before, args.drop)
     
     print("\n" + "=" * 50)
     print("🎉 Database setup completed!")
@@ -96,4 +133,8 @@ async def main():
     print("4. Start the frontend: cd frontend && streamlit run app.py")
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Create the database, tables and monthly partitions")
+    parser.add_argument("--partition-existing", action="store_true", help="Rebuild existing plain production/illegal_mining tables as partitioned tables")
+    parser.add_argument("--detach-before", metavar="YYYY-MM", help="Detach partitions of months before this one")
+    parser.add_argument("--drop", action="store_true", help="Drop detached partitions instead of keeping them as tables")
+    asyncio.run(main(parser.parse_args()))